@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Gate routing benchmark.
+
+Routes N synthetic hits two ways, both into {**h, "gate": ...} copies:
+  legacy   — two dict lookups per hit
+  table    — GateTable.route: memoised per family (globs, "*" default, fan-out)
+
+    python -m benchmarks.gate_routing
+    python -m benchmarks.gate_routing --hits 100000 --json
+"""
+from __future__ import annotations
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from prime_node_os.cold_mirror.core.seed_loader import Seed
+from prime_node_os.cold_mirror.core.trap_engine import build_hits
+from prime_node_os.engine.gate_table import GateTable
+from prime_node_os.engine.prime_node_runtime import route_hits_to_gates
+
+FAMILIES = ["Problem", "Audience", "Constraints", "Data", "Tools", "Tone",
+            "Risks", "Ethics", "Steps", "Deliverables", "Validation", "NextAction"]
+GATES = ["Severance", "VoiceClarity", "Structure", "Insight", "Harmonize", "CrownPrep", "Embodiment"]
+
+
+def _legacy_route(hits, segment_map):
+    routed = []
+    for h in hits:
+        fam = h.get("family")
+        gate = segment_map.get(fam) or segment_map.get(h.get("family"))
+        routed.append({**h, "gate": gate})
+    return routed
+
+
+def build_fixture(n_hits: int, seed: int = 5):
+    """Gate map, one seed per hit (so build_hits' dedupe keeps every hit), matches."""
+    rng = random.Random(seed)
+    segment_map = {fam: rng.choice(GATES) for fam in FAMILIES}
+    seeds = {f"S{i:05d}": Seed(f"S{i:05d}", f"Seed {i}", FAMILIES[i % len(FAMILIES)], "sig")
+             for i in range(n_hits)}
+    matches = [{"seed_id": sid, "confidence": rng.random(), "evidence": "e"} for sid in seeds]
+    return segment_map, seeds, matches
+
+
+def _measure(setup: Callable[[], Any], fn: Callable[[Any], Any], repeat: int) -> Dict[str, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        arg = setup()
+        t0 = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    # separate traced run: tracemalloc would distort the timings
+    arg = setup()
+    tracemalloc.start()
+    fn(arg)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"ms": round(best * 1000, 3), "peak_kb": round(peak / 1024, 1)}
+
+
+def run(n_hits: int, repeat: int) -> List[Dict[str, Any]]:
+    segment_map, seeds, matches = build_fixture(n_hits)
+    table = GateTable(segment_map)
+
+    plain_hits = lambda: build_hits(matches, seeds)
+    results = [
+        {"mode": "legacy", **_measure(plain_hits, lambda hits: _legacy_route(hits, segment_map), repeat)},
+        {"mode": "table", **_measure(plain_hits, lambda hits: route_hits_to_gates(hits, table), repeat)},
+    ]
+    for r in results:
+        r["hits"] = n_hits
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Gate routing benchmark")
+    ap.add_argument("--hits", type=int, default=10000)
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--json", action="store_true", help="emit JSON lines instead of a table")
+    args = ap.parse_args(argv)
+
+    results = run(args.hits, args.repeat)
+    if args.json:
+        for r in results:
+            print(json.dumps(r))
+        return
+
+    print(f"{'mode':>8}  {'hits':>7}  {'route_ms':>9}  {'peak_kb':>8}")
+    for r in results:
+        print(f"{r['mode']:>8}  {r['hits']:>7}  {r['ms']:>9}  {r['peak_kb']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark harness: the audit pipeline stage by stage, then end to
+end, against a synthetic seed catalog and StubLLMClient (no network).
+
+For each catalog size a throwaway project root is built (the repo's
+configs + a compiled synthetic trap_seeds.yaml) and the scenarios run in a
+fresh interpreter pointed at it through THOTH_PROJECT_ROOT, so ledgers,
+caches and thread telemetry never touch the real tree:
+
+  seed_load        routed seeds from a cold artifact cache, and a warm hit
+  prompt_build     select_seeds + build_trap_analysis_prompt per text
+  parse            stub response -> matches, through schema enforcement
+  routing          build_hits + route_hits_to_gates
+  report_build     build_report
+  telemetry_write  log_run enqueue cost, then enqueue + sink drain
+  pipeline         run_prime_node_audit over every text via run_batch at each
+                   --concurrency, --latency-ms ± --jitter-ms per LLM call
+
+Each result is one JSON line stamped with the commit, Python version and
+parameters. Append runs to a file and compare two of them to catch
+regressions (exit 1 when any scenario got slower than --tolerance):
+
+    python -m benchmarks.harness
+    python -m benchmarks.harness --quick --scenarios parse routing
+    python -m benchmarks.harness --sizes 1000 10000 --concurrency 1 8 32 --out bench.jsonl
+    python -m benchmarks.harness --compare base.jsonl bench.jsonl --tolerance 0.15
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+REPO = Path(__file__).resolve().parents[1]
+SCENARIOS = ("seed_load", "prompt_build", "parse", "routing", "report_build", "telemetry_write", "pipeline")
+# copied into each throwaway project root when present
+PROJECT_FILES = (
+    "engine/thresholds_1.1.yaml",
+    "engine/segment_to_gates.yaml",
+    "runtime/inference_profile.yaml",
+    "runtime/lunar_nudge.yaml",
+    "schemas/matches.schema.json",
+    "cold_mirror/data/config.yaml",
+)
+QUICK = {"sizes": [200], "texts": 20, "repeat": 2, "concurrency": [1, 4],
+         "telemetry_records": 1000, "latency_ms": 5.0, "jitter_ms": 1.0}
+
+_WORDS = ("scope", "intent", "brief", "drifts", "pattern", "mirrors", "tone", "user",
+          "deadline", "metric", "audience", "launch", "model", "prompt", "data", "risk",
+          "the", "and", "we", "will", "ship", "a", "new", "pipeline", "for", "every", "team")
+
+
+def synthetic_texts(n: int, seed: int = 3) -> List[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(_WORDS) for _ in range(rng.randint(60, 240))) for _ in range(n)]
+
+
+# -----------------------
+# Worker (runs inside the throwaway project root)
+# -----------------------
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def _worker(opts: Dict[str, Any]) -> List[Dict[str, Any]]:
+    from benchmarks.stub_client import StubLLMClient
+    from prime_node_os.cold_mirror.core.artifact_cache import CACHE
+    from prime_node_os.cold_mirror.core.report_engine import build_report
+    from prime_node_os.cold_mirror.core.seed_index import select_seeds
+    from prime_node_os.cold_mirror.core.telemetry import log_run
+    from prime_node_os.cold_mirror.core.telemetry_sink import get_sink
+    from prime_node_os.cold_mirror.core.timing import stage_percentiles
+    from prime_node_os.cold_mirror.core.trap_engine import build_hits
+    from prime_node_os.cold_mirror.engine.llm.prompts import build_trap_analysis_prompt
+    from prime_node_os.engine import prime_node_runtime as pn
+    from prime_node_os.engine.batch_runtime import run_batch
+
+    wanted = set(opts["scenarios"])
+    repeat = opts["repeat"]
+    texts = synthetic_texts(opts["texts"], opts["seed"])
+    results: List[Dict[str, Any]] = []
+
+    def stub(latency_ms: float = 0.0, jitter_ms: float = 0.0) -> StubLLMClient:
+        return StubLLMClient(matches=opts["matches"], latency_ms=latency_ms, jitter_ms=jitter_ms,
+                             seed=opts["seed"], shape=opts["shape"])
+
+    def measure(scenario: str, fn: Callable[[], Any]) -> float:
+        return _best(fn, repeat) if scenario in wanted else 0.0
+
+    def record(scenario: str, ms: float, ops: int, variant: str = "", **extra: Any) -> None:
+        if scenario in wanted:
+            results.append({"scenario": scenario, "variant": variant, "ms": round(ms, 3), "ops": ops,
+                            "us_per_op": round(ms * 1000 / max(1, ops), 2), **extra})
+
+    def cold_load():
+        CACHE.invalidate()
+        return pn.load_seeds()
+
+    record("seed_load", measure("seed_load", cold_load), 1, "cold", loaded=len(cold_load()))
+    record("seed_load", measure("seed_load", lambda: [pn.load_seeds() for _ in range(1000)]), 1000, "warm")
+
+    # Every later stage is fed the previous stage's real output.
+    config = pn.load_config()
+    seeds = pn.load_seeds()
+    build = lambda: [build_trap_analysis_prompt(t, select_seeds(t, seeds, config)) for t in texts]
+    prompts = build()
+    record("prompt_build", measure("prompt_build", build), len(texts),
+           prompt_chars=sum(map(len, prompts)) // len(prompts))
+
+    _, ctx = pn._prepare_audit(texts[0])
+    client = stub()
+    raws = [client.ask(p) for p in prompts]
+    parse = lambda: [pn._parse_response(p, raw, ctx)[0] for p, raw in zip(prompts, raws)]
+    parsed = parse()
+    record("parse", measure("parse", parse), len(raws), shape=opts["shape"])
+
+    route = lambda: [pn.route_hits_to_gates(build_hits(m, seeds), ctx["segment_map"]) for m in parsed]
+    hits = route()
+    record("routing", measure("routing", route), len(parsed), hits=sum(map(len, hits)))
+
+    report = lambda: [build_report(t, h, config) for t, h in zip(texts, hits)]
+    reports = report()
+    record("report_build", measure("report_build", report), len(reports))
+
+    if "telemetry_write" in wanted:
+        n = opts["telemetry_records"]
+        sink = get_sink((config.get("report", {}) or {}).get("telemetry_sink"))
+
+        def enqueue():
+            for i in range(n):
+                log_run(reports[i % len(reports)], config, pn.DATA_DIR)
+
+        def drained():
+            enqueue()
+            sink.flush(timeout=60)
+
+        record("telemetry_write", _best(enqueue, repeat), n, "enqueue")
+        sink.flush(timeout=60)
+        record("telemetry_write", _best(drained, repeat), n, "drained")
+
+    if "pipeline" in wanted:
+        pn.run_prime_node_audit(texts[0], stub())   # warm-up, not measured
+        items = [(str(i), t) for i, t in enumerate(texts)]
+        for c in opts["concurrency"]:
+            client = stub(opts["latency_ms"], opts["jitter_ms"])
+            audit = lambda text: pn.run_prime_node_audit(text, client, timings=True)
+            t0 = time.perf_counter()
+            out = list(run_batch(items, audit, concurrency=c, ordered=False))
+            wall = (time.perf_counter() - t0) * 1000
+            stages = stage_percentiles(r["report"]["timings"] for r in out if "report" in r)
+            total = stages.pop("total", {})
+            record("pipeline", wall, len(items), f"c={c}", concurrency=c,
+                   audits_per_s=round(len(items) / (wall / 1000), 2),
+                   errors=sum("error" in r for r in out), llm_calls=client.calls,
+                   latency_ms={k: v for k, v in total.items() if k != "count"},
+                   stage_p50_ms={name: s["p50"] for name, s in stages.items()})
+    return results
+
+
+# -----------------------
+# Driver
+# -----------------------
+def build_project(root: Path, n_seeds: int, sub_traps: int, sc_k: Optional[int]) -> None:
+    """Repo configs + a compiled synthetic catalog of n_seeds flattened seeds under root."""
+    import yaml
+    from benchmarks.seed_memory import write_synthetic_catalog
+    from prime_node_os.cold_mirror.core.seed_catalog import compile_catalog
+
+    for rel in PROJECT_FILES:
+        src = REPO / rel
+        if src.exists():
+            (root / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(src, root / rel)
+    data_dir = root / "cold_mirror" / "data"
+    write_synthetic_catalog(data_dir, n_seeds, sub_traps)
+    config = yaml.safe_load((data_dir / "config.yaml").read_text(encoding="utf-8"))
+    compile_catalog(data_dir, config)
+
+    if sc_k is not None:
+        path = root / "runtime" / "inference_profile.yaml"
+        profile = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        profile.setdefault("sc_k", {}).update(enabled=True, k=sc_k)
+        path.write_text(yaml.safe_dump(profile, sort_keys=False), encoding="utf-8")
+
+
+def run_meta() -> Dict[str, Any]:
+    def git(*args: str) -> str:
+        try:
+            return subprocess.run(["git", *args], cwd=REPO, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+
+    return {
+        "run": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "commit": git("rev-parse", "--short", "HEAD") or None,
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": sys.platform,
+    }
+
+
+def run(sizes: List[int], opts: Dict[str, Any], sub_traps: int = 2, sc_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    meta = run_meta()
+    results = []
+    for n in sizes:
+        with tempfile.TemporaryDirectory(prefix="prime-node-bench-") as tmp:
+            root = Path(tmp)
+            build_project(root, n, sub_traps, sc_k)
+            env = dict(os.environ, THOTH_PROJECT_ROOT=str(root))
+            env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO), env.get("PYTHONPATH")]))
+            proc = subprocess.run(
+                [sys.executable, "-m", "benchmarks.harness", "--worker", json.dumps(opts)],
+                cwd=REPO, env=env, capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                raise RuntimeError(f"benchmark worker failed for {n} seeds:\n{proc.stderr}")
+            for line in proc.stdout.splitlines():
+                results.append({**meta, "seeds": n, **json.loads(line),
+                                "params": {k: opts[k] for k in ("texts", "matches", "shape", "repeat",
+                                                                 "latency_ms", "jitter_ms", "seed")}})
+    return results
+
+
+# -----------------------
+# Regression check
+# -----------------------
+def _key(r: Dict[str, Any]) -> Tuple[str, str, int, str]:
+    return r["scenario"], r.get("variant", ""), r["seeds"], json.dumps(r.get("params"), sort_keys=True)
+
+
+def load_results(path: Path) -> Dict[Tuple[str, str, int, str], Dict[str, Any]]:
+    """Last record per (scenario, variant, seeds, params) in a results file."""
+    out = {}
+    with Path(path).open("r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                r = json.loads(line)
+                if "scenario" in r:   # tolerate other benchmarks' lines in the file
+                    out[_key(r)] = r
+    return out
+
+
+def compare(base: Path, new: Path, tolerance: float) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    base/new ms and their ratio for every key run with the same parameters
+    in both files; ok is False if any ratio > 1 + tolerance.
+    """
+    a, b = load_results(base), load_results(new)
+    rows = []
+    for key in sorted(a.keys() & b.keys()):
+        ratio = b[key]["ms"] / a[key]["ms"] if a[key]["ms"] else 1.0
+        rows.append({"scenario": key[0], "variant": key[1], "seeds": key[2],
+                     "base_ms": a[key]["ms"], "new_ms": b[key]["ms"], "ratio": round(ratio, 3),
+                     "regressed": ratio > 1 + tolerance})
+    return rows, not any(r["regressed"] for r in rows)
+
+
+def _print_table(results: Iterable[Dict[str, Any]]) -> None:
+    print(f"{'seeds':>7}  {'scenario':<16}  {'variant':<8}  {'ops':>6}  {'ms':>10}  {'us/op':>10}  notes")
+    for r in results:
+        notes = ""
+        if r["scenario"] == "pipeline":
+            lat = r["latency_ms"]
+            notes = f"{r['audits_per_s']} audits/s  p50 {lat.get('p50')} ms  p95 {lat.get('p95')} ms  errors {r['errors']}"
+        print(f"{r['seeds']:>7}  {r['scenario']:<16}  {r['variant']:<8}  {r['ops']:>6}  "
+              f"{r['ms']:>10}  {r['us_per_op']:>10}  {notes}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Offline audit pipeline benchmarks")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="flattened seeds per catalog")
+    ap.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    ap.add_argument("--texts", type=int, default=100, help="synthetic inputs per scenario")
+    ap.add_argument("--repeat", type=int, default=5, help="best-of for the stage scenarios")
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    ap.add_argument("--latency-ms", type=float, default=50.0, help="stub LLM latency per call")
+    ap.add_argument("--jitter-ms", type=float, default=10.0)
+    ap.add_argument("--matches", type=int, default=3, help="matches per stub response")
+    ap.add_argument("--shape", choices=("clean", "fenced", "truncated"), default="clean")
+    ap.add_argument("--sc-k", type=int, default=None, help="enable SC@k with this k in the inference profile")
+    ap.add_argument("--sub-traps", type=int, default=2, help="sub_traps per top-level seed")
+    ap.add_argument("--telemetry-records", type=int, default=10000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--quick", action="store_true", help="small sizes and short runs (smoke test)")
+    ap.add_argument("--out", help="append result JSON lines to this file")
+    ap.add_argument("--json", action="store_true", help="emit JSON lines instead of a table")
+    ap.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="compare two results files and exit")
+    ap.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown ratio for --compare")
+    ap.add_argument("--worker", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.worker:
+        for r in _worker(json.loads(args.worker)):
+            print(json.dumps(r))
+        return
+
+    if args.compare:
+        rows, ok = compare(Path(args.compare[0]), Path(args.compare[1]), args.tolerance)
+        if args.json:
+            for r in rows:
+                print(json.dumps(r))
+        else:
+            print(f"{'seeds':>7}  {'scenario':<16}  {'variant':<8}  {'base_ms':>10}  {'new_ms':>10}  {'ratio':>6}")
+            for r in rows:
+                flag = "  REGRESSED" if r["regressed"] else ""
+                print(f"{r['seeds']:>7}  {r['scenario']:<16}  {r['variant']:<8}  "
+                      f"{r['base_ms']:>10}  {r['new_ms']:>10}  {r['ratio']:>6}{flag}")
+        sys.exit(0 if ok else 1)
+
+    if args.quick:
+        for k, v in QUICK.items():
+            setattr(args, k, v)
+    opts = {
+        "scenarios": args.scenarios, "texts": args.texts, "repeat": args.repeat,
+        "concurrency": args.concurrency, "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms,
+        "matches": args.matches, "shape": args.shape, "telemetry_records": args.telemetry_records,
+        "seed": args.seed,
+    }
+    results = run(args.sizes, opts, args.sub_traps, args.sc_k)
+
+    if args.out:
+        with open(args.out, "a", encoding="utf-8") as f:
+            for r in results:
+                f.write(json.dumps(r) + "\n")
+    if args.json:
+        for r in results:
+            print(json.dumps(r))
+    else:
+        _print_table(results)
+
+
+if __name__ == "__main__":
+    main()
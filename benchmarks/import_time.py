@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark / regression check.
+
+For each module, runs `python -X importtime -c "import <module>"` in a
+fresh interpreter and reports the module's cumulative import time (best of
+--repeat) and its slowest direct imports. Also times `prime-node --help`
+end to end, which should not import the runtime at all.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --json
+    python -m benchmarks.import_time --max-ms 80     # exit 1 if any module is slower
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+REPO = Path(__file__).resolve().parents[1]
+
+MODULES = [
+    "prime_node_os.cli.prime_node_cli",
+    "prime_node_os.engine.prime_node_runtime",
+    "prime_node_os.engine.mask_runtime",
+    "prime_node_os.engine.lunar_nudge",
+    "prime_node_os.cold_mirror.engine.cold_mirror_engine",
+]
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("THOTH_PROJECT_ROOT", str(REPO))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO), env.get("PYTHONPATH")]))
+    return env
+
+
+def _importtime(module: str) -> List[Tuple[int, int, int, str]]:
+    """(self_us, cumulative_us, depth, name) rows of -X importtime for module."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=_env(), cwd=REPO, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cum_us), depth, name.strip()))
+    return rows
+
+
+def measure_module(module: str, repeat: int, top: int) -> Dict[str, Any]:
+    best = None
+    for _ in range(repeat):
+        rows = _importtime(module)
+        root = next(r for r in reversed(rows) if r[3] == module)
+        if best is None or root[1] < best[0][1]:
+            best = (root, rows)
+    root, rows = best
+    # direct imports of the module: one level below it, listed just before it
+    base = root[2]
+    children = [r for r in rows if r[2] == base + 1]
+    children.sort(key=lambda r: -r[1])
+    return {
+        "module": module,
+        "ms": round(root[1] / 1000, 2),
+        "modules_imported": len(rows),
+        "slowest": [{"module": r[3], "ms": round(r[1] / 1000, 2)} for r in children[:top]],
+    }
+
+
+def measure_cli_help(repeat: int) -> Dict[str, Any]:
+    cmd = [sys.executable, "-m", "prime_node_os.cli.prime_node_cli", "--help"]
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, capture_output=True, env=_env(), cwd=REPO, check=True)
+        best = min(best, time.perf_counter() - t0)
+    baseline = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], capture_output=True, env=_env(), cwd=REPO, check=True)
+        baseline = min(baseline, time.perf_counter() - t0)
+    return {"command": "prime-node --help", "wall_ms": round(best * 1000, 2),
+            "interpreter_ms": round(baseline * 1000, 2)}
+
+
+def run(modules: List[str], repeat: int, top: int) -> Dict[str, Any]:
+    return {
+        "modules": [measure_module(m, repeat, top) for m in modules],
+        "cli_help": measure_cli_help(repeat),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Import-time benchmark")
+    ap.add_argument("modules", nargs="*", default=MODULES)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=5, help="slowest direct imports to list per module")
+    ap.add_argument("--max-ms", type=float, default=None,
+                    help="fail (exit 1) if any module's cumulative import time exceeds this")
+    ap.add_argument("--json", action="store_true", help="emit JSON lines instead of a table")
+    args = ap.parse_args(argv)
+
+    results = run(args.modules, args.repeat, args.top)
+    if args.json:
+        for r in results["modules"]:
+            print(json.dumps(r))
+        print(json.dumps(results["cli_help"]))
+    else:
+        print(f"{'module':<40}  {'ms':>8}  {'imports':>7}  slowest direct imports")
+        for r in results["modules"]:
+            slowest = ", ".join(f"{s['module']} {s['ms']}" for s in r["slowest"])
+            print(f"{r['module']:<40}  {r['ms']:>8}  {r['modules_imported']:>7}  {slowest}")
+        h = results["cli_help"]
+        print(f"\n{h['command']}: {h['wall_ms']} ms wall (bare interpreter {h['interpreter_ms']} ms)")
+
+    if args.max_ms is not None:
+        over = [r for r in results["modules"] if r["ms"] > args.max_ms]
+        for r in over:
+            print(f"[FAIL] {r['module']} imports in {r['ms']} ms > {args.max_ms} ms", file=sys.stderr)
+        sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
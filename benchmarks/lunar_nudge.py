@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Lunar nudge lookup benchmark (per_gate mode: one lookup per gate call).
+
+Looks up the nudge vector for N phase fractions three ways:
+  legacy   — build a 9-key dict, walk the phase-name if/elif chain, clamp
+             it in compute_nudges and again in mask_runtime
+  table    — compute_nudges(frac, caps): precomputed, clamped, copied to a dict
+  index    — phase_index() once, then nudges_for_index(i, caps)
+
+    python -m benchmarks.lunar_nudge
+    python -m benchmarks.lunar_nudge --calls 1000000 --json
+"""
+from __future__ import annotations
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from prime_node_os.engine.lunar_nudge import compute_nudges, nudges_for_index, phase_index, phase_name
+
+CAPS = (0.85, 1.15)
+
+
+def _legacy_nudges_for(name: str) -> Dict[str, float]:
+    n = {
+        "severance": 1.0, "harmonizers": 1.0, "voice_clarity": 1.0,
+        "coherence": 1.0, "integration": 1.0, "translation": 1.0,
+        "grounding": 1.0, "sealing": 1.0, "call_harmonizers_bias": 1.0,
+    }
+    if name == "New Moon":
+        n["severance"] = 1.10; n["harmonizers"] = 0.95; n["grounding"] = 1.05
+    elif name == "Waxing Crescent":
+        n["voice_clarity"] = 1.05; n["translation"] = 1.03
+    elif name == "First Quarter":
+        n["coherence"] = 1.05; n["grounding"] = 1.03
+    elif name == "Waxing Gibbous":
+        n["integration"] = 1.05; n["coherence"] = 1.02
+    elif name == "Full Moon":
+        n["severance"] = 0.90; n["harmonizers"] = 1.10; n["call_harmonizers_bias"] = 1.12
+    elif name == "Waning Gibbous":
+        n["translation"] = 1.05; n["integration"] = 1.02
+    elif name == "Last Quarter":
+        n["grounding"] = 1.07; n["voice_clarity"] = 0.98
+    else:
+        n["sealing"] = 1.05; n["severance"] = 1.03
+    return n
+
+
+def _legacy(fracs: List[float]) -> None:
+    lo, hi = CAPS
+    for f in fracs:
+        n = _legacy_nudges_for(phase_name(f))
+        for k, v in n.items():
+            n[k] = hi if v > hi else (lo if v < lo else v)
+        n = {k: max(lo, min(hi, float(v))) for k, v in n.items()}
+
+
+def _table(fracs: List[float]) -> None:
+    for f in fracs:
+        compute_nudges(f, CAPS)
+
+
+def _index(fracs: List[float]) -> None:
+    for f in fracs:
+        nudges_for_index(phase_index(f), CAPS)
+
+
+def _measure(fn: Callable[[List[float]], Any], fracs: List[float], repeat: int) -> Dict[str, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(fracs)
+        best = min(best, time.perf_counter() - t0)
+    # separate traced run: tracemalloc would distort the timings
+    tracemalloc.start()
+    fn(fracs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "ms": round(best * 1000, 3),
+        "ns_per_call": round(best * 1e9 / len(fracs), 1),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def run(n_calls: int, repeat: int) -> List[Dict[str, Any]]:
+    rng = random.Random(19)
+    fracs = [rng.random() for _ in range(n_calls)]
+    results = [{"mode": mode, **_measure(fn, fracs, repeat)}
+               for mode, fn in (("legacy", _legacy), ("table", _table), ("index", _index))]
+    for r in results:
+        r["calls"] = n_calls
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Lunar nudge lookup benchmark")
+    ap.add_argument("--calls", type=int, default=100000)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--json", action="store_true", help="emit JSON lines instead of a table")
+    args = ap.parse_args(argv)
+
+    results = run(args.calls, args.repeat)
+    if args.json:
+        for r in results:
+            print(json.dumps(r))
+        return
+
+    print(f"{'mode':>8}  {'calls':>8}  {'ms':>9}  {'ns/call':>8}  {'peak_kb':>8}")
+    for r in results:
+        print(f"{r['mode']:>8}  {r['calls']:>8}  {r['ms']:>9}  {r['ns_per_call']:>8}  {r['peak_kb']:>8}")
+
+
+if __name__ == "__main__":
+    main()
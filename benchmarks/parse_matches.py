@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Match-parser microbenchmark.
+
+Builds synthetic {"matches": [...]} responses of increasing size in three
+shapes (clean JSON, fenced + prose, truncated mid-object) and times
+parse_matches on the whole response, iter_stream_matches over token-sized
+chunks, and plain json.loads as the floor for clean input.
+
+    python -m benchmarks.parse_matches
+    python -m benchmarks.parse_matches --sizes 100 10000 --chunk 8 --json
+"""
+from __future__ import annotations
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from prime_node_os.cold_mirror.core.trap_engine import iter_stream_matches, parse_matches
+
+_WORDS = ("mirror", "loop", "audit", "signal", "drift", "frame", "gate", "seed",
+          "quote", "\"quoted\"", "path\\to", "{brace}", "[list]", "naïve")
+
+
+def synthetic_response(n_matches: int, shape: str = "clean", seed: int = 11) -> str:
+    rng = random.Random(seed)
+    matches = [
+        {
+            "seed_id": f"S{i:05d}",
+            "confidence": round(rng.random(), 3),
+            "evidence": " ".join(rng.choice(_WORDS) for _ in range(rng.randint(4, 16))),
+        }
+        for i in range(n_matches)
+    ]
+    body = json.dumps({"matches": matches}, indent=2)
+    if shape == "fenced":
+        return f"Here is the audit you asked for:\n```json\n{body}\n```\nLet me know if you need more."
+    if shape == "truncated":
+        return body[: int(len(body) * 0.9)]
+    return body
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def run(sizes: List[int], chunk: int, repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    for n in sizes:
+        for shape in ("clean", "fenced", "truncated"):
+            raw = synthetic_response(n, shape)
+            chunks = [raw[i:i + chunk] for i in range(0, len(raw), chunk)]
+            found = len(parse_matches(raw))
+
+            # chars the stream consumed before the first hit could be built
+            consumed = 0
+            for c in chunks:
+                consumed += len(c)
+                if next(iter_stream_matches([raw[:consumed]]), None) is not None:
+                    break
+
+            row = {
+                "matches": n,
+                "shape": shape,
+                "bytes": len(raw),
+                "parsed": found,
+                "parse_ms": round(_time(lambda: parse_matches(raw), repeat), 3),
+                "stream_ms": round(_time(lambda: list(iter_stream_matches(chunks)), repeat), 3),
+                "stream_chunk": chunk,
+                "first_hit_at_byte": consumed,
+            }
+            if shape == "clean":
+                row["json_loads_ms"] = round(_time(lambda: json.loads(raw), repeat), 3)
+            results.append(row)
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Match parser microbenchmark")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    ap.add_argument("--chunk", type=int, default=16, help="stream chunk size in chars (~ a few tokens)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--json", action="store_true", help="emit JSON lines instead of a table")
+    args = ap.parse_args(argv)
+
+    results = run(args.sizes, args.chunk, args.repeat)
+    if args.json:
+        for r in results:
+            print(json.dumps(r))
+        return
+
+    print(f"{'matches':>8}  {'shape':>9}  {'bytes':>9}  {'parsed':>7}  {'parse_ms':>9}  {'stream_ms':>9}  {'json_ms':>8}  {'first_hit':>9}")
+    for r in results:
+        print(f"{r['matches']:>8}  {r['shape']:>9}  {r['bytes']:>9}  {r['parsed']:>7}  {r['parse_ms']:>9}"
+              f"  {r['stream_ms']:>9}  {r.get('json_loads_ms', '-'):>8}  {r['first_hit_at_byte']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Seed prefilter recall benchmark.
+
+Audits the examples/test inputs against a catalog made of the shipped
+trap_seeds.yaml plus synthetic distractor seeds, once with the full catalog
+in the prompt and once per top_k with the BM25 prefilter, using the offline
+LexicalOracleClient. Reports match recall vs the full-catalog result and the
+prompt size reduction.
+
+The oracle is lexical, like the index, so recall here is an upper bound on
+what a real model sees; prompt-size numbers carry over directly.
+
+    python -m benchmarks.prefilter_recall
+    python -m benchmarks.prefilter_recall --distractors 5000 --top-k 20 40 80 --json
+"""
+from __future__ import annotations
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import yaml
+
+from prime_node_os.cold_mirror.core.seed_index import get_seed_index, select_seeds, tokenize
+from prime_node_os.cold_mirror.core.seed_loader import Seed
+from prime_node_os.cold_mirror.engine.llm.prompts import build_trap_analysis_prompt
+from benchmarks.stub_client import LexicalOracleClient
+
+ROOT = Path(__file__).resolve().parents[1]
+EXAMPLES = ROOT / "examples" / "test"
+
+
+def load_inputs() -> List[str]:
+    texts = [p.read_text(encoding="utf-8") for p in sorted(EXAMPLES.glob("*")) if p.is_file()]
+    # each paragraph of the project dump is a shorter, more focused audit input
+    dump = EXAMPLES / "project_dump.txt"
+    if dump.exists():
+        texts.extend(p for p in dump.read_text(encoding="utf-8").split("\n\n") if p.strip())
+    return texts
+
+
+def build_catalog(n_distractors: int, seed: int = 7) -> Dict[str, Seed]:
+    """Shipped seeds (name/description/pattern as title/signature) + distractors."""
+    data = yaml.safe_load((ROOT / "cold_mirror" / "data" / "trap_seeds.yaml").read_text(encoding="utf-8"))
+    seeds: Dict[str, Seed] = {}
+    vocab = set()
+    for s in data.get("trap_seeds", []):
+        sig = " ".join(str(s.get(k, "")).strip() for k in ("description", "pattern"))
+        seeds[s["id"]] = Seed(s["id"], s.get("name", ""), s.get("family", "Ungrouped"), sig)
+        vocab.update(tokenize(sig))
+    for text in load_inputs():
+        vocab.update(tokenize(text))
+
+    # distractors are mostly domain jargon the inputs never use, with a
+    # sprinkling of shared vocabulary so some of them compete lexically
+    rng = random.Random(seed)
+    words = sorted(vocab)
+    jargon = ["".join(rng.choice("bdfgklmnprstvz") + rng.choice("aeiou") for _ in range(3))
+              for _ in range(4000)]
+    for i in range(n_distractors):
+        n = rng.randint(6, 14)
+        sig = " ".join(rng.choice(words) if rng.random() < 0.15 else rng.choice(jargon) for _ in range(n))
+        sid = f"D{i:05d}"
+        seeds[sid] = Seed(sid, f"Distractor {i}", f"Family {i % 12}", sig)
+    return seeds
+
+
+def _match_ids(client: LexicalOracleClient, text: str, seeds: Dict[str, Seed]) -> set:
+    raw = client.ask(build_trap_analysis_prompt(text, seeds))
+    return {m["seed_id"] for m in json.loads(raw)["matches"]}
+
+
+def run(n_distractors: int, top_ks: List[int]) -> List[Dict[str, object]]:
+    seeds = build_catalog(n_distractors)
+    texts = load_inputs()
+
+    t0 = time.perf_counter()
+    get_seed_index(seeds)
+    index_ms = (time.perf_counter() - t0) * 1000
+
+    full_client = LexicalOracleClient()
+    full = [_match_ids(full_client, t, seeds) for t in texts]
+
+    results = []
+    for k in top_ks:
+        client = LexicalOracleClient()
+        found = total = 0
+        select_s = 0.0
+        for text, expected in zip(texts, full):
+            t0 = time.perf_counter()
+            subset = select_seeds(text, seeds, {}, top_k=k)
+            select_s += time.perf_counter() - t0
+            got = _match_ids(client, text, subset)
+            found += len(got & expected)
+            total += len(expected)
+        results.append({
+            "catalog_seeds": len(seeds),
+            "inputs": len(texts),
+            "top_k": k,
+            "recall": round(found / total, 4) if total else 1.0,
+            "full_matches_avg": round(total / len(texts), 1),
+            "prompt_chars_full": full_client.prompt_chars // len(texts),
+            "prompt_chars_prefiltered": client.prompt_chars // len(texts),
+            "select_ms_avg": round(select_s * 1000 / len(texts), 3),
+            "index_build_ms": round(index_ms, 2),
+        })
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Seed prefilter recall benchmark")
+    ap.add_argument("--distractors", type=int, default=2000)
+    ap.add_argument("--top-k", type=int, nargs="+", default=[10, 20, 40, 80])
+    ap.add_argument("--json", action="store_true", help="emit JSON lines instead of a table")
+    args = ap.parse_args(argv)
+
+    results = run(args.distractors, args.top_k)
+    if args.json:
+        for r in results:
+            print(json.dumps(r))
+        return
+
+    print(f"{'top_k':>6}  {'recall':>7}  {'full_matches':>12}  {'prompt_chars':>22}  {'select_ms':>9}")
+    for r in results:
+        chars = f"{r['prompt_chars_prefiltered']} / {r['prompt_chars_full']}"
+        print(f"{r['top_k']:>6}  {r['recall']:>7}  {r['full_matches_avg']:>12}  {chars:>22}  {r['select_ms_avg']:>9}")
+
+
+if __name__ == "__main__":
+    main()
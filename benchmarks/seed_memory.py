@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Seed loader memory benchmark.
+
+Compares resident memory held by a loaded seed catalog for:
+  legacy    — the original @dataclass Seed keeping every parsed YAML dict in `raw`
+  slotted   — current load_seeds() with eager raw
+  lazy      — current load_seeds() with seeds.lazy_raw (raw resolved on demand)
+  catalog   — lazy seeds fast-loaded from a compiled catalog
+
+Each measurement runs in a fresh interpreter so allocator state doesn't leak
+between loaders. Two numbers are reported after load + gc:
+  retained_mb   — Python heap still referenced by the seeds (tracemalloc)
+  rss_delta_mb  — process RSS growth; YAML loaders keep this high because the
+                  freed parse tree stays in the allocator's arenas
+
+    python -m benchmarks.seed_memory                  # 1k/10k/100k; 100k takes minutes of YAML parsing
+    python -m benchmarks.seed_memory --sizes 1000 --json
+"""
+from __future__ import annotations
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+LOADERS = ("legacy", "slotted", "lazy", "catalog")
+FAMILIES = ("Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+            "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces")
+
+
+def write_synthetic_catalog(data_dir: Path, n_seeds: int, sub_traps: int = 2) -> None:
+    """n_seeds counts flattened seeds (top-level + sub_traps)."""
+    n_top = max(1, n_seeds // (1 + sub_traps))
+    trap_seeds = []
+    for i in range(n_top):
+        sid = f"S{i:06d}"
+        trap_seeds.append({
+            "id": sid,
+            "title": f"Synthetic trap {i}",
+            "zodiac_family": FAMILIES[i % len(FAMILIES)],
+            "resonance_signature": f"pattern {i} drifts scope and invents intent beyond the brief",
+            "description": "The model extends beyond the provided scope or invents intentions. " * 2,
+            "correction": "Re-anchor to the explicit objective; remove invented layers.",
+            "sub_traps": [
+                {
+                    "id": f"{sid}{chr(97 + j)}",
+                    "title": f"Synthetic sub-trap {i}.{j}",
+                    "resonance_signature": f"sub pattern {i}.{j} mirrors user tone",
+                    "description": "Automatic mimicry, slang reflection, emotional mirroring.",
+                }
+                for j in range(sub_traps)
+            ],
+        })
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    (data_dir / "trap_seeds.yaml").write_text(
+        yaml.dump({"trap_seeds": trap_seeds}, Dumper=dumper, sort_keys=False),
+        encoding="utf-8",
+    )
+
+
+def _config(lazy: bool) -> Dict[str, Any]:
+    return {
+        "families": {"group_field": "zodiac_family", "mapping": {"Aries": "Overreach Trap"}},
+        "seeds": {"catalog_file": "trap_seeds.catalog", "lazy_raw": lazy},
+    }
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        # ru_maxrss is KiB on Linux, bytes on macOS; peak only — best effort
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+@dataclass
+class _LegacySeed:
+    id: str
+    title: str
+    family: str
+    resonance_signature: str
+    raw: Dict[str, Any]
+
+
+def _legacy_load_seeds(data_dir: Path, config: Dict[str, Any]) -> Dict[str, _LegacySeed]:
+    # verbatim shape of the pre-slots loader
+    data = yaml.safe_load((data_dir / "trap_seeds.yaml").read_text(encoding="utf-8"))
+    fam_cfg = config.get("families", {}) or {}
+    group_field = fam_cfg.get("group_field", "zodiac_family")
+    mapping = fam_cfg.get("mapping", {}) or {}
+    out: Dict[str, _LegacySeed] = {}
+    for s in data.get("trap_seeds", []):
+        base = s.get(group_field) or "Ungrouped"
+        family = mapping.get(base, base)
+        out[s["id"]] = _LegacySeed(s["id"], s.get("title", ""), family, s.get("resonance_signature", ""), s)
+        for st in s.get("sub_traps", []):
+            out[st["id"]] = _LegacySeed(st["id"], st.get("title", ""), family, st.get("resonance_signature", ""), st)
+    return out
+
+
+def _child(loader: str, data_dir: Path) -> Dict[str, Any]:
+    sys.path.insert(0, str(ROOT))
+    from prime_node_os.cold_mirror.core.seed_catalog import load_seeds_compiled
+    from prime_node_os.cold_mirror.core.seed_loader import load_seeds
+
+    gc.collect()
+    before = _rss_bytes()
+    tracemalloc.start()
+    if loader == "legacy":
+        seeds = _legacy_load_seeds(data_dir, _config(False))
+    elif loader == "slotted":
+        seeds = load_seeds(data_dir, _config(False))
+    elif loader == "lazy":
+        seeds = load_seeds(data_dir, _config(True))
+    else:
+        seeds = load_seeds_compiled(data_dir, _config(True))
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    after = _rss_bytes()
+    return {
+        "loader": loader,
+        "seeds": len(seeds),
+        "retained_mb": round(retained / 2**20, 2),
+        "rss_delta_mb": round((after - before) / 2**20, 2),
+    }
+
+
+def run(sizes, sub_traps: int = 2):
+    from prime_node_os.cold_mirror.core.seed_catalog import compile_catalog
+
+    results = []
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp)
+            write_synthetic_catalog(data_dir, n, sub_traps)
+            compile_catalog(data_dir, _config(True))
+            for loader in LOADERS:
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.seed_memory", "--child", loader, str(data_dir)],
+                    cwd=ROOT, capture_output=True, text=True, check=True,
+                )
+                rec = json.loads(out.stdout)
+                rec["size"] = n
+                results.append(rec)
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Seed loader RSS benchmark")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--sub-traps", type=int, default=2, help="sub_traps per top-level seed")
+    ap.add_argument("--json", action="store_true", help="emit JSON lines instead of a table")
+    ap.add_argument("--child", nargs=2, metavar=("LOADER", "DATA_DIR"), help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_child(args.child[0], Path(args.child[1]))))
+        return
+
+    results = run(args.sizes, args.sub_traps)
+    if args.json:
+        for r in results:
+            print(json.dumps(r))
+        return
+
+    print(f"{'size':>8}  {'loader':<8}  {'seeds':>8}  {'retained_mb':>11}  {'rss_delta_mb':>12}")
+    for r in results:
+        print(f"{r['size']:>8}  {r['loader']:<8}  {r['seeds']:>8}  {r['retained_mb']:>11}  {r['rss_delta_mb']:>12}")
+
+
+if __name__ == "__main__":
+    main()
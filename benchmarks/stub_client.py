@@ -0,0 +1,144 @@
+"""
+Deterministic, offline LLMClient stand-ins for benchmarks.
+
+LexicalOracleClient reads the SEEDS block and USER CONTENT back out of a
+trap-analysis prompt and "matches" every offered seed whose signature shares
+enough tokens with the user text (at least min_overlap tokens and
+min_confidence of the signature). Same prompt in, same JSON out.
+
+StubLLMClient ignores the text and returns a configurable number of
+offered seeds after an injectable delay: a stand-in for the model's cost
+rather than its judgement.
+"""
+from __future__ import annotations
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from prime_node_os.cold_mirror.core.seed_index import tokenize
+
+_SEED_LINE = re.compile(r"^- (\S+): (.*?) — (.*)$", re.M)
+_USER_MARK = 'USER CONTENT (truncated to 16k chars):\n\n"""'
+
+
+def split_prompt(prompt: str) -> Tuple[List[Tuple[str, str, str]], str]:
+    head, _, tail = prompt.partition(_USER_MARK)
+    user = tail[:-3] if tail.endswith('"""') else tail
+    seeds_block = head.split("SEEDS:", 1)[-1]
+    return _SEED_LINE.findall(seeds_block), user
+
+
+class LexicalOracleClient:
+    def __init__(self, min_overlap: int = 2, min_confidence: float = 0.2) -> None:
+        self.min_overlap = min_overlap
+        self.min_confidence = min_confidence
+        self.calls = 0
+        self.prompt_chars = 0
+
+    def ask(self, prompt: str, **kwargs: Any) -> str:
+        self.calls += 1
+        self.prompt_chars += len(prompt)
+        seeds, user = split_prompt(prompt)
+        user_toks = set(tokenize(user))
+        matches: List[Dict[str, Any]] = []
+        for sid, title, sig in seeds:
+            sig_toks = set(tokenize(f"{title} {sig}"))
+            overlap = sig_toks & user_toks
+            confidence = len(overlap) / len(sig_toks) if sig_toks else 0.0
+            if len(overlap) >= self.min_overlap and confidence >= self.min_confidence:
+                matches.append({
+                    "seed_id": sid,
+                    "confidence": round(confidence, 3),
+                    "evidence": " ".join(sorted(overlap))[:80],
+                })
+        return json.dumps({"matches": matches})
+
+
+class StubLLMClient:
+    """
+    Fake LLMClient with a fixed cost model, for throughput benchmarks.
+
+    Answers with `matches` hits drawn from the seeds offered in the prompt
+    (or from seed_ids), confidences uniform in `confidence`. The response
+    is a function of (seed, prompt, n) where n counts earlier calls with
+    the same prompt, so SC@k samples differ but a rerun reproduces every
+    response. Each call sleeps latency_ms ± jitter_ms (jitter drawn from
+    the same generator); stream() spends the latency before the first
+    chunk. shape "fenced" / "truncated" exercises the repair path.
+    """
+
+    def __init__(
+        self,
+        matches: int = 3,
+        confidence: Tuple[float, float] = (0.5, 0.95),
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        seed: int = 0,
+        shape: str = "clean",
+        seed_ids: Optional[Sequence[str]] = None,
+        chunk: int = 16,
+    ) -> None:
+        if shape not in ("clean", "fenced", "truncated"):
+            raise ValueError(f"unknown response shape {shape!r}")
+        self.matches = matches
+        self.confidence = confidence
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.seed = seed
+        self.shape = shape
+        self.seed_ids = list(seed_ids) if seed_ids is not None else None
+        self.chunk = chunk
+        self.calls = 0
+        self.prompt_chars = 0
+        self._seen: Dict[int, int] = {}
+        self._offered: Dict[int, List[str]] = {}   # seeds-block crc -> ids
+        self._lock = threading.Lock()
+
+    def _offered_ids(self, prompt: str) -> List[str]:
+        if self.seed_ids is not None:
+            return self.seed_ids
+        head = prompt.partition(_USER_MARK)[0]
+        key = zlib.crc32(head.encode("utf-8"))
+        ids = self._offered.get(key)
+        if ids is None:
+            ids = self._offered[key] = [sid for sid, _, _ in split_prompt(head)[0]]
+        return ids
+
+    def _draw(self, prompt: str) -> Tuple[str, float]:
+        key = zlib.crc32(prompt.encode("utf-8"))
+        with self._lock:
+            self.calls += 1
+            self.prompt_chars += len(prompt)
+            n = self._seen.get(key, 0)
+            self._seen[key] = n + 1
+        rng = random.Random(f"{self.seed}:{key}:{n}")
+        ids = self._offered_ids(prompt)
+        lo, hi = self.confidence
+        picked = rng.sample(ids, min(self.matches, len(ids)))
+        body = json.dumps({"matches": [
+            {"seed_id": sid, "confidence": round(rng.uniform(lo, hi), 3), "evidence": f"stub evidence for {sid}"}
+            for sid in picked
+        ]})
+        if self.shape == "fenced":
+            body = f"Here is the audit:\n```json\n{body}\n```"
+        elif self.shape == "truncated":
+            body = body[: int(len(body) * 0.9)]
+        delay = self.latency_ms + (rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0)
+        return body, max(0.0, delay) / 1000
+
+    def ask(self, prompt: str, **kwargs: Any) -> str:
+        body, delay = self._draw(prompt)
+        if delay:
+            time.sleep(delay)
+        return body
+
+    def stream(self, prompt: str, **kwargs: Any) -> Iterator[str]:
+        body, delay = self._draw(prompt)
+        if delay:
+            time.sleep(delay)
+        for i in range(0, len(body), self.chunk):
+            yield body[i:i + self.chunk]
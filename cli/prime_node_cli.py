@@ -5,30 +5,33 @@
 from __future__ import annotations
 import argparse
 import json
+import os
 import sys
 from pathlib import Path
 
-# --- Import Prime Node Runtime ---
-# expects: /mnt/data/engine/prime_node_runtime.py
-ENGINE_PATH = Path("/mnt/data/engine/prime_node_runtime.py")
+# --- Prime Node Runtime (imported on first use) ---
+# The runtime pulls in cold_mirror core; --help and argument errors
+# shouldn't pay for that. Everything is imported as prime_node_os.*;
+# run from a checkout (python cli/prime_node_cli.py) the repo root, which
+# holds the prime_node_os shim, is appended to sys.path so installed
+# packages keep precedence over its generic top-level names.
+_pn = None
 
-if not ENGINE_PATH.exists():
-    print(f"[ERROR] Fusion engine not found at: {ENGINE_PATH}")
-    sys.exit(1)
 
-# dynamic import without disturbing path
-import importlib.util
-spec = importlib.util.spec_from_file_location("prime_node_runtime", ENGINE_PATH)
-pn = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(pn)
+def _ensure_importable():
+    try:
+        import prime_node_os  # noqa: F401
+    except ImportError:
+        sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-# --- Import LLM Client ---
-# You must have: /mnt/data/cold_mirror/engine/llm/openai_client.py
-try:
-    from cold_mirror.engine.llm.openai_client import OpenAIClient
-except Exception:
-    print("[ERROR] OpenAIClient not found. Provide your own LLMClient.")
-    sys.exit(1)
+
+def runtime():
+    global _pn
+    if _pn is None:
+        _ensure_importable()
+        from prime_node_os.engine import prime_node_runtime
+        _pn = prime_node_runtime
+    return _pn
 
 
 def load_text_from_file(path: str) -> str:
@@ -39,15 +42,172 @@ def load_text_from_file(path: str) -> str:
     return p.read_text(encoding="utf-8", errors="replace")
 
 
-def run_audit(text: str, model: str, api_key: str):
+def make_client(model: str, api_key: str, cache: bool = False,
+                cache_dir: str | None = None, cache_ttl: float | None = None):
+    runtime()  # puts the checkout on sys.path when not installed
+    try:
+        from prime_node_os.cold_mirror.engine.llm.openai_client import OpenAIClient
+    except Exception:
+        print("[ERROR] OpenAIClient not found. Provide your own LLMClient.")
+        sys.exit(1)
     llm = OpenAIClient(api_key=api_key, model=model)
-    return pn.run_prime_node_audit(text, llm)
+    if not (cache or cache_dir):
+        return llm
+    # Content-addressed response cache: memory LRU, plus SQLite when cache_dir is set
+    from prime_node_os.cold_mirror.engine.llm.cache import CachingLLMClient, ResponseCache
+    path = Path(cache_dir) / "llm_cache.sqlite3" if cache_dir else None
+    return CachingLLMClient(llm, model=model, cache=ResponseCache(path=path, ttl_s=cache_ttl))
+
+
+def run_audit(text: str, llm, timings: bool | None = None):
+    return runtime().run_prime_node_audit(text, llm, timings=timings)
+
+
+def run_stream_audit(text: str, llm, pretty: bool = False, timings: bool | None = None):
+    # One JSON event per line: each routed hit as it is parsed, then the report
+    report = None
+    for event in runtime().run_prime_node_audit_stream(text, llm, timings=timings):
+        print(json.dumps(event, indent=2 if pretty else None), flush=True)
+        report = event.get("report", report)
+    return report
+
+
+def local_batch_auditor(llm, timings: bool | None = None):
+    # One client + one warm runtime shared by every worker thread
+    pn = runtime()
+    return lambda text: pn.run_prime_node_audit(text, llm, timings=timings)
+
+
+def local_batch_records(items, llm, concurrency: int, ordered: bool, timings: bool | None = None):
+    from prime_node_os.engine.batch_runtime import run_batch
+    return run_batch(items, local_batch_auditor(llm, timings), concurrency, ordered)
+
+
+def daemon_batch_records(items, socket_path: str | None, concurrency: int,
+                         ordered: bool, timings: bool | None = None):
+    # one pipelined connection; the daemon bounds how many audits run at once
+    from prime_node_os.engine.audit_daemon import DaemonClient
+    with DaemonClient(socket_path) as client:
+        yield from client.audit_many(items, window=concurrency, ordered=ordered, timings=timings)
+
+
+def run_batch_audit(source: str, records, out_path: str | None, timings: list | None = None):
+    """Write records(batch inputs of source) as JSONL; returns how many failed."""
+    _ensure_importable()
+    from prime_node_os.engine.batch_runtime import iter_batch_inputs
+
+    out = open(out_path, "w", encoding="utf-8") if out_path else sys.stdout
+    failed = 0
+    try:
+        for rec in records(iter_batch_inputs(source)):
+            failed += "error" in rec
+            if timings is not None and "timings" in rec.get("report", {}):
+                timings.append(rec["report"]["timings"])
+            out.write(json.dumps(rec) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return failed
+
+
+def print_profile(timings: list, out=sys.stderr):
+    """Per-stage p50/p95/p99 (ms) over the collected report["timings"] blocks."""
+    _ensure_importable()
+    from prime_node_os.cold_mirror.core.timing import stage_percentiles
+
+    table = stage_percentiles(timings)
+    print(f"{'stage':<12}  {'n':>5}  {'p50_ms':>9}  {'p95_ms':>9}  {'p99_ms':>9}", file=out)
+    for name, row in table.items():
+        print(f"{name:<12}  {row['count']:>5}  {row['p50']:>9}  {row['p95']:>9}  {row['p99']:>9}", file=out)
+
+
+def flush_profile_histograms():
+    # stage histograms not yet written by the periodic flush
+    _ensure_importable()
+    from prime_node_os.cold_mirror.core.timing import flush_pending
+    flush_pending()
+
+
+# --- Audit daemon (prime-node serve) ---
+def find_daemon(model: str, socket_path: str | None = None):
+    """
+    ping() stats of a daemon serving `model`, else None. ping() already
+    rejects sockets owned or served by another user.
+    """
+    _ensure_importable()
+    from prime_node_os.engine.audit_daemon import ping
+    info = ping(socket_path)
+    if info is None or info.get("model") != model:
+        return None
+    return info
+
+
+def serve_main(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="prime-node serve",
+        description="Keep the runtime and LLM client warm and serve audits "
+                    "over a Unix socket (default) or localhost HTTP"
+    )
+    ap.add_argument("--socket", type=str, default=None,
+                    help="Unix socket path (default: $PRIME_NODE_SOCKET, "
+                         "$XDG_RUNTIME_DIR/prime-node.sock or a per-user temp path)")
+    ap.add_argument("--http", type=str, default=None, metavar="[HOST:]PORT",
+                    help="Serve HTTP/1.1 (POST /audit, GET /health) instead of the socket")
+    ap.add_argument("--token", type=str, default=None,
+                    help="HTTP bearer token (default: $PRIME_NODE_TOKEN, else a random one printed at start)")
+    ap.add_argument("--max-concurrency", "-j", type=int, default=4,
+                    help="Max audits (LLM calls) running at once (default: 4)")
+    ap.add_argument("--max-pending", type=int, default=64,
+                    help="Max audits queued or running before readers block (default: 64)")
+    ap.add_argument("--model", "-m", type=str, default="gpt-4.1-mini")
+    ap.add_argument("--api_key", type=str, default=None)
+    ap.add_argument("--cache", action="store_true")
+    ap.add_argument("--cache-dir", type=str, default=None)
+    ap.add_argument("--cache-ttl", type=float, default=None)
+    args = ap.parse_args(argv)
+
+    llm = make_client(args.model, args.api_key or "", args.cache, args.cache_dir, args.cache_ttl)
+    from prime_node_os.engine.audit_daemon import AuditDaemon, DaemonError, default_socket_path, serve_http, serve_unix
+
+    daemon = AuditDaemon(llm, args.max_concurrency, args.max_pending, info={"model": args.model}).warm()
+    # SIGTERM (service managers) unwinds like Ctrl-C so the socket is removed
+    import signal
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        if args.http:
+            host, _, port = args.http.rpartition(":")
+            host = host or "127.0.0.1"
+            token = args.token or os.environ.get("PRIME_NODE_TOKEN")
+            if not token:
+                import secrets
+                token = secrets.token_urlsafe(24)
+                print(f"[prime-node] bearer token: {token}", file=sys.stderr)
+            print(f"[prime-node] serving http://{host}:{port}", file=sys.stderr)
+            serve_http(daemon, token, host, int(port))
+        else:
+            path = args.socket or default_socket_path()
+            print(f"[prime-node] serving on {path}", file=sys.stderr)
+            serve_unix(daemon, path)
+    except DaemonError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
 
 
 def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["serve"]:
+        return serve_main(argv[1:])
+
     ap = argparse.ArgumentParser(
         prog="prime-node",
-        description="Prime Node OS — Unified Audit CLI"
+        description="Prime Node OS — Unified Audit CLI",
+        epilog="Run `prime-node serve --help` to keep a warm audit daemon; "
+               "audits are forwarded to it while it runs."
     )
 
     ap.add_argument(
@@ -79,35 +239,171 @@ def main(argv=None):
         help="API key for the model backend"
     )
 
+    ap.add_argument(
+        "--batch",
+        "-b",
+        type=str,
+        help="Audit a corpus: directory, glob pattern, or JSONL file (one report per output line)"
+    )
+
+    ap.add_argument(
+        "--concurrency",
+        "-j",
+        type=int,
+        default=4,
+        help="Max audits (LLM calls) in flight in batch mode (default: 4)"
+    )
+
+    ap.add_argument(
+        "--unordered",
+        action="store_true",
+        help="Batch mode: emit reports as they complete instead of in input order"
+    )
+
+    ap.add_argument(
+        "--out",
+        "-o",
+        type=str,
+        default=None,
+        help="Batch mode: write JSONL reports to this file instead of stdout"
+    )
+
+    ap.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse LLM responses for identical (model, prompt, params) calls in this process"
+    )
+
+    ap.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Persist the LLM response cache in this directory (implies --cache)"
+    )
+
+    ap.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=None,
+        help="Expire cached LLM responses after this many seconds"
+    )
+
+    ap.add_argument(
+        "--stream",
+        action="store_true",
+        help="Emit each routed hit as soon as the model produces it, then the report (JSON lines)"
+    )
+
     ap.add_argument(
         "--pretty",
         action="store_true",
         help="Pretty-print output instead of raw JSON"
     )
 
+    ap.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each pipeline stage (report[\"timings\"]) and print per-stage p50/p95/p99 to stderr"
+    )
+
+    ap.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        help="Daemon socket to forward to (see `prime-node serve`)"
+    )
+
+    ap.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Always audit in-process, even when a daemon is running "
+             "(implied by --api_key and the --cache options)"
+    )
+
     args = ap.parse_args(argv)
 
-    if not args.text and not args.file:
-        print("[ERROR] Provide either --text or --file")
+    if not args.text and not args.file and not args.batch:
+        print("[ERROR] Provide either --text, --file or --batch")
         sys.exit(1)
 
+    # Forward to a running `prime-node serve` for the same model: no runtime
+    # import, config/seed load or client construction in this process.
+    # The daemon uses its own key and cache, so per-call client settings
+    # keep the audit in-process.
+    local_only = args.no_daemon or args.api_key or args.cache or args.cache_dir or args.cache_ttl is not None
+    daemon = None if local_only else find_daemon(args.model, args.socket)
+
+    if daemon is None:
+        api_key = args.api_key or ""
+        if not api_key:
+            print("[WARN] No API key provided — assuming OPENAI_API_KEY env var", file=sys.stderr)
+        llm = make_client(args.model, api_key, args.cache, args.cache_dir, args.cache_ttl)
+
+    timings = True if args.profile else None
+    collected: list = []
+
+    def done():
+        if args.profile:
+            if daemon is None:
+                flush_profile_histograms()
+            print_profile(collected)
+
+    if args.batch:
+        ordered = not args.unordered
+        if daemon:
+            records = lambda items: daemon_batch_records(items, args.socket, args.concurrency, ordered, timings)
+        else:
+            records = lambda items: local_batch_records(items, llm, args.concurrency, ordered, timings)
+        from prime_node_os.engine.audit_daemon import DaemonError
+        try:
+            failed = run_batch_audit(args.batch, records, out_path=args.out,
+                                     timings=collected if args.profile else None)
+        except (FileNotFoundError, DaemonError) as e:
+            print(f"[ERROR] {e}", file=sys.stderr)
+            sys.exit(1)
+        done()
+        sys.exit(1 if failed else 0)
+
     if args.file:
         text = load_text_from_file(args.file)
     else:
         text = args.text
 
-    api_key = args.api_key or ""
-    if not api_key:
-        print("[WARN] No API key provided — assuming OPENAI_API_KEY env var")
+    indent = 2 if args.pretty else None
+    if daemon is not None:
+        from prime_node_os.engine.audit_daemon import DaemonClient, DaemonError
+        try:
+            with DaemonClient(args.socket) as client:
+                if args.stream:
+                    on_event = lambda ev: print(json.dumps(ev, indent=indent), flush=True)
+                    report = client.audit(text, on_event=on_event, timings=timings)
+                    print(json.dumps({"type": "report", "report": report}, indent=indent), flush=True)
+                else:
+                    report = client.audit(text, timings=timings)
+                    print(json.dumps(report, indent=indent))
+        except DaemonError as e:
+            print(f"[ERROR] {e}", file=sys.stderr)
+            sys.exit(1)
+        collected.append(report.get("timings", {}))
+        done()
+        return
+
+    if args.stream:
+        report = run_stream_audit(text, llm, args.pretty, timings)
+        collected.append((report or {}).get("timings", {}))
+        done()
+        return
 
     # Run audit through fusion engine
-    report = run_audit(text, args.model, api_key)
+    report = run_audit(text, llm, timings)
 
     # Output
     if args.pretty:
         print(json.dumps(report, indent=2))
     else:
         print(json.dumps(report))
+    collected.append(report.get("timings", {}))
+    done()
 
 
 if __name__ == "__main__":
@@ -2,8 +2,6 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
-import yaml
-
 
 def load_adapters(data_dir: Path) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """
@@ -11,6 +9,8 @@ def load_adapters(data_dir: Path) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     step_sets: name -> {steps: [...]}
     adapters:  context_key -> {use: step_set_name}
     """
+    import yaml
+
     path = data_dir / "adapters.yaml"
     data = yaml.safe_load(path.read_text(encoding="utf-8"))
 
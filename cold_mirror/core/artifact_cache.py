@@ -0,0 +1,145 @@
+from __future__ import annotations
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from .seed_catalog import catalog_path, load_seeds_compiled
+from .seed_loader import Seed
+
+
+# (mtime_ns, size, inode) per dependency; None when the file is missing
+Signature = Tuple[Optional[Tuple[int, int, int]], ...]
+
+
+def _stat_signature(paths: Iterable[Path]) -> Signature:
+    sig = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+        except OSError:
+            sig.append(None)
+            continue
+        sig.append((st.st_mtime_ns, st.st_size, st.st_ino))
+    return tuple(sig)
+
+
+class _Entry:
+    __slots__ = ("lock", "loaded", "signature", "value")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.signature: Optional[Signature] = None
+        self.value: Any = None
+
+
+class ArtifactCache:
+    """
+    Process-lifetime cache for parsed config / seed / threshold files.
+
+    Each entry is keyed by name and depends on one or more files. On every
+    lookup the files are stat'ed; the loader runs again only when the
+    (mtime, size, inode) signature of any dependency changed.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def get(self, key: str, paths: Iterable[Path], loader: Callable[[], Any]) -> Any:
+        paths = tuple(paths)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+
+        with entry.lock:
+            sig = _stat_signature(paths)
+            if entry.loaded and entry.signature == sig:
+                with self._lock:
+                    self.hits += 1
+                return entry.value
+
+            value = loader()
+            # re-stat after loading so a write racing the load triggers a reload next time
+            if _stat_signature(paths) != sig:
+                sig = None
+            with self._lock:
+                if entry.loaded:
+                    self.reloads += 1
+                else:
+                    self.misses += 1
+            entry.loaded = True
+            entry.signature = sig
+            entry.value = value
+            return value
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+            }
+
+
+def _read_yaml(path: Path) -> Any:
+    import yaml
+
+    return yaml.safe_load(path.read_text(encoding="utf-8"))
+
+
+# Shared by cold_mirror_engine.run_audit and prime_node_runtime.run_prime_node_audit
+CACHE = ArtifactCache()
+
+
+def cached_yaml(path: Path, cache: ArtifactCache = CACHE) -> Any:
+    path = Path(path)
+    return cache.get(f"yaml:{path}", (path,), lambda: _read_yaml(path))
+
+
+def cached_config(data_dir: Path, cache: ArtifactCache = CACHE) -> Dict[str, Any]:
+    return cached_yaml(Path(data_dir) / "config.yaml", cache)
+
+
+def seed_dependencies(data_dir: Path, cache: ArtifactCache = CACHE) -> Tuple[Path, ...]:
+    """Files whose change invalidates the seed dict for data_dir."""
+    data_dir = Path(data_dir)
+    config = cached_config(data_dir, cache)
+    return (
+        data_dir / "trap_seeds.yaml",
+        data_dir / "config.yaml",
+        catalog_path(data_dir, config),
+    )
+
+
+def cached_seeds(data_dir: Path, cache: ArtifactCache = CACHE) -> Dict[str, Seed]:
+    """
+    Flattened Seed dict for data_dir. Depends on trap_seeds.yaml, config.yaml
+    (families.mapping decides each seed's family) and the compiled catalog,
+    which is preferred over YAML whenever it is current.
+    """
+    data_dir = Path(data_dir)
+    return cache.get(
+        f"seeds:{data_dir}",
+        seed_dependencies(data_dir, cache),
+        lambda: load_seeds_compiled(data_dir, cached_config(data_dir, cache)),
+    )
+
+
+def cache_stats(cache: ArtifactCache = CACHE) -> Dict[str, int]:
+    return cache.stats()
@@ -0,0 +1,358 @@
+from __future__ import annotations
+import datetime as dt
+import gzip
+import io
+import json
+import pickle
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional
+
+from .ledger_writer import read_index
+
+try:
+    import numpy as np
+except ImportError:  # optional: snapshots fall back to array-backed loops
+    np = None
+
+# ISO-8601 prefix length per bucket; ledger timestamps sort lexicographically
+BUCKETS = {"minute": 16, "hour": 13, "day": 10, "month": 7}
+
+
+# -----------------------
+# Segment discovery + streaming
+# -----------------------
+def _after(ts: str, until: str) -> bool:
+    # until is inclusive down to its own precision: "2026-01-02" keeps the
+    # whole day, "2026-01-02T12" the whole hour
+    return ts[:len(until)] > until
+
+
+def _overlaps(entry: Dict[str, Any], since: Optional[str], until: Optional[str]) -> bool:
+    first, last = entry.get("first_ts"), entry.get("last_ts")
+    if since and last and last < since:
+        return False
+    if until and first and _after(first, until):
+        return False
+    return True
+
+
+def iter_segments(ledger: Path, since: Optional[str] = None, until: Optional[str] = None) -> Iterator[Path]:
+    """
+    Closed segments (oldest first) then the active file. Indexed segments
+    whose time range misses [since, until] are skipped without being opened;
+    segments on disk that the index doesn't know about are always read.
+    """
+    ledger = Path(ledger)
+    indexed = set()
+    for entry in read_index(ledger).get("segments", []):
+        indexed.add(entry["file"])
+        seg = ledger.with_name(entry["file"])
+        if seg.exists() and _overlaps(entry, since, until):
+            yield seg
+    for seg in sorted(ledger.parent.glob(f"{ledger.stem}.*{ledger.suffix}*")):
+        name = seg.name
+        if name in indexed or name.endswith((".lock", ".index.json")) or ".tmp" in name:
+            continue
+        yield seg
+    if ledger.exists():
+        yield ledger
+
+
+def _open_segment(path: Path) -> IO[bytes]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    if path.suffix == ".zst":
+        import zstandard
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(path.open("rb")))
+    return path.open("rb")
+
+
+def iter_records(
+    ledger: Path,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream ledger records (rotated + compressed segments included) in
+    constant memory. since/until are ISO prefixes, both inclusive.
+    """
+    for seg in iter_segments(ledger, since, until):
+        with _open_segment(seg) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn line from a crashed writer
+                ts = rec.get("timestamp") or ""
+                if since and ts < since:
+                    continue
+                if until and _after(ts, until):
+                    continue
+                yield rec
+
+
+# -----------------------
+# Streaming aggregation
+# -----------------------
+def hit_bucket(n: int) -> str:
+    """Histogram bin for total_seed_hits: 0, 1, 2, 3-4, 5-8, 9-16, ..."""
+    if n <= 2:
+        return str(max(0, n))
+    hi = 1 << (n - 1).bit_length()
+    return f"{hi // 2 + 1}-{hi}"
+
+
+class LedgerStats:
+    """
+    One-pass aggregate over ledger records. Memory grows with the number of
+    distinct families and time buckets, not with the number of runs.
+    """
+
+    def __init__(self, bucket: str = "hour") -> None:
+        if bucket not in BUCKETS:
+            raise ValueError(f"bucket must be one of {tuple(BUCKETS)}, got {bucket!r}")
+        self.bucket = bucket
+        self._cut = BUCKETS[bucket]
+        self.runs = 0
+        self.total_hits = 0
+        self.family_hits: Counter = Counter()
+        self.top_family: Counter = Counter()
+        self.hit_histogram: Counter = Counter()
+        self.runs_per_bucket: Counter = Counter()
+        self.first_ts: Optional[str] = None
+        self.last_ts: Optional[str] = None
+
+    def add(self, rec: Dict[str, Any]) -> None:
+        self.runs += 1
+        n = int(rec.get("total_seed_hits", 0) or 0)
+        self.total_hits += n
+        self.hit_histogram[hit_bucket(n)] += 1
+        self.family_hits.update(rec.get("families_hit") or ())
+        self.top_family[rec.get("top_family")] += 1
+        ts = rec.get("timestamp")
+        if ts:
+            self.runs_per_bucket[ts[: self._cut]] += 1
+            if self.first_ts is None or ts < self.first_ts:
+                self.first_ts = ts
+            if self.last_ts is None or ts > self.last_ts:
+                self.last_ts = ts
+
+    def consume(self, records: Iterable[Dict[str, Any]]) -> "LedgerStats":
+        for rec in records:
+            self.add(rec)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        runs = self.runs or 1
+        return {
+            "runs": self.runs,
+            "first_ts": self.first_ts,
+            "last_ts": self.last_ts,
+            "mean_seed_hits": round(self.total_hits / runs, 4),
+            "family_hit_frequency": {f: round(c / runs, 4) for f, c in self.family_hits.most_common()},
+            "family_hits": dict(self.family_hits.most_common()),
+            "top_family": {str(f): c for f, c in self.top_family.most_common()},
+            "hit_histogram": dict(sorted(self.hit_histogram.items(), key=lambda kv: _bucket_lo(kv[0]))),
+            "bucket": self.bucket,
+            "runs_per_bucket": dict(sorted(self.runs_per_bucket.items())),
+        }
+
+
+def _bucket_lo(label: str) -> int:
+    return int(label.split("-")[0])
+
+
+def summarize(
+    ledger: Path,
+    bucket: str = "hour",
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Dict[str, Any]:
+    return LedgerStats(bucket).consume(iter_records(ledger, since, until)).to_dict()
+
+
+# -----------------------
+# Columnar snapshot
+# -----------------------
+def _epoch(ts: Optional[str]) -> float:
+    if not ts:
+        return float("nan")
+    try:
+        return dt.datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return float("nan")
+
+
+class LedgerSnapshot:
+    """
+    Columnar copy of a ledger for repeated queries over millions of runs.
+
+    Columns: ts (epoch seconds), hits (total_seed_hits), top (family code,
+    -1 for none) and families_hit as CSR (fam_offsets + fam_codes) against
+    the shared `families` vocabulary. Backed by NumPy when installed,
+    otherwise by array.array.
+    """
+
+    def __init__(self) -> None:
+        self.families: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self.ts = array("d")
+        self.hits = array("l")
+        self.top = array("l")
+        self.fam_offsets = array("l", [0])
+        self.fam_codes = array("l")
+
+    def _code(self, fam: str) -> int:
+        c = self._codes.get(fam)
+        if c is None:
+            c = self._codes[fam] = len(self.families)
+            self.families.append(fam)
+        return c
+
+    @classmethod
+    def build(cls, records: Iterable[Dict[str, Any]]) -> "LedgerSnapshot":
+        snap = cls()
+        for rec in records:
+            snap.ts.append(_epoch(rec.get("timestamp")))
+            snap.hits.append(int(rec.get("total_seed_hits", 0) or 0))
+            top = rec.get("top_family")
+            snap.top.append(snap._code(top) if top else -1)
+            for fam in rec.get("families_hit") or ():
+                snap.fam_codes.append(snap._code(fam))
+            snap.fam_offsets.append(len(snap.fam_codes))
+        if np is not None:
+            snap._to_numpy()
+        return snap
+
+    def _to_numpy(self) -> None:
+        self.ts = np.frombuffer(self.ts, dtype=np.float64).copy()
+        for name in ("hits", "top", "fam_offsets", "fam_codes"):
+            setattr(self, name, np.asarray(getattr(self, name), dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.hits)
+
+    def _mask(self, since: Optional[float], until: Optional[float]):
+        if since is None and until is None:
+            return None
+        lo = -float("inf") if since is None else since
+        hi = float("inf") if until is None else until
+        if np is not None:
+            return (self.ts >= lo) & (self.ts <= hi)
+        return [lo <= t <= hi for t in self.ts]
+
+    def family_hits(self, since: Optional[float] = None, until: Optional[float] = None) -> Dict[str, int]:
+        mask = self._mask(since, until)
+        if np is not None:
+            if mask is None:
+                counts = np.bincount(self.fam_codes, minlength=len(self.families))
+            else:
+                lengths = np.diff(self.fam_offsets)
+                row_mask = np.repeat(mask, lengths)
+                counts = np.bincount(self.fam_codes[row_mask], minlength=len(self.families))
+            return {self.families[i]: int(c) for i, c in enumerate(counts) if c}
+        counts = [0] * len(self.families)
+        offs = self.fam_offsets
+        for row in range(len(self.hits)):
+            if mask is not None and not mask[row]:
+                continue
+            for j in range(offs[row], offs[row + 1]):
+                counts[self.fam_codes[j]] += 1
+        return {self.families[i]: c for i, c in enumerate(counts) if c}
+
+    def top_family(self, since: Optional[float] = None, until: Optional[float] = None) -> Dict[str, int]:
+        mask = self._mask(since, until)
+        if np is not None:
+            top = self.top if mask is None else self.top[mask]
+            counts = np.bincount(top + 1, minlength=len(self.families) + 1)
+            return {("None" if i == 0 else self.families[i - 1]): int(c) for i, c in enumerate(counts) if c}
+        out: Counter = Counter()
+        for row, code in enumerate(self.top):
+            if mask is None or mask[row]:
+                out["None" if code < 0 else self.families[code]] += 1
+        return dict(out)
+
+    def hit_histogram(self) -> Dict[str, int]:
+        if np is not None:
+            values, counts = np.unique(self.hits, return_counts=True)
+            pairs = zip(values.tolist(), counts.tolist())
+        else:
+            pairs = Counter(self.hits).items()
+        out: Counter = Counter()
+        for v, c in pairs:
+            out[hit_bucket(int(v))] += int(c)
+        return dict(sorted(out.items(), key=lambda kv: _bucket_lo(kv[0])))
+
+    def rate(self, bucket_s: float = 3600.0) -> Dict[float, int]:
+        """Runs per fixed-width time bucket, keyed by bucket start (epoch seconds)."""
+        if np is not None:
+            ts = self.ts[~np.isnan(self.ts)]
+            keys, counts = np.unique(np.floor(ts / bucket_s) * bucket_s, return_counts=True)
+            return dict(zip(keys.tolist(), counts.tolist()))
+        out: Counter = Counter()
+        for t in self.ts:
+            if t == t:  # skip NaN
+                out[(t // bucket_s) * bucket_s] += 1
+        return dict(sorted(out.items()))
+
+    def save(self, path: Path) -> None:
+        with Path(path).open("wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path: Path) -> "LedgerSnapshot":
+        with Path(path).open("rb") as f:
+            return pickle.load(f)
+
+
+# -----------------------
+# CLI
+# -----------------------
+def main(argv=None):
+    import argparse
+
+    default_ledger = Path(__file__).resolve().parents[1] / "data" / "cold_mirror_ledger.jsonl"
+
+    ap = argparse.ArgumentParser(prog="ledger", description="Cold Mirror ledger analytics")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p_stats = sub.add_parser("stats", help="stream the ledger and print aggregate stats as JSON")
+    p_stats.add_argument("--ledger", type=Path, default=default_ledger)
+    p_stats.add_argument("--bucket", choices=tuple(BUCKETS), default="hour")
+    p_stats.add_argument("--since", type=str, default=None, help="ISO timestamp lower bound")
+    p_stats.add_argument("--until", type=str, default=None, help="ISO timestamp upper bound, inclusive (a date keeps the whole day)")
+
+    p_snap = sub.add_parser("snapshot", help="build a columnar snapshot for repeated queries")
+    p_snap.add_argument("--ledger", type=Path, default=default_ledger)
+    p_snap.add_argument("--out", type=Path, required=True)
+
+    p_query = sub.add_parser("query", help="query a columnar snapshot")
+    p_query.add_argument("snapshot", type=Path)
+    p_query.add_argument("--rate-bucket-s", type=float, default=3600.0)
+
+    args = ap.parse_args(argv)
+
+    if args.cmd == "stats":
+        print(json.dumps(summarize(args.ledger, args.bucket, args.since, args.until), indent=2))
+    elif args.cmd == "snapshot":
+        snap = LedgerSnapshot.build(iter_records(args.ledger))
+        snap.save(args.out)
+        print(f"[+] Snapshot of {len(snap)} runs -> {args.out}")
+    else:
+        snap = LedgerSnapshot.load(args.snapshot)
+        print(json.dumps({
+            "runs": len(snap),
+            "family_hits": snap.family_hits(),
+            "top_family": snap.top_family(),
+            "hit_histogram": snap.hit_histogram(),
+            "rate": {str(k): v for k, v in snap.rate(args.rate_bucket_s).items()},
+        }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
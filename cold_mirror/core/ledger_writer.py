@@ -0,0 +1,262 @@
+from __future__ import annotations
+import datetime as dt
+import gzip
+import json
+import os
+import shutil
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+COMPRESSORS = ("gzip", "zstd", "none")
+
+
+def index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".index.json")
+
+
+def read_index(path: Path) -> Dict[str, Any]:
+    """Segment index for a ledger: {"segments": [{file, first_ts, last_ts, records, bytes}, ...]}."""
+    try:
+        return json.loads(index_path(Path(path)).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"segments": []}
+
+
+def _write_index(path: Path, index: Dict[str, Any]) -> None:
+    ip = index_path(path)
+    tmp = ip.with_name(ip.name + f".tmp{os.getpid()}")
+    tmp.write_text(json.dumps(index, indent=1), encoding="utf-8")
+    os.replace(tmp, ip)
+
+
+def _ts_of(line: bytes) -> Optional[str]:
+    try:
+        return json.loads(line).get("timestamp")
+    except (ValueError, AttributeError):
+        return None
+
+
+def _segment_bounds(path: Path) -> Tuple[Optional[str], Optional[str], int]:
+    """(first timestamp, last timestamp, record count) of a closed segment."""
+    first = last = None
+    records = 0
+    with path.open("rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            records += 1
+            if first is None:
+                first = _ts_of(line)
+            last = line
+    return first, (_ts_of(last) if last else None), records
+
+
+def _compress(src: Path, method: str) -> Path:
+    if method == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            method = "gzip"
+        else:
+            dst = src.with_name(src.name + ".zst")
+            with _partial(dst), src.open("rb") as fi, dst.open("wb") as fo:
+                zstandard.ZstdCompressor().copy_stream(fi, fo)
+            src.unlink()
+            return dst
+    if method == "gzip":
+        dst = src.with_name(src.name + ".gz")
+        with _partial(dst), src.open("rb") as fi, gzip.open(dst, "wb", compresslevel=6) as fo:
+            shutil.copyfileobj(fi, fo, 1 << 20)
+        src.unlink()
+        return dst
+    return src
+
+
+@contextmanager
+def _partial(dst: Path) -> Iterator[None]:
+    """Remove a half-written compressed file if compression fails."""
+    try:
+        yield
+    except BaseException:
+        try:
+            dst.unlink()
+        except OSError:
+            pass
+        raise
+
+
+class LedgerWriter:
+    """
+    Append-only JSONL ledger that is safe to share between processes.
+
+    - Each batch is one os.write() on an O_APPEND descriptor, under an
+      advisory flock on <ledger>.lock, so records never interleave.
+    - The active file is rotated when it exceeds max_bytes or when it was
+      last written on an earlier UTC day (daily=True). Closed segments are
+      renamed to <stem>.<stamp><suffix>, compressed (gzip, or zstd when the
+      zstandard package is installed), and listed in <ledger>.index.json
+      with their first/last timestamps so readers can skip segments.
+    - Writers notice rotation done by other processes (inode changed) and
+      reopen the active file.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: Optional[int] = 64 * 2**20,
+        daily: bool = True,
+        compress: str = "gzip",
+        lock: bool = True,
+    ) -> None:
+        if compress not in COMPRESSORS:
+            raise ValueError(f"compress must be one of {COMPRESSORS}, got {compress!r}")
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.daily = daily
+        self.compress = compress
+        self.lock = lock and fcntl is not None
+        self._fd: Optional[int] = None
+        self._lock_fd: Optional[int] = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    # -----------------------
+    # Locking / file handles
+    # -----------------------
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        if not self.lock:
+            yield
+            return
+        if self._lock_fd is None:
+            lock_path = self.path.with_name(self.path.name + ".lock")
+            self._lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _open(self) -> int:
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
+
+    def _current_fd(self) -> int:
+        fd = self._fd
+        if fd is None:
+            return self._open()
+        # another process may have rotated the file out from under us
+        try:
+            if os.stat(self.path).st_ino == os.fstat(fd).st_ino:
+                return fd
+        except FileNotFoundError:
+            pass
+        os.close(fd)
+        return self._open()
+
+    # -----------------------
+    # Rotation
+    # -----------------------
+    def _needs_rotation(self, fd: int, incoming: int) -> bool:
+        st = os.fstat(fd)
+        if st.st_size == 0:
+            return False
+        if self.max_bytes is not None and st.st_size + incoming > self.max_bytes:
+            return True
+        if self.daily:
+            last_day = dt.datetime.fromtimestamp(st.st_mtime, dt.timezone.utc).date()
+            return last_day < dt.datetime.now(dt.timezone.utc).date()
+        return False
+
+    def _rotate(self) -> Optional[Path]:
+        """Rename the active file to a segment and index it. Caller holds the lock."""
+        stamp = dt.datetime.now(dt.timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        seg = self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+        os.replace(self.path, seg)
+        os.close(self._fd)
+        self._open()
+
+        # bounds are filled in by _finish_segment; None means "unknown, don't skip"
+        index = read_index(self.path)
+        index.setdefault("segments", []).append({
+            "file": seg.name,
+            "first_ts": None,
+            "last_ts": None,
+            "records": None,
+            "bytes": seg.stat().st_size,
+        })
+        _write_index(self.path, index)
+        return seg
+
+    def _finish_segment(self, seg: Path) -> None:
+        """
+        Scan + compress a rotated segment outside the append lock (other
+        writers keep going), then record its time range in the index. A
+        failed compression leaves the segment uncompressed.
+        """
+        first, last, records = _segment_bounds(seg)
+        try:
+            out = _compress(seg, self.compress)
+        except Exception as e:
+            # leave it uncompressed (still readable); this may run on the sink thread
+            print(f"[WARN] ledger: could not compress {seg.name}: {e!r}", file=sys.stderr)
+            out = seg
+        with self._locked():
+            index = read_index(self.path)
+            for entry in index.get("segments", []):
+                if entry.get("file") == seg.name:
+                    entry.update(file=out.name, first_ts=first, last_ts=last, records=records)
+            _write_index(self.path, index)
+
+    # -----------------------
+    # Public API
+    # -----------------------
+    def append(self, data: str) -> None:
+        """Append pre-serialised JSONL (one or more complete lines) atomically."""
+        buf = data.encode("utf-8")
+        seg = None
+        with self._locked():
+            fd = self._current_fd()
+            if self._needs_rotation(fd, len(buf)):
+                seg = self._rotate()
+                fd = self._fd
+            view = memoryview(buf)
+            while view:
+                n = os.write(fd, view)
+                view = view[n:]
+        if seg is not None:
+            self._finish_segment(seg)
+
+    def append_records(self, recs: List[Dict[str, Any]]) -> None:
+        self.append("".join(json.dumps(r) + "\n" for r in recs))
+
+    def rotate(self) -> Optional[Path]:
+        """Force a rotation of a non-empty active file; returns the closed segment."""
+        seg = None
+        with self._locked():
+            fd = self._current_fd()
+            if os.fstat(fd).st_size:
+                seg = self._rotate()
+        if seg is not None:
+            self._finish_segment(seg)
+        return seg
+
+    def fsync(self) -> None:
+        if self._fd is not None:
+            os.fsync(self._fd)
+
+    def close(self) -> None:
+        for attr in ("_fd", "_lock_fd"):
+            fd = getattr(self, attr)
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+                setattr(self, attr, None)
@@ -1,6 +1,17 @@
 from __future__ import annotations
-from collections import defaultdict
-from typing import Any, Dict, List
+import hashlib
+import heapq
+from typing import Any, Dict, List, Tuple
+
+RAW_TEXT_MODES = ("embed", "omit", "ref")
+
+
+def raw_text_ref(raw_text: str) -> Dict[str, Any]:
+    """Stand-in for the input text: enough to match a report to its input."""
+    return {
+        "sha256": hashlib.sha256(raw_text.encode("utf-8")).hexdigest(),
+        "length": len(raw_text),
+    }
 
 
 def build_report(
@@ -8,30 +19,41 @@ def build_report(
     hits: List[Dict[str, Any]],
     config: Dict[str, Any],
 ) -> Dict[str, Any]:
-    max_per_family = int(
-        config.get("report", {}).get("max_seeds_per_family", 5)
-    )
+    report_cfg = config.get("report", {}) or {}
+    max_per_family = int(report_cfg.get("max_seeds_per_family", 5))
+    raw_mode = report_cfg.get("raw_text", "embed")
+    if raw_mode not in RAW_TEXT_MODES:
+        raise ValueError(f"report.raw_text must be one of {RAW_TEXT_MODES}, got {raw_mode!r}")
+
+    # One pass: a bounded min-heap of the top max_per_family hits per family
+    # (ties keep input order via -seq) and each family's strongest confidence.
+    heaps: Dict[str, List[Tuple[float, int, Dict[str, Any]]]] = {}
+    family_max: Dict[str, float] = {}
+    for seq, h in enumerate(hits):
+        fam = h["family"]
+        conf = h.get("confidence", 0.0)
+        heap = heaps.get(fam)
+        if heap is None:
+            heap = heaps[fam] = []
+            family_max[fam] = conf
+        elif conf > family_max[fam]:
+            family_max[fam] = conf
 
-    grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-    for h in hits:
-        grouped[h["family"]].append(h)
-
-    # sort + cap per family
-    families = []
-    for fam, items in grouped.items():
-        items_sorted = sorted(
-            items, key=lambda x: x.get("confidence", 0.0), reverse=True
-        )[:max_per_family]
-        families.append(
-            {
-                "family": fam,
-                "hits": items_sorted,
-            }
-        )
-
-    # order families by strongest hit
+        if len(heap) < max_per_family:
+            heapq.heappush(heap, (conf, -seq, h))
+        elif heap and (conf, -seq) > heap[0][:2]:
+            heapq.heapreplace(heap, (conf, -seq, h))
+
+    # family order: strongest hit first, first appearance breaks ties
+    families = [
+        {
+            "family": fam,
+            "hits": [h for _, _, h in sorted(heap, key=lambda e: (-e[0], -e[1]))],
+        }
+        for fam, heap in heaps.items()
+    ]
     families.sort(
-        key=lambda f: max((h["confidence"] for h in f["hits"]), default=0.0),
+        key=lambda f: family_max[f["family"]] if f["hits"] else 0.0,
         reverse=True,
     )
 
@@ -40,8 +62,12 @@ def build_report(
         "families_hit": [f["family"] for f in families],
     }
 
-    return {
+    report: Dict[str, Any] = {
         "summary": summary,
         "families": families,
-        "raw_text": raw_text,
     }
+    if raw_mode == "embed":
+        report["raw_text"] = raw_text
+    elif raw_mode == "ref":
+        report["raw_text_ref"] = raw_text_ref(raw_text)
+    return report
@@ -0,0 +1,180 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .seed_loader import RawSource, Seed, load_seeds
+
+
+CATALOG_FORMAT = 2
+DEFAULT_CATALOG_FILE = "trap_seeds.catalog"
+
+
+def catalog_path(data_dir: Path, config: Dict[str, Any]) -> Path:
+    seeds_cfg = config.get("seeds", {}) or {}
+    return Path(data_dir) / seeds_cfg.get("catalog_file", DEFAULT_CATALOG_FILE)
+
+
+def catalog_hash(data_dir: Path, config: Dict[str, Any]) -> str:
+    """
+    Content hash of everything that shapes the flattened seed dict:
+    the raw trap_seeds.yaml bytes plus the families grouping config
+    and whether raw payloads are embedded.
+    """
+    fam_cfg = config.get("families", {}) or {}
+    families = {
+        "group_field": fam_cfg.get("group_field", "zodiac_family"),
+        "mapping": fam_cfg.get("mapping", {}) or {},
+        "lazy_raw": bool((config.get("seeds", {}) or {}).get("lazy_raw", False)),
+    }
+    h = hashlib.sha256()
+    h.update(f"format={CATALOG_FORMAT}\n".encode("ascii"))
+    h.update(json.dumps(families, sort_keys=True).encode("utf-8"))
+    h.update(b"\n")
+    h.update((Path(data_dir) / "trap_seeds.yaml").read_bytes())
+    return h.hexdigest()
+
+
+def compile_catalog(
+    data_dir: Path,
+    config: Dict[str, Any],
+    out_path: Optional[Path] = None,
+) -> Path:
+    """
+    Parse trap_seeds.yaml once and write the flattened seeds as a pickled
+    catalog. The file holds a small header (format + content hash) followed
+    by the seed rows, so staleness can be checked without loading the rows.
+    With `seeds.lazy_raw`, raw payloads are left out and resolved from the
+    source YAML on demand.
+    """
+    data_dir = Path(data_dir)
+    out_path = Path(out_path) if out_path else catalog_path(data_dir, config)
+
+    digest = catalog_hash(data_dir, config)
+    seeds_by_id = load_seeds(data_dir, config)
+    rows = [
+        (s.id, s.title, s.family, s.resonance_signature, s.raw if s.raw_loaded else None)
+        for s in seeds_by_id.values()
+    ]
+
+    tmp = out_path.with_name(out_path.name + f".tmp{os.getpid()}")
+    with tmp.open("wb") as f:
+        header = {
+            "format": CATALOG_FORMAT,
+            "hash": digest,
+            "count": len(rows),
+        }
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, out_path)
+    return out_path
+
+
+def read_catalog_header(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with Path(path).open("rb") as f:
+            header = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return None
+    return header if isinstance(header, dict) else None
+
+
+def load_catalog(
+    path: Path,
+    expected_hash: Optional[str] = None,
+    source: Optional[Path] = None,
+) -> Optional[Dict[str, Seed]]:
+    """
+    Fast-load a compiled catalog. Returns None when the file is missing,
+    unreadable, from another format version, or doesn't match expected_hash.
+    Raw payloads left out at compile time resolve from `source`, the
+    trap_seeds.yaml next to the catalog being loaded.
+    """
+    try:
+        with Path(path).open("rb") as f:
+            header = pickle.load(f)
+            if not isinstance(header, dict) or header.get("format") != CATALOG_FORMAT:
+                return None
+            if expected_hash is not None and header.get("hash") != expected_hash:
+                return None
+            rows = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return None
+
+    raw_source = RawSource(source) if source is not None else None
+    return {
+        sid: Seed(id=sid, title=title, family=family, resonance_signature=sig, raw=raw, source=raw_source)
+        for sid, title, family, sig, raw in rows
+    }
+
+
+def load_seeds_compiled(data_dir: Path, config: Dict[str, Any]) -> Dict[str, Seed]:
+    """
+    Drop-in for load_seeds(): uses the compiled catalog when it matches the
+    current trap_seeds.yaml + families config, else falls back to YAML.
+    """
+    data_dir = Path(data_dir)
+    path = catalog_path(data_dir, config)
+    if path.exists():
+        seeds_by_id = load_catalog(
+            path,
+            expected_hash=catalog_hash(data_dir, config),
+            source=data_dir / "trap_seeds.yaml",
+        )
+        if seeds_by_id is not None:
+            return seeds_by_id
+    return load_seeds(data_dir, config)
+
+
+# -----------------------
+# CLI
+# -----------------------
+def main(argv=None):
+    import argparse
+    import sys
+
+    import yaml
+
+    default_data = Path(__file__).resolve().parents[1] / "data"
+
+    ap = argparse.ArgumentParser(
+        prog="seed-catalog",
+        description="Compile trap_seeds.yaml into a fast-loading seed catalog",
+    )
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p_compile = sub.add_parser("compile", help="compile trap_seeds.yaml + families mapping")
+    p_compile.add_argument("--data-dir", type=Path, default=default_data)
+    p_compile.add_argument("--out", type=Path, default=None, help="catalog path (default: from config.yaml)")
+
+    p_check = sub.add_parser("check", help="report whether the compiled catalog is current")
+    p_check.add_argument("--data-dir", type=Path, default=default_data)
+    p_check.add_argument("--catalog", type=Path, default=None)
+
+    args = ap.parse_args(argv)
+    config = yaml.safe_load((args.data_dir / "config.yaml").read_text(encoding="utf-8")) or {}
+
+    if args.cmd == "compile":
+        out = compile_catalog(args.data_dir, config, args.out)
+        header = read_catalog_header(out) or {}
+        print(f"[+] Compiled {header.get('count', 0)} seeds -> {out} ({header.get('hash', '')[:12]})")
+        return 0
+
+    path = args.catalog or catalog_path(args.data_dir, config)
+    header = read_catalog_header(path)
+    if header is None:
+        print(f"[WARN] No readable catalog at {path}", file=sys.stderr)
+        return 1
+    current = catalog_hash(args.data_dir, config)
+    if header.get("format") != CATALOG_FORMAT or header.get("hash") != current:
+        print(f"[WARN] Catalog is stale: {path}", file=sys.stderr)
+        return 1
+    print(f"[+] Catalog is current: {path} ({header.get('count', 0)} seeds)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
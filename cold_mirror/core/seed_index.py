@@ -0,0 +1,147 @@
+from __future__ import annotations
+import heapq
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .seed_loader import Seed
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or "
+    "that the their this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+class SeedIndex:
+    """
+    BM25 inverted index over seed titles + resonance signatures.
+    Only seeds that would appear in the prompt (non-empty signature) are indexed.
+    """
+
+    def __init__(self, seeds_by_id: Dict[str, Seed], k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self.ids: List[str] = []
+        self._families: List[str] = []
+        self._always_on: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], List[int]] = {}
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        lengths: List[int] = []
+
+        for seed in seeds_by_id.values():
+            if not seed.resonance_signature:
+                continue
+            doc = len(self.ids)
+            self.ids.append(seed.id)
+            self._families.append(seed.family)
+            toks = tokenize(f"{seed.title} {seed.resonance_signature}")
+            lengths.append(len(toks))
+            tf: Dict[str, int] = {}
+            for t in toks:
+                tf[t] = tf.get(t, 0) + 1
+            for t, n in tf.items():
+                postings.setdefault(t, []).append((doc, n))
+
+        n_docs = len(self.ids)
+        avgdl = (sum(lengths) / n_docs) if n_docs else 0.0
+        # fold idf and length normalisation in at build time; queries only add
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        for t, plist in postings.items():
+            idf = math.log(1.0 + (n_docs - len(plist) + 0.5) / (len(plist) + 0.5))
+            weighted = []
+            for doc, tf in plist:
+                norm = k1 * (1.0 - b + b * (lengths[doc] / avgdl if avgdl else 0.0))
+                weighted.append((doc, idf * tf * (k1 + 1.0) / (tf + norm)))
+            self._postings[t] = weighted
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _score(self, text: str, top_k: int) -> List[Tuple[int, float]]:
+        scores: Dict[int, float] = {}
+        for t in set(tokenize(text)):
+            for doc, w in self._postings.get(t, ()):
+                scores[doc] = scores.get(doc, 0.0) + w
+        return heapq.nlargest(top_k, scores.items(), key=lambda kv: kv[1])
+
+    def rank(self, text: str, top_k: int) -> List[Tuple[str, float]]:
+        """Top-k (seed_id, score) pairs with a positive score, best first."""
+        return [(self.ids[doc], score) for doc, score in self._score(text, top_k)]
+
+    def always_on(self, ids: Iterable[str], families: Iterable[str]) -> List[int]:
+        key = (tuple(ids), tuple(families))
+        docs = self._always_on.get(key)
+        if docs is None:
+            want_ids, want_fams = set(key[0]), set(key[1])
+            docs = [
+                doc for doc, sid in enumerate(self.ids)
+                if sid in want_ids or self._families[doc] in want_fams
+            ]
+            self._always_on[key] = docs
+        return docs
+
+    def select(self, text: str, top_k: int, always_on: Iterable[int] = ()) -> List[str]:
+        """Seed ids of the top_k docs plus always_on docs, in catalog order."""
+        keep = set(always_on)
+        keep.update(doc for doc, _ in self._score(text, top_k))
+        return [self.ids[doc] for doc in sorted(keep)]
+
+
+# One index per catalog, keyed by seed-dict identity (see prompts prefix cache)
+_INDEX_CACHE: "OrderedDict[Tuple[int, int], Tuple[Dict[str, Seed], SeedIndex]]" = OrderedDict()
+_INDEX_CACHE_SIZE = 4
+_INDEX_LOCK = threading.Lock()
+
+
+def get_seed_index(seeds_by_id: Dict[str, Seed]) -> SeedIndex:
+    key = (id(seeds_by_id), len(seeds_by_id))
+    with _INDEX_LOCK:
+        entry = _INDEX_CACHE.get(key)
+        if entry is not None and entry[0] is seeds_by_id:
+            _INDEX_CACHE.move_to_end(key)
+            return entry[1]
+
+    index = SeedIndex(seeds_by_id)
+
+    with _INDEX_LOCK:
+        _INDEX_CACHE[key] = (seeds_by_id, index)
+        while len(_INDEX_CACHE) > _INDEX_CACHE_SIZE:
+            _INDEX_CACHE.popitem(last=False)
+    return index
+
+
+def select_seeds(
+    text: str,
+    seeds_by_id: Dict[str, Seed],
+    config: Dict[str, Any],
+    top_k: Optional[int] = None,
+) -> Dict[str, Seed]:
+    """
+    Optional prefilter before build_trap_analysis_prompt: keep the top_k seeds
+    ranked against `text` plus any always-on seeds, in catalog order.
+    Seeds without a resonance_signature never reach the prompt and are dropped.
+
+    Returns seeds_by_id itself when the prefilter is disabled or the catalog
+    is already small enough, so the cached full-catalog prompt prefix is reused.
+    """
+    pf_cfg = config.get("prefilter", {}) or {}
+    if not pf_cfg.get("enabled", False) and top_k is None:
+        return seeds_by_id
+    k = int(top_k if top_k is not None else pf_cfg.get("top_k", 40))
+
+    index = get_seed_index(seeds_by_id)
+    if len(index) <= k:
+        return seeds_by_id
+
+    always_on = index.always_on(
+        pf_cfg.get("always_on", []) or [],
+        pf_cfg.get("always_on_families", []) or [],
+    )
+    return {sid: seeds_by_id[sid] for sid in index.select(text[:16000], k, always_on)}
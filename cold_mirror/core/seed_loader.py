@@ -1,25 +1,141 @@
 from __future__ import annotations
-from dataclasses import dataclass
+import os
+import sys
+import threading
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Optional, Tuple
 
-import yaml
+# path -> ((mtime_ns, size), {seed_id: raw dict}); one parse per file version
+_RAW_INDEX: Dict[str, Tuple[Tuple[int, int], Dict[str, Dict[str, Any]]]] = {}
+_RAW_LOCK = threading.Lock()
+
+
+def _raw_index(path: Path) -> Dict[str, Dict[str, Any]]:
+    import yaml
+
+    key = str(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    sig = (st.st_mtime_ns, st.st_size)
+    with _RAW_LOCK:
+        cached = _RAW_INDEX.get(key)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+        try:
+            data = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+        except OSError:
+            return {}
+        # same walk as load_seeds, so a duplicated id resolves to the same
+        # (last) record there and here
+        index: Dict[str, Dict[str, Any]] = {}
+        for s in data.get("trap_seeds", []):
+            index[s.get("id")] = s
+            for sub in s.get("sub_traps", []) or []:
+                index[sub.get("id")] = sub
+        _RAW_INDEX[key] = (sig, index)
+        return index
+
+
+class RawSource:
+    """
+    Resolves a seed's original YAML dict from trap_seeds.yaml on demand,
+    so seeds don't have to carry a second copy of the catalog in memory.
+    The file is parsed once per version (mtime, size) and indexed by id,
+    shared by every seed of that file; the index stays resident after the
+    first raw access.
+    """
+
+    __slots__ = ("path",)
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+    def resolve(self, seed_id: str) -> Dict[str, Any]:
+        return _raw_index(self.path).get(seed_id, {})
 
 
-@dataclass
 class Seed:
-    id: str
-    title: str
-    family: str          # grouped family (zodiac or remapped)
-    resonance_signature: str
-    raw: Dict[str, Any]
+    """
+    Immutable, slotted seed record.
+
+    `family` strings are interned so thousands of seeds share a dozen
+    family objects. `raw` is either held directly or resolved lazily from
+    a RawSource the first time it is read.
+    """
+
+    __slots__ = ("id", "title", "family", "resonance_signature", "_raw", "_source")
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        family: str,          # grouped family (zodiac or remapped)
+        resonance_signature: str,
+        raw: Optional[Dict[str, Any]] = None,
+        source: Optional[RawSource] = None,
+    ) -> None:
+        _set = object.__setattr__
+        _set(self, "id", id)
+        _set(self, "title", title)
+        _set(self, "family", sys.intern(family) if isinstance(family, str) else family)
+        _set(self, "resonance_signature", resonance_signature)
+        _set(self, "_raw", raw)
+        _set(self, "_source", source)
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        raw = self._raw
+        if raw is None:
+            raw = self._source.resolve(self.id) if self._source is not None else {}
+            object.__setattr__(self, "_raw", raw)
+        return raw
+
+    @property
+    def raw_loaded(self) -> bool:
+        return self._raw is not None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Seed is frozen; cannot set {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Seed is frozen; cannot delete {name!r}")
+
+    def _key(self):
+        return (self.id, self.title, self.family, self.resonance_signature)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Seed):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return (
+            f"Seed(id={self.id!r}, title={self.title!r}, family={self.family!r}, "
+            f"resonance_signature={self.resonance_signature!r})"
+        )
+
+    def __reduce__(self):
+        return (
+            Seed,
+            (self.id, self.title, self.family, self.resonance_signature, self._raw, self._source),
+        )
 
 
 def load_seeds(data_dir: Path, config: Dict[str, Any]) -> Dict[str, Seed]:
     """
     Load trap_seeds.yaml and flatten into a dict of Seed objects keyed by id.
     Includes top-level seeds and their sub_traps (AR1, AR1a, AR1b, ...).
+
+    With `seeds.lazy_raw: true` in config, seeds don't keep the parsed YAML
+    dict; `Seed.raw` re-reads it from trap_seeds.yaml when first accessed.
     """
+    import yaml
+
     seeds_path = data_dir / "trap_seeds.yaml"
     data = yaml.safe_load(seeds_path.read_text(encoding="utf-8"))
     trap_seeds = data.get("trap_seeds", [])
@@ -28,6 +144,9 @@ def load_seeds(data_dir: Path, config: Dict[str, Any]) -> Dict[str, Seed]:
     group_field = fam_cfg.get("group_field", "zodiac_family")
     mapping = fam_cfg.get("mapping", {}) or {}
 
+    lazy_raw = bool((config.get("seeds", {}) or {}).get("lazy_raw", False))
+    source = RawSource(seeds_path) if lazy_raw else None
+
     seeds_by_id: Dict[str, Seed] = {}
 
     for s in trap_seeds:
@@ -40,7 +159,8 @@ def load_seeds(data_dir: Path, config: Dict[str, Any]) -> Dict[str, Seed]:
             title=s.get("title", ""),
             family=family,
             resonance_signature=s.get("resonance_signature", ""),
-            raw=s,
+            raw=None if lazy_raw else s,
+            source=source,
         )
         seeds_by_id[top.id] = top
 
@@ -51,9 +171,9 @@ def load_seeds(data_dir: Path, config: Dict[str, Any]) -> Dict[str, Seed]:
                 title=st.get("title", ""),
                 family=family,
                 resonance_signature=st.get("resonance_signature", ""),
-                raw=st,
+                raw=None if lazy_raw else st,
+                source=source,
             )
             seeds_by_id[st_seed.id] = st_seed
-   
 
     return seeds_by_id
@@ -1,14 +1,16 @@
 from __future__ import annotations
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict
 
+from .telemetry_sink import get_sink
+
 
 def log_run(report: Dict[str, Any], config: Dict[str, Any], data_dir: Path) -> None:
     """
     Local hive ledger: each run logs which families fired.
     No network calls, no phoning home. Purely local.
+    Records go through the shared background sink; nothing blocks on disk.
     """
     report_cfg = config.get("report", {}) or {}
     if not report_cfg.get("log_telemetry", True):
@@ -26,6 +28,8 @@ def log_run(report: Dict[str, Any], config: Dict[str, Any], data_dir: Path) -> N
         "families_hit": [f["family"] for f in families],
         "top_family": top_family,
     }
+    llm_cache = report.get("llm_cache")
+    if llm_cache:
+        rec["llm_cache_hit_rate"] = llm_cache.get("hit_rate", 0.0)
 
-    with ledger_path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(rec) + "\n")
+    get_sink(report_cfg.get("telemetry_sink")).write(ledger_path, rec)
@@ -0,0 +1,294 @@
+from __future__ import annotations
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .ledger_writer import LedgerWriter
+
+FSYNC_POLICIES = ("never", "flush", "close")
+
+_STOP = object()
+
+
+class TelemetrySink:
+    """
+    Shared JSONL writer for ledgers and telemetry files.
+
+    Callers enqueue records and return immediately; a background thread
+    batches them and writes each ledger through one long-lived LedgerWriter
+    (single O_APPEND write per batch under an advisory lock, so several
+    processes can share a ledger; size/daily rotation + compression).
+    A batch is flushed when it reaches max_batch records or when
+    flush_interval_s has passed since the last flush, whichever is first.
+
+    fsync policy:
+      never — leave durability to the OS (default)
+      flush — fsync every ledger touched by a flush
+      close — fsync once on shutdown
+    Pending records are always flushed on close() and at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        flush_interval_s: float = 0.5,
+        max_batch: int = 256,
+        fsync: str = "never",
+        max_queue: int = 10000,
+        rotate_max_bytes: Optional[int] = 64 * 2**20,
+        rotate_daily: bool = False,
+        compress: str = "gzip",
+        lock: bool = True,
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self.flush_interval_s = flush_interval_s
+        self.max_batch = max_batch
+        self.fsync = fsync
+        self._q: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._writer_opts = {
+            "max_bytes": rotate_max_bytes,
+            "daily": rotate_daily,
+            "compress": compress,
+            "lock": lock,
+        }
+        self._handles: Dict[Path, LedgerWriter] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+    # -----------------------
+    # Producer side
+    # -----------------------
+    def write(self, path: Path, rec: Dict[str, Any]) -> None:
+        """
+        Queue one record for path. It is serialised here, so a record
+        json can't encode raises TypeError/ValueError in the caller.
+        """
+        line = json.dumps(rec) + "\n"
+        if self._closed:
+            _append_now(Path(path), line)
+            return
+        self._ensure_started()
+        if not self._put((Path(path), line)):
+            _append_now(Path(path), line)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is written. False on timeout."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        if not self._put(done):
+            return False
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not done.wait(0.1 if deadline is None else max(0.0, min(0.1, deadline - time.monotonic()))):
+            if not self._thread.is_alive() or (deadline is not None and time.monotonic() >= deadline):
+                return False
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the writer after it drains the queue; waits up to timeout for it."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None and self._put(_STOP):
+            self._thread.join(timeout)
+
+    def _put(self, item: Any) -> bool:
+        """
+        Enqueue, blocking while the queue is full (backpressure) but only
+        as long as the writer is alive. False if the writer is gone.
+        """
+        while True:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                return False
+            try:
+                self._q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="telemetry-sink", daemon=True
+                )
+                self._thread.start()
+
+    # -----------------------
+    # Writer thread
+    # -----------------------
+    def _run(self) -> None:
+        pending: Dict[Path, List[str]] = {}
+        count = 0
+        last_flush = time.monotonic()
+        stop = False
+
+        while not stop:
+            timeout = max(0.0, self.flush_interval_s - (time.monotonic() - last_flush))
+            waiters: List[threading.Event] = []
+            try:
+                item = self._q.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            # drain whatever else is already queued without blocking
+            while item is not None:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    path, line = item
+                    pending.setdefault(path, []).append(line)
+                    count += 1
+                if count >= self.max_batch:
+                    break
+                try:
+                    item = self._q.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            due = time.monotonic() - last_flush >= self.flush_interval_s
+            if pending and (stop or waiters or due or count >= self.max_batch):
+                self._write_batch(pending)
+                pending = {}
+                count = 0
+                last_flush = time.monotonic()
+            elif due:
+                last_flush = time.monotonic()
+            for w in waiters:
+                w.set()
+
+        self._close_handles()
+
+    def _handle(self, path: Path) -> LedgerWriter:
+        w = self._handles.get(path)
+        if w is None:
+            w = self._handles[path] = LedgerWriter(path, **self._writer_opts)
+        return w
+
+    def _write_batch(self, pending: Dict[Path, List[str]]) -> None:
+        for path, lines in pending.items():
+            try:
+                w = self._handle(path)
+                w.append("".join(lines))
+                if self.fsync == "flush":
+                    w.fsync()
+            except Exception as e:
+                # telemetry must never take the audit (or this thread) down:
+                # drop the batch and the handle; the next batch reopens it
+                print(f"[WARN] telemetry: dropped {len(lines)} record(s) for {path}: {e!r}", file=sys.stderr)
+                w = self._handles.pop(path, None)
+                if w is not None:
+                    try:
+                        w.close()
+                    except Exception:
+                        pass
+
+    def _close_handles(self) -> None:
+        for w in self._handles.values():
+            try:
+                if self.fsync in ("flush", "close"):
+                    w.fsync()
+            except OSError:
+                pass
+            w.close()
+        self._handles.clear()
+
+
+def _append_now(path: Path, line: str) -> None:
+    """Synchronous fallback once the writer thread is closed or gone."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as f:
+            f.write(line)
+    except OSError as e:
+        print(f"[WARN] telemetry: could not write {path}: {e!r}", file=sys.stderr)
+
+
+# -----------------------
+# Process-wide sink
+# -----------------------
+_SINK: Optional[TelemetrySink] = None
+_SINK_LOCK = threading.Lock()
+_SINK_OPTS: Dict[str, Any] = {}
+_RETIRED: List[TelemetrySink] = []   # replaced sinks still draining; joined at exit
+_SHUTDOWN_HOOKS: List[Callable[[], None]] = []   # run at exit, before the sinks close
+
+
+def _configure_locked(opts: Dict[str, Any]) -> TelemetrySink:
+    global _SINK
+    old = _SINK
+    _SINK_OPTS.clear()
+    _SINK_OPTS.update(opts)
+    _SINK = TelemetrySink(**opts)
+    if old is not None:
+        old.close(timeout=0)   # drains in the background; don't block the caller
+        _RETIRED[:] = [s for s in _RETIRED if s._thread is not None and s._thread.is_alive()]
+        _RETIRED.append(old)
+    return _SINK
+
+
+def configure_sink(**opts: Any) -> TelemetrySink:
+    """Replace the shared sink with new options; the old one drains in the background."""
+    with _SINK_LOCK:
+        return _configure_locked(opts)
+
+
+def get_sink(opts: Optional[Dict[str, Any]] = None) -> TelemetrySink:
+    """
+    The process-wide sink. Passing opts (e.g. a config block) reconfigures
+    it only when they differ from the options it was built with.
+    """
+    global _SINK
+    with _SINK_LOCK:
+        if opts and opts != _SINK_OPTS:
+            return _configure_locked(dict(opts))
+        if _SINK is None:
+            _SINK = TelemetrySink(**_SINK_OPTS)
+        return _SINK
+
+
+def at_shutdown(fn: Callable[[], None]) -> None:
+    """
+    Run fn at interpreter exit while the sink still accepts writes, so
+    buffered telemetry (e.g. stage histograms) reaches disk. Idempotent.
+    """
+    with _SINK_LOCK:
+        if fn not in _SHUTDOWN_HOOKS:
+            _SHUTDOWN_HOOKS.append(fn)
+
+
+def _shutdown() -> None:
+    for fn in list(_SHUTDOWN_HOOKS):
+        try:
+            fn()
+        except Exception as e:
+            print(f"[WARN] telemetry: shutdown hook {getattr(fn, '__name__', fn)} failed: {e!r}", file=sys.stderr)
+    for sink in [*_RETIRED, _SINK]:
+        if sink is not None:
+            sink.close()
+            if sink._thread is not None:
+                sink._thread.join(5.0)
+
+
+def _reset_after_fork() -> None:
+    # the writer thread doesn't survive fork; children start a fresh sink
+    global _SINK
+    _SINK = None
+    _RETIRED.clear()
+
+
+atexit.register(_shutdown)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,227 @@
+from __future__ import annotations
+import os
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Per-stage audit timing. A Timer collects wall-clock spans (monotonic
+# perf_counter) per pipeline stage; a disabled Timer hands out one shared
+# no-op span, so instrumented code costs a method call when timing is off.
+#
+#     timer = timer_for(config)
+#     with timer.span("prompt"):
+#         ...
+#     report["timings"] = timer.to_dict()
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("timer", "name", "t0")
+
+    def __init__(self, timer: "Timer", name: str) -> None:
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self) -> "_Span":
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.timer.add(self.name, (time.perf_counter() - self.t0) * 1000)
+
+
+class Timer:
+    """Stage name -> elapsed ms; a stage timed more than once is summed."""
+
+    __slots__ = ("enabled", "stages", "t_start")
+
+    def __init__(self, enabled: bool = True, start: Optional[float] = None) -> None:
+        self.enabled = enabled
+        self.stages: Dict[str, float] = {}
+        self.t_start = time.perf_counter() if start is None else start
+
+    def span(self, name: str):
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name)
+
+    def add(self, name: str, ms: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stages": {k: round(v, 3) for k, v in self.stages.items()},
+            "total_ms": round((time.perf_counter() - self.t_start) * 1000, 3),
+        }
+
+
+NULL_TIMER = Timer(enabled=False)
+
+
+def timer_for(config: Dict[str, Any], enabled: Optional[bool] = None, start: Optional[float] = None) -> Timer:
+    """
+    Timer for one audit: `enabled` wins, else config report.timings (default
+    off). start backdates total_ms to a perf_counter() taken earlier.
+    """
+    if enabled is None:
+        enabled = bool((config.get("report", {}) or {}).get("timings", False))
+    return Timer(start=start) if enabled else NULL_TIMER
+
+
+# -----------------------
+# Percentiles + histograms
+# -----------------------
+def percentiles(values: Sequence[float], ps: Iterable[float] = (50, 95, 99)) -> Dict[str, float]:
+    """Nearest-rank percentiles, keyed "p50", "p95", ..."""
+    xs = sorted(values)
+    out: Dict[str, float] = {}
+    for p in ps:
+        if not xs:
+            out[f"p{p:g}"] = 0.0
+            continue
+        rank = max(1, -(-len(xs) * p // 100))   # ceil(n * p / 100)
+        out[f"p{p:g}"] = round(xs[int(rank) - 1], 3)
+    return out
+
+
+def stage_percentiles(timings: Iterable[Dict[str, Any]], ps: Iterable[float] = (50, 95, 99)) -> Dict[str, Dict[str, float]]:
+    """Per-stage percentiles over many report["timings"] blocks (plus "total")."""
+    ps = tuple(ps)
+    by_stage: Dict[str, List[float]] = {}
+    for t in timings:
+        for name, ms in t.get("stages", {}).items():
+            by_stage.setdefault(name, []).append(ms)
+        if "total_ms" in t:
+            by_stage.setdefault("total", []).append(t["total_ms"])
+    return {name: {"count": len(v), **percentiles(v, ps)} for name, v in by_stage.items()}
+
+
+# upper bucket bounds in ms (log-spaced); the last bucket is open-ended
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class StageHistograms:
+    """Thread-safe per-stage latency histograms, flushed to telemetry in batches."""
+
+    def __init__(self, bounds: Sequence[float] = BUCKETS_MS) -> None:
+        self.bounds = tuple(bounds)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.audits = 0
+        self.counts: Dict[str, List[int]] = {}
+        self.sums: Dict[str, float] = {}
+        self.maxes: Dict[str, float] = {}
+
+    def record(self, stages: Dict[str, float]) -> int:
+        """Add one audit's stages; returns audits recorded since the last flush."""
+        with self._lock:
+            for name, ms in stages.items():
+                counts = self.counts.get(name)
+                if counts is None:
+                    counts = self.counts[name] = [0] * (len(self.bounds) + 1)
+                    self.sums[name] = 0.0
+                    self.maxes[name] = 0.0
+                counts[bisect_left(self.bounds, ms)] += 1
+                self.sums[name] += ms
+                if ms > self.maxes[name]:
+                    self.maxes[name] = ms
+            self.audits += 1
+            return self.audits
+
+    def snapshot(self, reset: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            labels = [f"le_{b:g}" for b in self.bounds] + ["inf"]
+            stages = {
+                name: {
+                    "count": sum(counts),
+                    "sum_ms": round(self.sums[name], 3),
+                    "max_ms": round(self.maxes[name], 3),
+                    "buckets": {lab: c for lab, c in zip(labels, counts) if c},
+                }
+                for name, counts in self.counts.items()
+            }
+            snap = {"audits": self.audits, "stages": stages}
+            if reset:
+                self._reset()
+            return snap
+
+
+HISTOGRAMS = StageHistograms()
+# (config, data_dir) of the last recorded audit; where flush_pending() writes
+_FLUSH_TARGET: Optional[Tuple[Dict[str, Any], Path]] = None
+
+
+def flush_histograms(config: Dict[str, Any], data_dir: Path, histograms: StageHistograms = HISTOGRAMS) -> None:
+    """Write one stage_histograms record (and reset) if anything was recorded."""
+    from .telemetry_sink import get_sink
+
+    snap = histograms.snapshot(reset=True)
+    if not snap["audits"]:
+        return
+    report_cfg = config.get("report", {}) or {}
+    path = Path(data_dir) / report_cfg.get("timings_file", "cold_mirror_timings.jsonl")
+    rec = {"timestamp": datetime.utcnow().isoformat() + "Z", "event": "stage_histograms", **snap}
+    get_sink(report_cfg.get("telemetry_sink")).write(path, rec)
+
+
+def finish_timings(report: Dict[str, Any], timer: Timer, config: Dict[str, Any], data_dir: Path) -> None:
+    """
+    Attach report["timings"] and feed the stage histograms, writing them to
+    telemetry every report.timings_flush_every audits (default 100).
+    No-op for a disabled timer.
+    """
+    global _FLUSH_TARGET
+    if not timer.enabled:
+        return
+    timings = timer.to_dict()
+    report["timings"] = timings
+    report_cfg = config.get("report", {}) or {}
+    if not report_cfg.get("log_telemetry", True):
+        return
+    if _FLUSH_TARGET is None:
+        from .telemetry_sink import at_shutdown
+        at_shutdown(flush_pending)
+    _FLUSH_TARGET = (config, Path(data_dir))
+    n = HISTOGRAMS.record(timings["stages"])
+    if n >= int(report_cfg.get("timings_flush_every", 100)):
+        flush_histograms(config, data_dir)
+
+
+def flush_pending() -> None:
+    """
+    Write whatever the histograms hold since the last periodic flush, to
+    where finish_timings last recorded. Runs at interpreter exit (via the
+    telemetry sink) and on daemon shutdown.
+    """
+    target = _FLUSH_TARGET
+    if target is not None:
+        flush_histograms(*target)
+
+
+def _reset_after_fork() -> None:
+    # the child inherits the parent's unflushed counts; don't write them twice
+    global _FLUSH_TARGET
+    HISTOGRAMS._lock = threading.Lock()
+    HISTOGRAMS._reset()
+    _FLUSH_TARGET = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,31 +1,290 @@
 from __future__ import annotations
 import json
-from datetime import datetime
-from pathlib import Path
-from typing import Any, Dict
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
 
+from .telemetry import log_run  # noqa: F401  (kept importable from here for older callers)
 
-def log_run(report: Dict[str, Any], config: Dict[str, Any], data_dir: Path) -> None:
+# -----------------------
+# Match validation
+# -----------------------
+def validate_match(m: Any) -> Optional[Dict[str, Any]]:
     """
-    Local hive ledger: each run logs which families fired.
-    No network calls, no phoning home. Purely local.
+    Normalise one entry of the {"matches": [...]} array, or None if unusable.
+    seed_id must be a non-empty string; confidence is coerced to a float in
+    [0, 1] (missing -> 0.0; a bool is rejected, not read as 0/1); evidence
+    is coerced to a string.
     """
-    report_cfg = config.get("report", {}) or {}
-    if not report_cfg.get("log_telemetry", True):
-        return
+    if not isinstance(m, dict):
+        return None
+    seed_id = m.get("seed_id")
+    if not isinstance(seed_id, str) or not seed_id.strip():
+        return None
+    conf = m.get("confidence", 0.0)
+    if isinstance(conf, bool):
+        return None
+    try:
+        conf = float(conf)
+    except (TypeError, ValueError):
+        return None
+    if conf != conf:  # NaN
+        return None
+    evidence = m.get("evidence", "")
+    return {
+        "seed_id": seed_id.strip(),
+        "confidence": min(1.0, max(0.0, conf)),
+        "evidence": evidence if isinstance(evidence, str) else ("" if evidence is None else str(evidence)),
+    }
+
+
+def matches_from_payload(payload: Any) -> List[Dict[str, Any]]:
+    """Validated matches of a decoded response ({"matches": [...]} or a bare list)."""
+    if isinstance(payload, dict):
+        payload = payload.get("matches")
+    if not isinstance(payload, list):
+        return []
+    out = []
+    for m in payload:
+        v = validate_match(m)
+        if v is not None:
+            out.append(v)
+    return out
+
+
+# -----------------------
+# Incremental parser
+# -----------------------
+_MATCHES_KEY = re.compile(r'"matches"\s*:\s*\[')
+_STRUCT = re.compile(r'[{}\[\]"\\]')
+_IN_STRING = re.compile(r'["\\]')
+_DECODER = json.JSONDecoder()
+
+
+class StreamingMatchParser:
+    """
+    Incremental parser for the {"matches": [...]} response shape.
+
+    feed() takes arbitrary text chunks (token deltas) and returns the
+    validated matches whose objects closed in that chunk; close() returns
+    anything left over. Leading prose, ``` fences and a truncated tail are
+    tolerated: every match object that closed before the stream ended is
+    kept, a half-written one is dropped.
+
+    An object that is already fully buffered is decoded in one raw_decode
+    call; otherwise the scanner tracks it across chunks, visiting only
+    structural characters ({}[]" and backslash), and decodes it once closed.
+    """
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._pos = 0              # next unscanned index in _buf
+        self._in_array = False
+        self._done = False
+        self._depth = 0            # nesting inside the current match object
+        self._in_string = False
+        self._obj_start = -1
+        self.seen = 0              # objects closed (valid or not)
+        self.dropped = 0           # closed objects rejected by validate_match
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        if self._done or not chunk:
+            return []
+        self._buf += chunk
+        if not self._in_array:
+            m = _MATCHES_KEY.search(self._buf)
+            if m is None:
+                # keep a short tail in case the key is split across chunks
+                if len(self._buf) > 64:
+                    self._buf = self._buf[-64:]
+                return []
+            self._in_array = True
+            self._buf = self._buf[m.end():]
+            self._pos = 0
+        return self._scan()
+
+    def _scan(self) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        buf = self._buf
+        pos = self._pos
+        n = len(buf)
+        while pos < n:
+            if self._in_string:
+                m = _IN_STRING.search(buf, pos)
+                if m is None:
+                    pos = n
+                    break
+                if m.group() == "\\":
+                    if m.end() >= n:
+                        pos = m.start()   # escape split across chunks; rescan later
+                        break
+                    pos = m.end() + 1
+                    continue
+                self._in_string = False
+                pos = m.end()
+                continue
+
+            m = _STRUCT.search(buf, pos)
+            if m is None:
+                pos = n
+                break
+            ch = m.group()
+            pos = m.end()
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if self._depth == 0:
+                    if ch == "[":
+                        continue  # stray bracket between objects; ignore
+                    # fast path: the whole object is already buffered
+                    try:
+                        obj, end = _DECODER.raw_decode(buf, m.start())
+                    except ValueError:
+                        self._obj_start = m.start()
+                    else:
+                        pos = end
+                        self._emit(obj, out)
+                        continue
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 0:
+                    if ch == "]":
+                        self._done = True
+                        break
+                    continue
+                self._depth -= 1
+                if self._depth == 0:
+                    obj = buf[self._obj_start:pos]
+                    self._obj_start = -1
+                    try:
+                        self._emit(json.loads(obj), out)
+                    except ValueError:
+                        self.seen += 1
+                        self.dropped += 1
+
+        # drop everything before the open object (or everything scanned)
+        keep = self._obj_start if self._obj_start >= 0 else pos
+        self._buf = buf[keep:]
+        self._pos = pos - keep
+        if self._obj_start >= 0:
+            self._obj_start = 0
+        return out
+
+    def _emit(self, obj: Any, out: List[Dict[str, Any]]) -> None:
+        self.seen += 1
+        v = validate_match(obj)
+        if v is None:
+            self.dropped += 1
+        else:
+            out.append(v)
+
+    def close(self) -> List[Dict[str, Any]]:
+        """End of stream. Any object still open is truncated and discarded."""
+        self._done = True
+        self._buf = ""
+        return []
 
-    ledger_name = report_cfg.get("telemetry_file", "cold_mirror_ledger.jsonl")
-    ledger_path = data_dir / ledger_name
+    @property
+    def found_array(self) -> bool:
+        return self._in_array
 
-    families = report.get("families", [])
-    top_family = families[0]["family"] if families else None
 
-    rec: Dict[str, Any] = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "total_seed_hits": report.get("summary", {}).get("total_seed_hits", 0),
-        "families_hit": [f["family"] for f in families],
-        "top_family": top_family,
+# -----------------------
+# Whole-response parsing
+# -----------------------
+def parse_payload(raw: str) -> Any:
+    """
+    Decode the JSON value in an LLM response, tolerating ``` fences and prose
+    before/after it. Returns None when no complete JSON value is present.
+    """
+    if not raw:
+        return None
+    text = raw.strip()
+    try:
+        return json.loads(text)   # fast path: the model did what it was told
+    except ValueError:
+        pass
+    # fences and prose sit outside the value; raw_decode stops at its end
+    for opener in ("{", "["):
+        start = text.find(opener)
+        while start != -1:
+            try:
+                return _DECODER.raw_decode(text, start)[0]
+            except ValueError:
+                start = text.find(opener, start + 1)
+    return None
+
+
+def parse_matches(raw: str) -> List[Dict[str, Any]]:
+    """
+    Validated matches from a full LLM response. Well-formed JSON (fenced or
+    wrapped in prose) is decoded in one go; a truncated response falls back
+    to the incremental parser, which salvages every complete match object.
+    """
+    payload = parse_payload(raw)
+    if isinstance(payload, list) or (isinstance(payload, dict) and "matches" in payload):
+        return matches_from_payload(payload)
+    parser = StreamingMatchParser()
+    matches = parser.feed(raw or "")
+    matches.extend(parser.close())
+    return matches
+
+
+def iter_stream_matches(chunks: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield validated matches from a token stream as each match object closes.
+    If the stream never contains a "matches" array (e.g. the model answered
+    with a bare list), the whole response goes through parse_matches at the end.
+    """
+    parser = StreamingMatchParser()
+    head: Optional[List[str]] = []   # text seen before the array, for the fallback
+    for chunk in chunks:
+        if head is not None:
+            head.append(chunk)
+        yield from parser.feed(chunk)
+        if head is not None and parser.found_array:
+            head = None
+    yield from parser.close()
+    if head is not None:
+        yield from parse_matches("".join(head))
+
+
+# -----------------------
+# Hits
+# -----------------------
+def build_hit(match: Dict[str, Any], seeds_by_id: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+    """Join one validated match with its seed; None when the seed_id is unknown."""
+    seed = seeds_by_id.get(match["seed_id"])
+    if seed is None:
+        return None
+    hit = {
+        "seed_id": seed.id,
+        "title": seed.title,
+        "family": seed.family,
+        "confidence": match["confidence"],
+        "evidence": match["evidence"],
     }
+    votes = match.get("votes")   # SC@k merged matches
+    if votes is not None:
+        hit["votes"] = votes
+    return hit
+
+
+def build_hits(matches: Iterable[Dict[str, Any]], seeds_by_id: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Hits for the matches that name a known seed, in response order. A seed
+    reported more than once keeps its first match, so streamed and
+    whole-response audits produce the same hits.
+    """
+    return list(iter_hits(matches, seeds_by_id))
+
 
-    with ledger_path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(rec) + "\n")
+def iter_hits(matches: Iterable[Dict[str, Any]], seeds_by_id: Mapping[str, Any]) -> Iterator[Dict[str, Any]]:
+    seen = set()
+    for m in matches:
+        sid = m["seed_id"]
+        if sid in seen:
+            continue
+        hit = build_hit(m, seeds_by_id)
+        if hit is not None:
+            seen.add(sid)
+            yield hit
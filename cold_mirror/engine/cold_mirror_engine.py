@@ -1,15 +1,17 @@
 from __future__ import annotations
+import time
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional, Union
 
-import yaml
-
-from ..llm.client import LLMClient
-from ..llm.prompts import build_trap_analysis_prompt
-from ..core.seed_loader import load_seeds
-from ..core.trap_engine import parse_matches, build_hits
+from .llm.cache import find_cache_stats, scoped_client
+from .llm.client import AsyncLLMClient, LLMClient, StreamingLLMClient, ensure_async_client, iter_response_chunks
+from .llm.prompts import build_trap_analysis_prompt
+from ..core.artifact_cache import cached_config, cached_seeds
+from ..core.seed_index import select_seeds
+from ..core.trap_engine import parse_matches, build_hits, iter_hits, iter_stream_matches
 from ..core.report_engine import build_report
 from ..core.telemetry import log_run
+from ..core.timing import NULL_TIMER, Timer, finish_timings, timer_for
 
 
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -17,28 +19,108 @@ DATA_DIR = BASE_DIR / "data"
 
 
 def _load_config() -> Dict[str, Any]:
-    cfg_path = DATA_DIR / "config.yaml"
-    return yaml.safe_load(cfg_path.read_text(encoding="utf-8"))
+    return cached_config(DATA_DIR)
+
+
+def _prepare_audit(text: str, timings: Optional[bool] = None):
+    t0 = time.perf_counter()
+    config = _load_config()
+    timer = timer_for(config, timings, start=t0)
+    if timer.enabled:
+        timer.add("config", (time.perf_counter() - t0) * 1000)
+
+    with timer.span("seeds"):
+        seeds_by_id = cached_seeds(DATA_DIR)
+
+    with timer.span("prompt"):
+        prompt_seeds = select_seeds(text, seeds_by_id, config)
+        prompt = build_trap_analysis_prompt(text, prompt_seeds)
+    return prompt, config, seeds_by_id, timer
+
+
+def _complete_audit(
+    text: str,
+    raw: str,
+    config: Dict[str, Any],
+    seeds_by_id: Dict[str, Any],
+    llm_client: Any = None,
+    timer: Timer = NULL_TIMER,
+) -> Dict[str, Any]:
+    with timer.span("parse"):
+        matches = parse_matches(raw)
+    with timer.span("hits"):
+        hits = build_hits(matches, seeds_by_id)
+    return _finish_audit(text, hits, config, llm_client, timer)
+
+
+def _finish_audit(
+    text: str,
+    hits: List[Dict[str, Any]],
+    config: Dict[str, Any],
+    llm_client: Any = None,
+    timer: Timer = NULL_TIMER,
+) -> Dict[str, Any]:
+    with timer.span("report"):
+        report = build_report(text, hits, config)
 
+        llm_cache = find_cache_stats(llm_client)
+        if llm_cache is not None:
+            report["llm_cache"] = llm_cache
 
-def run_audit(text: str, llm_client: LLMClient) -> Dict[str, Any]:
+    with timer.span("telemetry"):
+        log_run(report, config, DATA_DIR)
+
+    finish_timings(report, timer, config, DATA_DIR)
+    return report
+
+
+def run_audit(text: str, llm_client: LLMClient, timings: Optional[bool] = None) -> Dict[str, Any]:
     """
     Main Cold Mirror entrypoint.
 
     - text: user project / spec / transcript
     - llm_client: something implementing LLMClient.ask(prompt) -> str
+    - timings: add per-stage ms as report["timings"] (default: config
+      report.timings)
     """
-    config = _load_config()
-    seeds_by_id = load_seeds(DATA_DIR, config)
+    llm_client = scoped_client(llm_client)   # report["llm_cache"] covers this audit
+    prompt, config, seeds_by_id, timer = _prepare_audit(text, timings)
+    with timer.span("llm"):
+        raw = llm_client.ask(prompt)
+    return _complete_audit(text, raw, config, seeds_by_id, llm_client, timer)
 
-    prompt = build_trap_analysis_prompt(text, seeds_by_id)
-    raw = llm_client.ask(prompt)
-    
 
-    matches = parse_matches(raw)
-    hits = build_hits(matches, seeds_by_id)
-    report = build_report(text, hits, config)
+async def run_audit_async(
+    text: str,
+    llm_client: Union[AsyncLLMClient, LLMClient],
+    timings: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    Async Cold Mirror entrypoint: same pipeline as run_audit, but the LLM
+    round trip is awaited. Blocking clients are run in an executor.
+    """
+    llm_client = scoped_client(llm_client)
+    prompt, config, seeds_by_id, timer = _prepare_audit(text, timings)
+    with timer.span("llm"):
+        raw = await ensure_async_client(llm_client).ask(prompt)
+    return _complete_audit(text, raw, config, seeds_by_id, llm_client, timer)
 
-    log_run(report, config, DATA_DIR)
 
-    return report
+def run_audit_stream(
+    text: str,
+    llm_client: Union[StreamingLLMClient, LLMClient],
+    timings: Optional[bool] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming Cold Mirror entrypoint. Yields {"type": "hit", "hit": ...}
+    as each match is parsed, then {"type": "report", "report": ...}.
+    """
+    llm_client = scoped_client(llm_client)
+    prompt, config, seeds_by_id, timer = _prepare_audit(text, timings)
+    hits = []
+    with timer.span("llm_stream"):
+        matches = iter_stream_matches(iter_response_chunks(llm_client, prompt))
+        for hit in iter_hits(matches, seeds_by_id):
+            hits.append(hit)
+            yield {"type": "hit", "hit": hit}
+    yield {"type": "report", "report": _finish_audit(text, hits, config, llm_client, timer)}
@@ -0,0 +1,286 @@
+from __future__ import annotations
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .client import LLMClient, iter_response_chunks
+
+
+def cache_key(model: Optional[str], prompt: str, params: Dict[str, Any], namespace: Optional[str] = None) -> str:
+    """Content address of one LLM call: hash of (model, prompt, sampling params)."""
+    payload = json.dumps(
+        {"model": model, "prompt": prompt, "params": params, "ns": namespace},
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier response store.
+
+    - memory: bounded LRU of the most recent responses (max_entries)
+    - disk:   optional SQLite file shared across processes, with TTL
+              expiry and size-based eviction of least recently used rows
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        path: Optional[Path] = None,
+        ttl_s: Optional[float] = None,
+        max_disk_bytes: Optional[int] = 256 * 2**20,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.max_disk_bytes = max_disk_bytes
+        self._lock = threading.Lock()
+        self._mem: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._puts_since_evict = 0
+        if path is not None:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " created REAL NOT NULL, accessed REAL NOT NULL, size INTEGER NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_s is not None and now - created > self.ttl_s
+
+    def get(self, key: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return (value, tier) where tier is "memory", "disk" or None on a miss."""
+        now = time.time()
+        with self._lock:
+            item = self._mem.get(key)
+            if item is not None:
+                if not self._expired(item[0], now):
+                    self._mem.move_to_end(key)
+                    return item[1], "memory"
+                del self._mem[key]
+
+            if self._db is None:
+                return None, None
+            row = self._db.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None, None
+            value, created = row
+            if self._expired(created, now):
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None, None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._remember(key, created, value)
+            return value, "disk"
+
+    def put(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, accessed, size)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, value, now, now, len(value.encode("utf-8"))),
+            )
+            # eviction scans are amortised over puts
+            self._puts_since_evict += 1
+            if self._puts_since_evict >= 64:
+                self._evict_disk(now)
+
+    def _remember(self, key: str, created: float, value: str) -> None:
+        self._mem[key] = (created, value)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def _evict_disk(self, now: float) -> None:
+        self._puts_since_evict = 0
+        if self.ttl_s is not None:
+            self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_s,))
+        if self.max_disk_bytes is None:
+            return
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        excess = total - self.max_disk_bytes
+        freed = 0
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._db.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def evict(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._evict_disk(time.time())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class CachingLLMClient:
+    """
+    LLMClient wrapper that serves repeated calls from a ResponseCache.
+
+    The key covers the model, the prompt and every sampling kwarg, so a
+    different temperature is a different entry. Cache-only keyword args are
+    stripped before the wrapped client sees the call:
+      cache_bypass=True        — always call the model (nothing read or written)
+      cache_namespace="..."    — separate entries for otherwise identical calls
+                                 (e.g. independent SC@k samples)
+    bypass=True on the wrapper turns the cache off entirely, for experiments
+    that deliberately measure model nondeterminism.
+    Counters are cumulative for the client's lifetime; scoped() gives a
+    view whose counters cover one audit.
+    """
+
+    def __init__(
+        self,
+        client: LLMClient,
+        model: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        bypass: bool = False,
+    ) -> None:
+        self.client = client
+        self.model = model if model is not None else getattr(client, "model", None)
+        self.cache = cache if cache is not None else ResponseCache()
+        self.bypass = bypass
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self._parent: Optional[CachingLLMClient] = None
+
+    def scoped(self) -> "CachingLLMClient":
+        """
+        A view sharing this client's wrapped client, cache and settings,
+        with its own counters (still rolled up into this client's). Make
+        one per audit to report that audit's hits alone.
+        """
+        view = CachingLLMClient(self.client, self.model, self.cache, self.bypass)
+        view._parent = self
+        return view
+
+    def _count(self, *counters: str) -> None:
+        c: Optional[CachingLLMClient] = self
+        while c is not None:
+            with c._lock:
+                for name in counters:
+                    setattr(c, name, getattr(c, name) + 1)
+            c = c._parent
+
+    def _lookup(self, key: str) -> Optional[str]:
+        value, tier = self.cache.get(key)
+        if value is not None:
+            self._count("hits", "memory_hits" if tier == "memory" else "disk_hits")
+        return value
+
+    def ask(
+        self,
+        prompt: str,
+        cache_bypass: bool = False,
+        cache_namespace: Optional[str] = None,
+        **kwargs: Any,
+    ) -> str:
+        if self.bypass or cache_bypass:
+            self._count("bypassed")
+            return self.client.ask(prompt, **kwargs)
+
+        key = cache_key(self.model, prompt, kwargs, cache_namespace)
+        value = self._lookup(key)
+        if value is not None:
+            return value
+
+        value = self.client.ask(prompt, **kwargs)
+        self.cache.put(key, value)
+        self._count("misses")
+        return value
+
+    def stream(
+        self,
+        prompt: str,
+        cache_bypass: bool = False,
+        cache_namespace: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Iterator[str]:
+        """
+        Streaming counterpart of ask(). A cached response is replayed as one
+        chunk; a miss streams from the wrapped client (or its ask()) and is
+        stored once the stream completes — an abandoned stream stores nothing.
+        """
+        if self.bypass or cache_bypass:
+            self._count("bypassed")
+            yield from iter_response_chunks(self.client, prompt, **kwargs)
+            return
+
+        key = cache_key(self.model, prompt, kwargs, cache_namespace)
+        value = self._lookup(key)
+        if value is not None:
+            yield value
+            return
+
+        parts: List[str] = []
+        for chunk in iter_response_chunks(self.client, prompt, **kwargs):
+            parts.append(chunk)
+            yield chunk
+        self.cache.put(key, "".join(parts))
+        self._count("misses")
+
+    def cache_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            looked_up = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "bypassed": self.bypassed,
+                "hit_rate": round(self.hits / looked_up, 4) if looked_up else 0.0,
+                "scope": "process" if self._parent is None else "audit",
+            }
+
+
+def scoped_client(client: Any) -> Any:
+    """client.scoped() for a CachingLLMClient, else client unchanged."""
+    return client.scoped() if isinstance(client, CachingLLMClient) else client
+
+
+def find_cache_stats(client: Any) -> Optional[Dict[str, Any]]:
+    """
+    cache_stats() of the first CachingLLMClient found by following `.client`
+    through wrappers (e.g. SyncLLMClientAdapter); None when uncached.
+    "scope" says whether the counters cover one audit (a scoped() view)
+    or the client's whole lifetime.
+    """
+    seen = 0
+    while client is not None and seen < 8:
+        stats = getattr(client, "cache_stats", None)
+        if callable(stats):
+            return stats()
+        client = getattr(client, "client", None)
+        seen += 1
+    return None
@@ -1,5 +1,11 @@
 from __future__ import annotations
-from typing import Protocol, Any
+import functools
+from typing import TYPE_CHECKING, Protocol, Any, Iterator, Optional, Union
+
+# asyncio / concurrent.futures / inspect are imported where used: importing
+# this module (it holds the protocols) shouldn't cost the asyncio import
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
 
 class LLMClient(Protocol):
@@ -11,3 +17,78 @@ class LLMClient(Protocol):
 
     def ask(self, prompt: str, **kwargs: Any) -> str:  # pragma: no cover
         ...
+
+
+class AsyncLLMClient(Protocol):
+    """
+    Async counterpart of LLMClient for embedding the engine in an event loop:
+    `ask` is a coroutine returning the model's string response.
+    """
+
+    async def ask(self, prompt: str, **kwargs: Any) -> str:  # pragma: no cover
+        ...
+
+
+class StreamingLLMClient(Protocol):
+    """
+    LLMClient that can also stream: `stream` yields the response as text
+    chunks (token deltas) whose concatenation equals what `ask` returns.
+    """
+
+    def ask(self, prompt: str, **kwargs: Any) -> str:  # pragma: no cover
+        ...
+
+    def stream(self, prompt: str, **kwargs: Any) -> Iterator[str]:  # pragma: no cover
+        ...
+
+
+def iter_response_chunks(client: Union[LLMClient, StreamingLLMClient], prompt: str, **kwargs: Any) -> Iterator[str]:
+    """Stream the response when the client supports it, else yield ask() as one chunk."""
+    stream = getattr(client, "stream", None)
+    if callable(stream):
+        yield from stream(prompt, **kwargs)
+    else:
+        yield client.ask(prompt, **kwargs)
+
+
+class SyncLLMClientAdapter:
+    """
+    Wraps a blocking LLMClient as an AsyncLLMClient by running `ask` in an
+    executor. Pass max_workers (or your own executor) when you expect more
+    blocking calls in flight than the event loop's default executor allows.
+    """
+
+    def __init__(
+        self,
+        client: LLMClient,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.client = client
+        self._owns_executor = executor is None and max_workers is not None
+        self._executor = executor or (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-sync")
+            if max_workers is not None else None
+        )
+
+    async def ask(self, prompt: str, **kwargs: Any) -> str:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self.client.ask, prompt, **kwargs)
+        return await loop.run_in_executor(self._executor, call)
+
+    def close(self) -> None:
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
+def ensure_async_client(client: Union[LLMClient, AsyncLLMClient]) -> AsyncLLMClient:
+    """Return client unchanged if its `ask` is a coroutine function, else adapt it."""
+    import inspect
+
+    if inspect.iscoroutinefunction(getattr(client, "ask", None)):
+        return client  # type: ignore[return-value]
+    return SyncLLMClientAdapter(client)  # type: ignore[arg-type]
@@ -1,26 +1,12 @@
 from __future__ import annotations
-from typing import Dict
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 
-from ..core.seed_loader import Seed
+from ...core.seed_loader import Seed
 
 
-def build_trap_analysis_prompt(
-    text: str,
-    seeds_by_id: Dict[str, Seed],
-) -> str:
-    """
-    Build a prompt that gives the model your seed IDs + resonance signatures
-    and asks it to return JSON with matches.
-    """
-    lines = []
-    for seed in seeds_by_id.values():
-        if not seed.resonance_signature:
-            continue
-        lines.append(f"- {seed.id}: {seed.title} — {seed.resonance_signature}")
-
-    seeds_block = "\n".join(lines)
-
-    return f"""
+_INSTRUCTIONS = """
 You are an audit agent called Cold Mirror.
 
 You are given:
@@ -33,15 +19,15 @@ Your job is to:
 3. Respond with **ONLY** valid JSON, with **no** backticks, no code fences, and no extra text.
 4. Use exactly this JSON shape:
 
-{{
+{
   "matches": [
-    {{
+    {
       "seed_id": "AR1",
       "confidence": 0.83,
       "evidence": "short quote or explanation from the user's text"
-    }}
+    }
   ]
-}}
+}
 
 Do not include any explanation outside this JSON object.
 Do not wrap the JSON in ```json``` fences.
@@ -49,9 +35,98 @@ Do not add comments.
 
 SEEDS:
 
-{seeds_block}
+""".lstrip()
+
+# Rendered static prefixes, keyed by catalog hash or by the seed ids in
+# order. Id-keyed entries keep the seeds they were rendered from, so a
+# different catalog that reuses the ids re-renders instead of matching.
+_PREFIX_CACHE: "OrderedDict[Any, Tuple[Optional[Tuple[Seed, ...]], str]]" = OrderedDict()
+# (seed dict, prefix) of the last id-keyed call: the full catalog is passed
+# as the same dict every time, so it skips building the key.
+_LAST_PREFIX: Tuple[Optional[Dict[str, Seed]], str] = (None, "")
+_PREFIX_CACHE_SIZE = 8
+_PREFIX_LOCK = threading.Lock()
+
+
+class TrapPromptParts(NamedTuple):
+    """
+    prefix:       instructions + SEEDS block; identical across requests for
+                  the same catalog, so provider-side prompt caches can reuse it
+    user_content: the per-request USER CONTENT block
+    """
+    prefix: str
+    user_content: str
+
+    def join(self) -> str:
+        return f"{self.prefix}\n\n{self.user_content}"
+
+
+def render_seeds_block(seeds_by_id: Dict[str, Seed]) -> str:
+    lines = []
+    for seed in seeds_by_id.values():
+        if not seed.resonance_signature:
+            continue
+        lines.append(f"- {seed.id}: {seed.title} — {seed.resonance_signature}")
+    return "\n".join(lines)
+
+
+def _cached_prefix(key: Any, seeds: Optional[Tuple[Seed, ...]], seeds_by_id: Dict[str, Seed]) -> str:
+    with _PREFIX_LOCK:
+        entry = _PREFIX_CACHE.get(key)
+        # seeds compare by identity first, by content when they're copies
+        if entry is not None and entry[0] == seeds:
+            _PREFIX_CACHE.move_to_end(key)
+            return entry[1]
+
+    prefix = _INSTRUCTIONS + render_seeds_block(seeds_by_id)
+
+    with _PREFIX_LOCK:
+        _PREFIX_CACHE[key] = (seeds, prefix)
+        _PREFIX_CACHE.move_to_end(key)
+        while len(_PREFIX_CACHE) > _PREFIX_CACHE_SIZE:
+            _PREFIX_CACHE.popitem(last=False)
+    return prefix
+
+
+def build_trap_analysis_prefix(
+    seeds_by_id: Dict[str, Seed],
+    catalog_key: Optional[str] = None,
+) -> str:
+    """
+    Static part of the trap-analysis prompt. Rendered once per seed set:
+    keyed by catalog_key (e.g. the compiled catalog hash) when given,
+    otherwise by the seed ids in order, so every dict holding the same
+    seeds (a prefilter picking the same subset again, say) shares an entry.
+    Seed dicts are treated as immutable — build a new dict rather than
+    mutating a cached one.
+    """
+    global _LAST_PREFIX
+    if catalog_key is not None:
+        return _cached_prefix(("hash", catalog_key), None, seeds_by_id)
+    last = _LAST_PREFIX
+    if last[0] is seeds_by_id:
+        return last[1]
+    prefix = _cached_prefix(("ids", tuple(seeds_by_id)), tuple(seeds_by_id.values()), seeds_by_id)
+    _LAST_PREFIX = (seeds_by_id, prefix)
+    return prefix
 
-USER CONTENT (truncated to 16k chars):
 
-\"\"\"{text[:16000]}\"\"\"
-""".strip()
+def build_trap_analysis_prompt_parts(
+    text: str,
+    seeds_by_id: Dict[str, Seed],
+    catalog_key: Optional[str] = None,
+) -> TrapPromptParts:
+    user_content = f'USER CONTENT (truncated to 16k chars):\n\n"""{text[:16000]}"""'
+    return TrapPromptParts(build_trap_analysis_prefix(seeds_by_id, catalog_key), user_content)
+
+
+def build_trap_analysis_prompt(
+    text: str,
+    seeds_by_id: Dict[str, Seed],
+    catalog_key: Optional[str] = None,
+) -> str:
+    """
+    Build a prompt that gives the model your seed IDs + resonance signatures
+    and asks it to return JSON with matches.
+    """
+    return build_trap_analysis_prompt_parts(text, seeds_by_id, catalog_key).join()
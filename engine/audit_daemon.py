@@ -0,0 +1,467 @@
+# engine/audit_daemon.py — long-running audit server + thin client
+# - Keeps the runtime, seed catalog, gate map and LLM client warm
+# - Unix socket: newline-delimited JSON, requests pipelined per connection
+#   (responses carry the request id and may come back out of order)
+# - Localhost HTTP/1.1 with keep-alive: POST /audit, GET /health, every
+#   request authenticated with a bearer token
+# - The socket is created 0600 (inside a 0700 directory by default) and
+#   clients refuse a socket owned by, or served by, another user
+# - Shared limits: max_concurrency audits running, max_pending queued
+#
+# Only the client side is imported by the CLI, so this module keeps its
+# top-level imports to the stdlib socket/json basics.
+
+from __future__ import annotations
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+PROTOCOL = 1
+
+
+def default_socket_path() -> str:
+    """
+    $PRIME_NODE_SOCKET, else $XDG_RUNTIME_DIR/prime-node.sock, else
+    prime-node.sock in a per-user temp directory (created 0700 by the server).
+    """
+    path = os.environ.get("PRIME_NODE_SOCKET")
+    if path:
+        return path
+    run_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if run_dir:
+        return os.path.join(run_dir, "prime-node.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    return os.path.join(tempfile.gettempdir(), f"prime-node-{uid}", "prime-node.sock")
+
+
+class DaemonError(RuntimeError):
+    pass
+
+
+def _check_owner(path: str) -> None:
+    """The socket at path must belong to the current user."""
+    if not hasattr(os, "getuid"):
+        return
+    owner = os.stat(path).st_uid
+    if owner != os.getuid():
+        raise DaemonError(f"{path} is owned by uid {owner}, not {os.getuid()}; refusing to use it")
+
+
+def _check_peer(sock: socket.socket, path: str) -> None:
+    """The process serving sock must run as the current user (Linux SO_PEERCRED)."""
+    if not hasattr(socket, "SO_PEERCRED") or not hasattr(os, "getuid"):
+        return
+    import struct
+
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _pid, uid, _gid = struct.unpack("3i", creds)
+    if uid != os.getuid():
+        raise DaemonError(f"{path} is served by uid {uid}, not {os.getuid()}; refusing to use it")
+
+
+# -----------------------
+# Server
+# -----------------------
+class AuditDaemon:
+    """
+    Dispatches audit requests onto a bounded pool. Requests:
+
+      {"op": "audit", "id": ..., "text": "...", "stream": false, "timings": null}
+      {"op": "ping"} / {"op": "stats"}
+
+    Responses: {"id", "ok": true, "report", "server_ms"} or
+    {"id", "ok": false, "error"}; with "stream": true each routed hit is
+    sent first as {"id", "event": {"type": "hit", ...}}.
+    """
+
+    def __init__(self, llm_client: Any, max_concurrency: int = 4, max_pending: int = 64,
+                 info: Optional[Dict[str, Any]] = None) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.llm = llm_client
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="prime-node-audit")
+        # backpressure: readers block here once max_pending requests are queued/running
+        self._slots = threading.BoundedSemaphore(max(self.max_concurrency, int(max_pending)))
+        self.info = dict(info or {})
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.served = 0
+        self.failed = 0
+        self.in_flight = 0
+        self._runtime = None
+
+    def warm(self) -> "AuditDaemon":
+        """Import the runtime and load every cached artifact before the first request."""
+        from prime_node_os.engine import prime_node_runtime as pn
+
+        pn.load_config()
+        pn.load_thresholds()
+        pn.load_inference_profile()
+        pn.load_gate_table()
+        pn.load_seeds()
+        self._runtime = pn
+        return self
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "protocol": PROTOCOL,
+                "pid": os.getpid(),
+                "uptime_s": round(time.time() - self.started, 3),
+                "served": self.served,
+                "failed": self.failed,
+                "in_flight": self.in_flight,
+                "max_concurrency": self.max_concurrency,
+                **self.info,
+            }
+
+    def handle(self, req: Dict[str, Any], emit: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Run one request to completion (blocking)."""
+        rid = req.get("id")
+        op = req.get("op", "audit")
+        if op in ("ping", "stats"):
+            return {"id": rid, "ok": True, **self.stats()}
+        if op != "audit":
+            return {"id": rid, "ok": False, "error": f"unknown op {op!r}"}
+        text = req.get("text")
+        if not isinstance(text, str):
+            return {"id": rid, "ok": False, "error": "audit request needs a string 'text'"}
+
+        pn = self._runtime or self.warm()._runtime
+        t0 = time.perf_counter()
+        with self._lock:
+            self.in_flight += 1
+        try:
+            if req.get("stream") and emit is not None:
+                report = None
+                for ev in pn.run_prime_node_audit_stream(text, self.llm, timings=req.get("timings")):
+                    if ev["type"] == "report":
+                        report = ev["report"]
+                    else:
+                        emit({"id": rid, "event": ev})
+            else:
+                report = pn.run_prime_node_audit(text, self.llm, timings=req.get("timings"))
+            resp = {"id": rid, "ok": True, "report": report}
+        except Exception as e:
+            resp = {"id": rid, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        with self._lock:
+            self.in_flight -= 1
+            self.served += 1
+            self.failed += not resp["ok"]
+        resp["server_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+        return resp
+
+    def submit(self, req: Dict[str, Any], reply: Callable[[Dict[str, Any]], None]) -> None:
+        """Queue req on the pool; reply(msg) gets stream events and the response."""
+        self._slots.acquire()
+
+        def run():
+            try:
+                reply(self.handle(req, emit=reply))
+            except Exception:
+                pass   # connection went away; nothing left to tell
+            finally:
+                self._slots.release()
+
+        self.pool.submit(run)
+
+    def close(self) -> None:
+        from prime_node_os.cold_mirror.core.timing import flush_pending
+
+        self.pool.shutdown(wait=True)
+        flush_pending()   # stage histograms recorded since the last periodic flush
+
+
+def _unix_handler(daemon: AuditDaemon):
+    import socketserver
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            wlock = threading.Lock()
+            wfile = self.wfile
+
+            def reply(msg: Dict[str, Any]) -> None:
+                data = (json.dumps(msg) + "\n").encode("utf-8")
+                with wlock:
+                    wfile.write(data)
+                    wfile.flush()
+
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    req = json.loads(line)
+                    if not isinstance(req, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as e:
+                    reply({"id": None, "ok": False, "error": f"bad request: {e}"})
+                    continue
+                if req.get("op") in ("ping", "stats"):
+                    reply(daemon.handle(req))   # answer inline, never queued
+                else:
+                    daemon.submit(req, reply)
+
+    return Handler
+
+
+def _http_handler(daemon: AuditDaemon, token: str):
+    import hmac
+    from http.server import BaseHTTPRequestHandler
+
+    expected = f"Bearer {token}".encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive
+
+        def _send(self, code: int, body: Dict[str, Any]) -> None:
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _authorized(self) -> bool:
+            got = self.headers.get("Authorization", "").encode("utf-8")
+            if hmac.compare_digest(got, expected):
+                return True
+            self._send(401, {"ok": False, "error": "missing or wrong bearer token"})
+            return False
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            if self.path in ("/health", "/stats"):
+                self._send(200, {"ok": True, **daemon.stats()})
+            else:
+                self._send(404, {"ok": False, "error": "not found"})
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            if self.path != "/audit":
+                self._send(404, {"ok": False, "error": "not found"})
+                return
+            try:
+                req = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not isinstance(req, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as e:
+                self._send(400, {"ok": False, "error": f"bad request: {e}"})
+                return
+            req["op"] = "audit"
+            req.pop("stream", None)
+            done = threading.Event()
+            out: Dict[str, Any] = {}
+
+            def reply(msg):
+                out.update(msg)
+                done.set()
+
+            daemon.submit(req, reply)
+            done.wait()
+            self._send(200 if out.get("ok") else 500, out)
+
+        def log_message(self, fmt, *args):   # quiet; audits are logged to telemetry
+            pass
+
+    return Handler
+
+
+def serve_unix(daemon: AuditDaemon, path: Optional[str] = None) -> None:
+    """Serve on a Unix socket until interrupted; refuses to replace a live daemon."""
+    import socketserver
+
+    path = path or default_socket_path()
+    parent = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(parent):
+        os.makedirs(parent, mode=0o700)
+    if os.path.exists(path):
+        _check_owner(path)
+        if ping(path) is not None:
+            raise DaemonError(f"a prime-node daemon is already listening on {path}")
+        os.unlink(path)   # stale socket from a dead daemon
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    # bind under a restrictive umask: the socket is 0600 from the start
+    old_umask = os.umask(0o177)
+    try:
+        server = Server(path, _unix_handler(daemon))
+    finally:
+        os.umask(old_umask)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def serve_http(daemon: AuditDaemon, token: str, host: str = "127.0.0.1", port: int = 8765) -> None:
+    """
+    Serve HTTP until interrupted. Every request must send
+    `Authorization: Bearer <token>`; anyone holding the token spends the
+    daemon's LLM credentials, so keep it to the daemon's owner.
+    """
+    from http.server import ThreadingHTTPServer
+
+    if not token:
+        raise DaemonError("serve_http needs a non-empty token")
+    server = ThreadingHTTPServer((host, port), _http_handler(daemon, token))
+    server.daemon_threads = True
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+# -----------------------
+# Client
+# -----------------------
+class DaemonClient:
+    """
+    Line-protocol client for serve_unix. One connection; requests may be
+    pipelined with audit_many(). Not thread-safe: use one per thread.
+    Raises DaemonError if the socket or the serving process belongs to
+    another user (audit text is never sent to them).
+    """
+
+    def __init__(self, path: Optional[str] = None, timeout: Optional[float] = None) -> None:
+        self.path = path or default_socket_path()
+        _check_owner(self.path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.settimeout(timeout)
+            self.sock.connect(self.path)
+            _check_peer(self.sock, self.path)
+        except BaseException:
+            self.sock.close()
+            raise
+        self._r = self.sock.makefile("rb")
+        self._next_id = 0
+
+    def close(self) -> None:
+        self._r.close()
+        self.sock.close()
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _send(self, req: Dict[str, Any]) -> None:
+        self.sock.sendall((json.dumps(req) + "\n").encode("utf-8"))
+
+    def _recv(self) -> Dict[str, Any]:
+        line = self._r.readline()
+        if not line:
+            raise DaemonError("daemon closed the connection")
+        return json.loads(line)
+
+    def _id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def request(self, req: Dict[str, Any], on_event: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        req = {**req, "id": self._id()}
+        self._send(req)
+        while True:
+            msg = self._recv()
+            if "event" in msg:
+                if on_event is not None:
+                    on_event(msg["event"])
+                continue
+            return msg
+
+    def ping(self) -> Dict[str, Any]:
+        return self.request({"op": "ping"})
+
+    def audit(self, text: str, on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+              timings: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Report for text; on_event switches on streaming and gets each hit
+        event. timings=True asks for report["timings"].
+        """
+        req = {"op": "audit", "text": text, "stream": on_event is not None}
+        if timings is not None:
+            req["timings"] = timings
+        resp = self.request(req, on_event)
+        if not resp.get("ok"):
+            raise DaemonError(resp.get("error", "audit failed"))
+        return resp["report"]
+
+    def audit_many(self, items: Iterable[Tuple[str, Any]], window: int = 16, ordered: bool = False,
+                   timings: Optional[bool] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Pipeline (item_id, text) pairs over this one connection with at most
+        `window` requests in flight; yields {"id", "report"} / {"id", "error"}
+        (run_batch's record shape) in completion order, or in input order
+        with ordered (at most 4 x window finished records wait behind a slow
+        one). timings=True asks for report["timings"].
+        """
+        window = max(1, int(window))
+        it = iter(items)
+        pending: Dict[int, str] = {}            # request id -> item id, awaiting a reply
+        order: Deque[int] = deque()             # request ids in input order (ordered only)
+        done: Dict[int, Dict[str, Any]] = {}    # finished, held back for order
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < window and len(done) < 4 * window:
+                try:
+                    item_id, text = next(it)
+                except StopIteration:
+                    exhausted = True
+                    break
+                rid = self._id()
+                if ordered:
+                    order.append(rid)
+                if not isinstance(text, str):   # batch_runtime.InputError for an unreadable input
+                    rec = {"id": item_id, "error": f"{type(text).__name__}: {text}"}
+                    if ordered:
+                        done[rid] = rec
+                    else:
+                        yield rec
+                    continue
+                req = {"op": "audit", "id": rid, "text": text}
+                if timings is not None:
+                    req["timings"] = timings
+                pending[rid] = item_id
+                self._send(req)
+            while order and order[0] in done:
+                yield done.pop(order.popleft())
+            if not pending:
+                return
+            msg = self._recv()
+            rid = msg.get("id")
+            item_id = pending.pop(rid, None)
+            if item_id is None:
+                continue
+            if msg.get("ok"):
+                rec = {"id": item_id, "report": msg["report"]}
+            else:
+                rec = {"id": item_id, "error": msg.get("error", "audit failed")}
+            if ordered:
+                done[rid] = rec
+            else:
+                yield rec
+
+
+def ping(path: Optional[str] = None, timeout: float = 0.5) -> Optional[Dict[str, Any]]:
+    """Daemon stats if one is listening on path, else None."""
+    try:
+        with DaemonClient(path, timeout=timeout) as c:
+            resp = c.ping()
+    except (OSError, ValueError, DaemonError):
+        return None
+    return resp if resp.get("ok") else None
@@ -0,0 +1,141 @@
+# engine/batch_runtime.py — batch audits over a corpus
+# - Input discovery: directory, glob pattern, or JSONL file
+# - Bounded thread pool: at most `concurrency` audits (LLM calls) in flight
+# - Results stream back as they complete, in input order or completion order
+
+from __future__ import annotations
+import glob
+import json
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Tuple, Union
+
+BatchItem = Tuple[str, Union[str, "InputError"]]   # (input id, text)
+
+
+class InputError(Exception):
+    """
+    Stands in for the text of an input that couldn't be read; run_batch
+    emits it as that item's {"id", "error"} record instead of auditing.
+    """
+
+
+def _read_text(p: Path) -> str:
+    return p.read_text(encoding="utf-8", errors="replace")
+
+
+def iter_jsonl_inputs(path: Path) -> Iterator[BatchItem]:
+    """
+    One input per line: either a JSON string, or an object with "text"
+    (optionally "id"). Blank lines are skipped; a malformed line yields an
+    InputError for that line and the rest of the file is still read.
+    """
+    with Path(path).open("r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            item_id = f"{path}:{lineno}"
+            try:
+                rec = json.loads(line)
+            except ValueError as e:
+                yield item_id, InputError(f"invalid JSON: {e}")
+                continue
+            if isinstance(rec, str):
+                yield item_id, rec
+            elif isinstance(rec, dict) and isinstance(rec.get("text"), str):
+                yield str(rec.get("id", item_id)), rec["text"]
+            else:
+                if isinstance(rec, dict) and "id" in rec:
+                    item_id = str(rec["id"])
+                yield item_id, InputError('expected a JSON string or an object with a string "text"')
+
+
+def iter_batch_inputs(source: str) -> Iterator[BatchItem]:
+    """
+    source may be a directory (every file below it), a .jsonl file,
+    a single file, or a glob pattern (recursive ** supported).
+    Raises FileNotFoundError when a directory or pattern has no files.
+    """
+    p = Path(source)
+    if p.is_dir():
+        files = sorted(x for x in p.rglob("*") if x.is_file())
+    elif p.is_file() and p.suffix == ".jsonl":
+        yield from iter_jsonl_inputs(p)
+        return
+    elif p.is_file():
+        files = [p]
+    else:
+        files = [Path(name) for name in sorted(glob.glob(source, recursive=True)) if Path(name).is_file()]
+    if not files:
+        raise FileNotFoundError(f"no input files match {source}")
+    for f in files:
+        try:
+            yield str(f), _read_text(f)
+        except OSError as e:
+            yield str(f), InputError(str(e))
+
+
+def _result(item_id: str, fut: Future) -> Dict[str, Any]:
+    try:
+        return {"id": item_id, "report": fut.result()}
+    except Exception as e:
+        return {"id": item_id, "error": f"{type(e).__name__}: {e}"}
+
+
+def run_batch(
+    items: Iterable[BatchItem],
+    audit: Callable[[str], Dict[str, Any]],
+    concurrency: int = 4,
+    ordered: bool = True,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Run audit(text) for every item on a bounded thread pool and yield
+    {"id", "report"} (or {"id", "error"}) records as results arrive.
+
+    Inputs are pulled lazily, so at most `concurrency` audits are in flight
+    and memory stays flat on large corpora. With ordered=True records are
+    released in input order (a slow item holds back later ones, and at most
+    4 x concurrency finished reports are buffered behind it); otherwise
+    they are yielded in completion order.
+    """
+    concurrency = max(1, int(concurrency))
+    window = concurrency * 4
+    it = iter(items)
+    pending: Dict[Future, Tuple[int, str]] = {}
+    done_buf: Dict[int, Dict[str, Any]] = {}
+    next_seq = 0     # next input sequence number to submit
+    emit_seq = 0     # next sequence number to release when ordered
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="prime-node-batch") as pool:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < concurrency and len(done_buf) < window:
+                try:
+                    item_id, text = next(it)
+                except StopIteration:
+                    exhausted = True
+                    break
+                if isinstance(text, InputError):
+                    done_fut: Future = Future()
+                    done_fut.set_exception(text)
+                    pending[done_fut] = (next_seq, item_id)
+                else:
+                    pending[pool.submit(audit, text)] = (next_seq, item_id)
+                next_seq += 1
+
+            if not pending:
+                break
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                seq, item_id = pending.pop(fut)
+                rec = _result(item_id, fut)
+                if not ordered:
+                    yield rec
+                else:
+                    done_buf[seq] = rec
+
+            while emit_seq in done_buf:
+                yield done_buf.pop(emit_seq)
+                emit_seq += 1
@@ -0,0 +1,165 @@
+# engine/crown_verify.py — post-audit crown verification
+# - mirror residual: chance at least one hit is misjudged, 1 - Π max(c, 1 - c);
+#   confident hits (either way) leave little residual, hedged ones a lot
+# - coherence: (1 - residual) x agreement between SC@k samples (1.0 for one sample)
+# - verdict against inference_profile.yaml crown_verify + thresholds crown_verification
+# - short-circuit: stop SC@k sampling once the verdict can't change (a residual
+#   failure the outstanding samples can't undo), and skip reflexion when
+#   another pass couldn't change the outcome
+# - next_action needs hits whose family routes to a gate (segment_to_gates.yaml)
+
+from __future__ import annotations
+import json
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+
+def crown_settings(profile: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    cv = (profile or {}).get("crown_verify", {}) or {}
+    rf = (profile or {}).get("reflexion", {}) or {}
+    return {
+        "mirror_residual_lt": float(cv.get("mirror_residual_lt", 0.08)),
+        "require_concrete_next_action": bool(cv.get("require_concrete_next_action", True)),
+        "short_circuit": bool(cv.get("short_circuit", True)),
+        "reflexion_passes": int(rf.get("passes", 0)),
+    }
+
+
+def _min_coherence(thresholds: Optional[Dict[str, Any]]) -> float:
+    t = (thresholds or {}).get("thresholds", thresholds or {})
+    return float(((t.get("crown_verification") or {}).get("pass_min_coherence", 0.0)))
+
+
+def _certainty(c: float) -> float:
+    c = min(1.0, max(0.0, c))
+    return c if c >= 0.5 else 1.0 - c
+
+
+def mirror_residual(confidences: Iterable[float]) -> float:
+    sure = 1.0
+    for c in confidences:
+        sure *= _certainty(c)
+    return 1.0 - sure
+
+
+def agreement(sc: Optional[Dict[str, Any]]) -> float:
+    """Mean vote share over every seed any sample proposed; 1.0 without SC@k."""
+    if not sc or not sc.get("votes") or not sc.get("completed"):
+        return 1.0
+    n = sc["completed"]
+    shares = [min(1.0, v / n) for v in sc["votes"].values()]
+    return sum(shares) / len(shares)
+
+
+def add_sample(sc: Dict[str, Any], matches: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    sc summary with one more completed sample voting for matches' seeds (a
+    reflexion answer), so agreement() reflects the revised answer too.
+    """
+    votes = dict(sc.get("votes") or {})
+    for sid in {m["seed_id"] for m in matches}:
+        votes[sid] = votes.get(sid, 0) + 1
+    return {**sc, "votes": votes, "completed": sc.get("completed", 0) + 1,
+            "reflexion_samples": sc.get("reflexion_samples", 0) + 1}
+
+
+def next_action(routed_hits: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Strongest hit that routes to a gate: the concrete thing to do next."""
+    best = None
+    for h in routed_hits:
+        if h.get("gate") and (best is None or h.get("confidence", 0.0) > best.get("confidence", 0.0)):
+            best = h
+    if best is None:
+        return None
+    return {"seed_id": best.get("seed_id"), "gate": best["gate"], "confidence": best.get("confidence", 0.0)}
+
+
+def verify(
+    routed_hits: List[Dict[str, Any]],
+    settings: Dict[str, Any],
+    thresholds: Optional[Dict[str, Any]] = None,
+    sc: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Crown verdict for one audit. Checks run cheapest first and stop at the
+    first failure; a clean audit (no hits) needs no next action.
+    """
+    residual = mirror_residual(h.get("confidence", 0.0) for h in routed_hits)
+    coherence = (1.0 - residual) * agreement(sc)
+    min_coh = _min_coherence(thresholds)
+    action = next_action(routed_hits)
+
+    checks: Dict[str, bool] = {}
+    failed_on = None
+    checks["residual"] = residual < settings["mirror_residual_lt"]
+    if not checks["residual"]:
+        failed_on = "residual"
+    else:
+        checks["coherence"] = coherence >= min_coh
+        if not checks["coherence"]:
+            failed_on = "coherence"
+        elif settings["require_concrete_next_action"] and routed_hits:
+            checks["next_action"] = action is not None
+            if action is None:
+                failed_on = "next_action"
+
+    passed = failed_on is None
+    # A review pass can recalibrate hedged confidences (residual) and, with
+    # them, coherence, but only while SC@k agreement alone clears the
+    # minimum. A missing next action is a routing gap no pass can fix.
+    reflexion_needed = settings["reflexion_passes"] > 0 and (
+        failed_on == "residual" or (failed_on == "coherence" and agreement(sc) >= min_coh))
+    return {
+        "passed": passed,
+        "failed_on": failed_on,
+        "mirror_residual": round(residual, 6),
+        "coherence": round(coherence, 6),
+        "min_coherence": min_coh,
+        "mirror_residual_lt": settings["mirror_residual_lt"],
+        "next_action": action,
+        "checks": checks,
+        "reflexion_needed": reflexion_needed,
+    }
+
+
+def reflexion_prompt(prompt: str, matches: List[Dict[str, Any]], failed_on: str) -> str:
+    """Self-review prompt: the original task, the previous answer and what failed."""
+    previous = json.dumps({"matches": [
+        {"seed_id": m["seed_id"], "confidence": m["confidence"], "evidence": m.get("evidence", "")}
+        for m in matches
+    ]})
+    return (
+        f"{prompt}\n\nYOUR PREVIOUS ANSWER:\n{previous}\n\n"
+        f"Crown verification failed on {failed_on}. Re-check every match against the "
+        "user content: keep only seeds with direct evidence in the text and recalibrate "
+        "their confidence. Respond again with ONLY the JSON object, in the same shape."
+    )
+
+
+def sc_stop_when(settings: Dict[str, Any], seeds_by_id: Mapping[str, Any]) -> Callable[[Any], bool]:
+    """
+    stop_when hook for run_sc_k: true once the verdict is settled whatever
+    the outstanding samples say. That is only a residual failure: seeds
+    already certain to be accepted keep the residual at or over the limit
+    at the most certain confidence their remaining votes could give. A pass
+    is never settled early, since every sample still moves agreement (and
+    so coherence). With short_circuit off all k samples run.
+    """
+    if not settings["short_circuit"]:
+        return lambda tally: False
+    from prime_node_os.engine.sc_executor import AGGREGATES
+
+    limit = settings["mirror_residual_lt"]
+
+    def stop(tally) -> bool:
+        agg = AGGREGATES[tally.aggregate]
+        left = tally.outstanding
+        sure = 1.0
+        for sid, ms in tally.votes.items():
+            if len(ms) < tally.min_votes or sid not in seeds_by_id:
+                continue
+            cs = [m["confidence"] for m in ms]
+            # certainty is convex in c: its max over the reachable range is at an end
+            sure *= max(_certainty(agg(cs + [0.0] * left)), _certainty(agg(cs + [1.0] * left)))
+        return 1.0 - sure >= limit
+
+    return stop
@@ -0,0 +1,128 @@
+from __future__ import annotations
+import threading
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+Gates = Tuple[str, ...]
+
+_WILDCARD_CHARS = set("*?[")
+_UNSET = object()
+
+
+def _as_gates(value: Any) -> Gates:
+    if value is None:
+        return ()
+    if isinstance(value, (list, tuple)):
+        return tuple(str(v) for v in value if v is not None)
+    return (str(value),)
+
+
+class GateTable:
+    """
+    Family -> gate(s) routing, compiled from segment_to_gates.yaml.
+
+    Keys are matched in this order:
+      1. exact family name
+      2. glob patterns (e.g. "* Trap"), in file order
+      3. "*" — the default gate for anything unmatched
+    A value may be a single gate or a list of gates (fan-out); the first
+    gate is the primary one. Lookups are memoised per family.
+    """
+
+    def __init__(self, mapping: Optional[Mapping[str, Any]] = None) -> None:
+        self.exact: Dict[str, Gates] = {}
+        self.patterns: List[Tuple[str, Gates]] = []
+        self.default: Gates = ()
+        for key, value in (mapping or {}).items():
+            key = str(key)
+            gates = _as_gates(value)
+            if key == "*":
+                self.default = gates
+            elif _WILDCARD_CHARS & set(key):
+                self.patterns.append((key, gates))
+            else:
+                self.exact[key] = gates
+        self._memo: Dict[Any, Gates] = {}
+        # flat views of _memo for route(): family -> primary gate, and
+        # family -> gates only for families that fan out
+        self._primary: Dict[Any, Optional[str]] = {}
+        self._fanout: Dict[Any, Gates] = {}
+        self._memo_lock = threading.Lock()   # shared by batch/daemon worker threads
+
+    @classmethod
+    def from_yaml_data(cls, data: Any) -> "GateTable":
+        """Accepts the file as loaded, with or without the top-level segment_to_gates key."""
+        if isinstance(data, Mapping) and isinstance(data.get("segment_to_gates"), Mapping):
+            data = data["segment_to_gates"]
+        return cls(data if isinstance(data, Mapping) else {})
+
+    def gates_for(self, family: Optional[str]) -> Gates:
+        gates = self._memo.get(family)
+        if gates is not None:
+            return gates
+        gates = self.exact.get(family) if family is not None else None
+        if gates is None and family is not None:
+            for pattern, pg in self.patterns:
+                if fnmatchcase(family, pattern):
+                    gates = pg
+                    break
+        if gates is None:
+            gates = self.default
+        with self._memo_lock:
+            gates = self._memo.setdefault(family, gates)
+            self._primary[family] = gates[0] if gates else None
+            if len(gates) > 1:
+                self._fanout[family] = gates
+        return gates
+
+    def gate_for(self, family: Optional[str]) -> Optional[str]:
+        gates = self.gates_for(family)
+        return gates[0] if gates else None
+
+    def route(self, hits: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Copies of hits with "gate" (plus "gates" on fan-out). A memoised
+        family costs one dict lookup, the same as a plain mapping.
+        """
+        primary, fanout = self._primary, self._fanout
+        if not isinstance(hits, list):
+            hits = list(hits)
+        if not fanout:
+            try:
+                return [{**h, "gate": primary[h.get("family")]} for h in hits]
+            except KeyError:
+                pass   # a family not seen yet; the loop below memoises it
+        routed = []
+        append = routed.append
+        unset = _UNSET
+        for h in hits:
+            fam = h.get("family")
+            gate = primary.get(fam, unset)
+            if gate is unset:
+                self.gates_for(fam)
+                gate = primary[fam]
+            if fanout and fam in fanout:
+                append({**h, "gate": gate, "gates": list(fanout[fam])})
+            else:
+                append({**h, "gate": gate})
+        return routed
+
+
+# the runtime passes the same cached YAML dict every call; compile it once
+_COERCED: Tuple[Any, Optional[GateTable]] = (None, None)
+_COERCE_LOCK = threading.Lock()
+
+
+def as_gate_table(segment_map: Any) -> GateTable:
+    """GateTable for segment_map (a GateTable, or the raw YAML mapping)."""
+    global _COERCED
+    if isinstance(segment_map, GateTable):
+        return segment_map
+    src, table = _COERCED
+    if src is segment_map and table is not None:
+        return table
+    table = GateTable.from_yaml_data(segment_map)
+    with _COERCE_LOCK:
+        _COERCED = (segment_map, table)   # holds segment_map so its id isn't reused
+    return table
+
@@ -15,13 +15,17 @@ Phase model
 Public API
 - phase_fraction(ts: datetime|None) -> float
 - phase_name(frac: float) -> str
-- compute_nudges(frac: float) -> dict[str,float]
-- sample(ts: datetime|None) -> dict (phase+nudges snapshot)
+- phase_index(frac: float) -> int (0..7, no string compares)
+- nudge_table(caps) -> 8 read-only nudge mappings, clamped + memoised per caps
+- compute_nudges(frac: float) -> dict[str,float] (fresh copy, JSON-safe)
+- sample(ts: datetime|None) -> dict (phase+nudges snapshot, JSON-safe)
+- phase_fraction_many / sample_many(epochs) -> columnar batch (NumPy or array)
 
 CLI
 - `python lunar_nudge.py`        → JSON snapshot now
 - `python lunar_nudge.py --iso 2025-10-19T12:00:00Z`
 - `python lunar_nudge.py --caps 0.9 1.1`
+- `python lunar_nudge.py --stdin [--field ts] < stamps.jsonl` → JSONL, one line per input
 """
 from __future__ import annotations
 
@@ -29,7 +33,10 @@ import math
 import sys
 import json
 import datetime as dt
-from typing import Dict, Tuple
+from array import array
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, Mapping, TextIO, Tuple
 
 # --- Constants (module‑level for speed) ---
 SYNODIC: float = 29.530588853
@@ -51,10 +58,21 @@ __all__ = [
     "SYNODIC",
     "REF_NEW_MOON",
     "PHASE_NAMES",
+    "LEVERS",
+    "NUDGE_VECTORS",
     "phase_fraction",
+    "phase_index",
     "phase_name",
+    "phase_name_index",
+    "nudge_table",
+    "nudges_for_index",
+    "nudge_vectors",
     "compute_nudges",
     "sample",
+    "phase_fraction_many",
+    "phase_index_many",
+    "sample_many",
+    "iter_jsonl_samples",
 ]
 
 # --- Core phase functions ---
@@ -84,62 +102,157 @@ def phase_name(frac: float) -> str:
     i = int(frac * 8.0 + 0.5) & 7  # bitwise wrap for speed
     return PHASE_NAMES[i]
 
-# --- Nudge policy (gentle, clampable, branch‑light) ---
+def phase_name_index(name: str) -> int:
+    return _PHASE_INDEX[name]
+
+# --- Nudge policy (precomputed, read-only tables) ---
+# Levers in vector order; every phase vector defaults to 1.0 (no change).
+LEVERS = (
+    "severance",
+    "harmonizers",
+    "voice_clarity",
+    "coherence",
+    "integration",
+    "translation",
+    "grounding",
+    "sealing",
+    "call_harmonizers_bias",
+)
+
+# Phase-specific micro-biases, indexed like PHASE_NAMES
+# (keep deltas small; stacking stays tame)
+_PHASE_BIASES = (
+    {"severance": 1.10, "harmonizers": 0.95, "grounding": 1.05},            # New Moon
+    {"voice_clarity": 1.05, "translation": 1.03},                          # Waxing Crescent
+    {"coherence": 1.05, "grounding": 1.03},                                # First Quarter
+    {"integration": 1.05, "coherence": 1.02},                              # Waxing Gibbous
+    {"severance": 0.90, "harmonizers": 1.10, "call_harmonizers_bias": 1.12},  # Full Moon
+    {"translation": 1.05, "integration": 1.02},                            # Waning Gibbous
+    {"grounding": 1.07, "voice_clarity": 0.98},                            # Last Quarter
+    {"sealing": 1.05, "severance": 1.03},                                  # Waning Crescent
+)
+
+# Phase vectors as tuples in LEVERS order
+NUDGE_VECTORS: Tuple[Tuple[float, ...], ...] = tuple(
+    tuple(b.get(k, 1.0) for k in LEVERS) for b in _PHASE_BIASES
+)
+
+_PHASE_INDEX = {name: i for i, name in enumerate(PHASE_NAMES)}
+
 def _clamp(x: float, lo: float, hi: float) -> float:
     return hi if x > hi else (lo if x < lo else x)
 
-def _nudges_for(name: str) -> Dict[str, float]:
-    # Defaults: 1.0 (no change)
-    n = {
-        "severance": 1.0,
-        "harmonizers": 1.0,
-        "voice_clarity": 1.0,
-        "coherence": 1.0,
-        "integration": 1.0,
-        "translation": 1.0,
-        "grounding": 1.0,
-        "sealing": 1.0,
-        "call_harmonizers_bias": 1.0,
-    }
-    # Phase‑specific micro‑biases (keep deltas small; stacking stays tame)
-    if name == "New Moon":
-        n["severance"] = 1.10; n["harmonizers"] = 0.95; n["grounding"] = 1.05
-    elif name == "Waxing Crescent":
-        n["voice_clarity"] = 1.05; n["translation"] = 1.03
-    elif name == "First Quarter":
-        n["coherence"] = 1.05; n["grounding"] = 1.03
-    elif name == "Waxing Gibbous":
-        n["integration"] = 1.05; n["coherence"] = 1.02
-    elif name == "Full Moon":
-        n["severance"] = 0.90; n["harmonizers"] = 1.10; n["call_harmonizers_bias"] = 1.12
-    elif name == "Waning Gibbous":
-        n["translation"] = 1.05; n["integration"] = 1.02
-    elif name == "Last Quarter":
-        n["grounding"] = 1.07; n["voice_clarity"] = 0.98
-    else:  # Waning Crescent
-        n["sealing"] = 1.05; n["severance"] = 1.03
-    return n
+@lru_cache(maxsize=32)
+def _table(caps: Tuple[float, float] | None) -> Tuple[Mapping[str, float], ...]:
+    if caps is None:
+        vectors = NUDGE_VECTORS
+    else:
+        lo, hi = caps
+        vectors = tuple(tuple(_clamp(v, lo, hi) for v in vec) for vec in NUDGE_VECTORS)
+    return tuple(MappingProxyType(dict(zip(LEVERS, vec))) for vec in vectors)
+
+def _caps_key(caps) -> Tuple[float, float] | None:
+    return (float(caps[0]), float(caps[1])) if caps else None
+
+def nudge_table(caps: Tuple[float, float] | None = None) -> Tuple[Mapping[str, float], ...]:
+    """
+    The 8 phase nudge mappings (read-only, indexed by phase bin), clamped
+    to (lo, hi) caps once and memoised per caps.
+    """
+    return _table(_caps_key(caps))
+
+@lru_cache(maxsize=32)
+def _vectors(caps: Tuple[float, float] | None) -> Tuple[Tuple[float, ...], ...]:
+    return tuple(tuple(m.values()) for m in _table(caps))
+
+def nudge_vectors(caps: Tuple[float, float] | None = None) -> Tuple[Tuple[float, ...], ...]:
+    """nudge_table() as plain tuples in LEVERS order."""
+    return _vectors(_caps_key(caps))
+
+def phase_index(frac: float) -> int:
+    """Phase bin 0..7 (index into PHASE_NAMES / nudge_table())."""
+    return int(frac * 8.0 + 0.5) & 7
+
+def nudges_for_index(i: int, caps: Tuple[float, float] | None = None) -> Mapping[str, float]:
+    """Shared read-only mapping for phase bin i (no copy; hot path)."""
+    return _table(_caps_key(caps))[i]
 
 def compute_nudges(frac: float, caps: Tuple[float, float] | None = None) -> Dict[str, float]:
     """
     Return nudges keyed by conceptual levers. Optional (lo,hi) caps.
+    A plain dict copied from the memoised table, so callers may modify or
+    json.dumps it.
     """
-    n = _nudges_for(phase_name(frac))
-    if caps:
-        lo, hi = float(caps[0]), float(caps[1])
-        for k, v in n.items():
-            n[k] = _clamp(float(v), lo, hi)
-    return n
+    return dict(_table(_caps_key(caps))[int(frac * 8.0 + 0.5) & 7])
 
 def sample(ts: dt.datetime | None = None, caps: Tuple[float, float] | None = None) -> Dict[str, object]:
-    f = phase_fraction(ts)
+    t = _to_utc(ts)
+    f = phase_fraction(t)
+    i = phase_index(f)
     return {
         "phase_fraction": f,
-        "phase_name": phase_name(f),
-        "nudges": compute_nudges(f, caps=caps),
-        "timestamp": _to_utc(ts).isoformat(),
+        "phase_index": i,
+        "phase_name": PHASE_NAMES[i],
+        "nudges": dict(nudges_for_index(i, caps)),   # plain dict: JSON-safe snapshot
+        "timestamp": t.isoformat(),
     }
 
+# --- Batch API (epoch seconds; NumPy when available) ---
+REF_NEW_MOON_EPOCH: float = REF_NEW_MOON.timestamp()
+_DAY_S = 86400.0
+_np = False   # resolved on first batch call; None when NumPy is missing
+
+def _numpy():
+    global _np
+    if _np is False:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = None
+    return _np
+
+def phase_fraction_many(epochs: Iterable[float], use_numpy: bool | None = None):
+    """
+    Phase fractions for many epoch-second timestamps; same model as
+    phase_fraction(). Returns a float64 ndarray with NumPy, else array('d').
+    """
+    np = _numpy() if use_numpy is not False else None
+    if use_numpy and np is None:
+        raise RuntimeError("use_numpy=True but NumPy is not installed")
+    if np is not None:
+        d = (np.asarray(epochs, dtype=np.float64) - REF_NEW_MOON_EPOCH) / _DAY_S
+        return np.mod(d, SYNODIC) / SYNODIC
+    ref, syn = REF_NEW_MOON_EPOCH, SYNODIC
+    return array("d", [(((t - ref) / _DAY_S) % syn) / syn for t in epochs])
+
+def phase_index_many(fracs):
+    """Phase bins for phase_fraction_many() output (int8 ndarray or array('b'))."""
+    np = _numpy()
+    if np is not None and isinstance(fracs, np.ndarray):
+        return ((fracs * 8.0 + 0.5).astype(np.int8)) & 7
+    return array("b", [int(f * 8.0 + 0.5) & 7 for f in fracs])
+
+def sample_many(
+    epochs: Iterable[float],
+    caps: Tuple[float, float] | None = None,
+    use_numpy: bool | None = None,
+) -> Dict[str, object]:
+    """
+    Columnar batch of sample(): phase_fraction and phase_index per timestamp,
+    plus nudges as an (n, len(LEVERS)) ndarray with NumPy, or a list of the
+    shared per-phase vector tuples (LEVERS order) without it.
+    """
+    fracs = phase_fraction_many(epochs, use_numpy)
+    bins = phase_index_many(fracs)
+    vectors = nudge_vectors(caps)
+    np = _numpy()
+    if np is not None and isinstance(bins, np.ndarray):
+        nudges = np.asarray(vectors, dtype=np.float64)[bins]
+    else:
+        nudges = [vectors[i] for i in bins]
+    return {"levers": LEVERS, "phase_fraction": fracs, "phase_index": bins, "nudges": nudges}
+
 # --- CLI ---
 def _parse_iso(s: str) -> dt.datetime:
     # Accept 'Z' suffix; avoid heavy parsing libs
@@ -147,10 +260,77 @@ def _parse_iso(s: str) -> dt.datetime:
         s = s[:-1] + "+00:00"
     return dt.datetime.fromisoformat(s)
 
+def _epoch_of(line: str, field: str) -> float:
+    """Epoch seconds from a stdin line: a number, an ISO time, or a JSON object's field."""
+    v: object = line
+    if line.startswith("{"):
+        v = json.loads(line)[field]
+    try:
+        t = float(v)
+    except ValueError:
+        return _to_utc(_parse_iso(str(v))).timestamp()
+    if not math.isfinite(t):
+        # "nan"/"inf" (or NaN in JSON) would print as invalid JSON
+        raise ValueError(f"non-finite timestamp: {v!r}")
+    return t
+
+def iter_jsonl_samples(
+    lines: Iterable[str],
+    caps: Tuple[float, float] | None = None,
+    field: str = "ts",
+    chunk: int = 8192,
+) -> Iterator[str]:
+    """
+    Stream one JSON line per input line, computing chunk lines at a time
+    with sample_many(). Unparseable lines, and non-finite epochs (nan/inf),
+    yield {"line": n, "error": ...}.
+    """
+    # the per-phase tail of each output line only depends on the bin
+    tails = [
+        ', "phase_index": %d, "phase_name": %s, "nudges": %s}'
+        % (i, json.dumps(PHASE_NAMES[i]), json.dumps(dict(m)))
+        for i, m in enumerate(nudge_table(caps))
+    ]
+    epochs: list = []
+    errors: Dict[int, str] = {}
+    n = 0
+
+    def flush() -> Iterator[str]:
+        if epochs:
+            fracs = phase_fraction_many(epochs)
+            bins = phase_index_many(fracs)
+            for t, f, b in zip(epochs, fracs.tolist(), bins.tolist()):
+                yield '{"ts": %r, "phase_fraction": %r%s' % (t, f, tails[b])
+            epochs.clear()
+
+    for raw in lines:
+        n += 1
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            epochs.append(_epoch_of(line, field))
+        except (ValueError, KeyError, TypeError) as e:
+            # keep output in input order
+            yield from flush()
+            yield json.dumps({"line": n, "error": f"{type(e).__name__}: {e}"})
+            continue
+        if len(epochs) >= chunk:
+            yield from flush()
+    yield from flush()
+
+def _stream_stdin(inp: TextIO, out: TextIO, caps, field: str) -> None:
+    write = out.write
+    for rec in iter_jsonl_samples(inp, caps, field):
+        write(rec)
+        write("\n")
+
 if __name__ == "__main__":
     # Tiny, fast CLI for testing + telemetry sampling
     ts = None
     caps = None
+    stdin = False
+    field = "ts"
     i = 1
     argv = sys.argv
     n = len(argv)
@@ -160,9 +340,17 @@ if __name__ == "__main__":
             ts = _parse_iso(argv[i + 1]); i += 2; continue
         if a == "--caps" and i + 2 < n:
             caps = (float(argv[i + 1]), float(argv[i + 2])); i += 3; continue
+        if a == "--stdin":
+            stdin = True; i += 1; continue
+        if a == "--field" and i + 1 < n:
+            field = argv[i + 1]; i += 2; continue
         if a in ("-h", "--help"):
-            print("usage: python lunar_nudge.py [--iso 2025-10-19T12:00:00Z] [--caps 0.9 1.1]")
+            print("usage: python lunar_nudge.py [--iso 2025-10-19T12:00:00Z] [--caps 0.9 1.1]\n"
+                  "       python lunar_nudge.py --stdin [--field ts] [--caps 0.9 1.1] < stamps")
             sys.exit(0)
         i += 1
 
-    print(json.dumps(sample(ts, caps=caps), indent=2))
+    if stdin:
+        _stream_stdin(sys.stdin, sys.stdout, caps, field)
+    else:
+        print(json.dumps(sample(ts, caps=caps), indent=2))
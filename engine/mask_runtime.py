@@ -5,32 +5,61 @@
 
 from __future__ import annotations
 from pathlib import Path
-import os, sys, json, datetime as dt
+import os, sys, json, threading, datetime as dt
+from collections import OrderedDict
 
-ROOT = Path(os.environ.get("THOTH_PROJECT_ROOT", "/mnt/data")).resolve()
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+ROOT = Path(os.environ.get("THOTH_PROJECT_ROOT") or Path(__file__).resolve().parents[1]).resolve()
 
-# --- Telemetry (from self_learning_evaluator) ---
-try:
-    from self_learning_evaluator import log_telemetry
-except Exception:
+# The telemetry sink and the evaluator are resolved on first use, not at
+# import: importing this module stays cheap and leaves sys.path alone
+# until telemetry is actually written.
+_get_sink = None
+log_telemetry = None
+
+def _fallback_log_telemetry(coherence: float, mirror_residual: float, samples: int = 1):
     # Fallback: write minimal telemetry if evaluator isn't importable
-    def log_telemetry(coherence: float, mirror_residual: float, samples: int = 1):
-        rec = {
-            "timestamp": dt.datetime.utcnow().isoformat()+"Z",
-            "coherence": coherence,
-            "mirror_residual": mirror_residual,
-            "samples": samples,
-            "source": "mask_runtime_fallback"
-        }
-        tp = ROOT/"thread"/"telemetry.jsonl"
-        tp.parent.mkdir(parents=True, exist_ok=True)
-        with open(tp, "a", encoding="utf-8") as f:
-            f.write(json.dumps(rec)+"\n")
+    rec = {
+        "timestamp": dt.datetime.utcnow().isoformat()+"Z",
+        "coherence": coherence,
+        "mirror_residual": mirror_residual,
+        "samples": samples,
+        "source": "mask_runtime_fallback"
+    }
+    _append_jsonl(ROOT/"thread"/"telemetry.jsonl", rec)
+
+def _resolve_telemetry():
+    global _get_sink, log_telemetry
+    # --- Shared JSONL sink (background writer, one handle per ledger) ---
+    try:
+        from prime_node_os.cold_mirror.core.telemetry_sink import get_sink as _get_sink
+    except Exception:
+        _get_sink = False
+    # --- Telemetry (from ROOT/self_learning_evaluator.py, loaded by path
+    # so ROOT never goes on sys.path) ---
+    try:
+        import importlib.util
+        spec = importlib.util.spec_from_file_location(
+            "self_learning_evaluator", ROOT/"self_learning_evaluator.py")
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        log_telemetry = mod.log_telemetry
+    except Exception:
+        log_telemetry = _fallback_log_telemetry
+
+def _append_jsonl(path: Path, rec: dict):
+    if _get_sink is None:
+        _resolve_telemetry()
+    if _get_sink:
+        _get_sink().write(path, rec)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(rec)+"\n")
 
 def finish_turn(coherence: float, mirror_residual: float, samples: int = 1):
-    \"\"\"Call this at the end of a turn to log telemetry.\"\"\"
+    """Call this at the end of a turn to log telemetry."""
+    if log_telemetry is None:
+        _resolve_telemetry()
     log_telemetry(coherence, mirror_residual, samples)
 
 # --- Lunar Nudge Hook (optional) ---
@@ -46,37 +75,87 @@ def _load_yaml(path):
         except Exception:
             return {}
 
-def compute_lunar_nudges(project_root):
-    from pathlib import Path
+# Audits run on worker threads; _CACHE_LOCK guards the three caches below.
+# Work (yaml parse, applying nudges, telemetry) happens outside the lock.
+_CACHE_LOCK = threading.Lock()
+# lunar_nudge.yaml per path: (stat stamp, parsed cfg); re-parsed only when
+# (mtime, size, inode) changes, None stamp = file missing
+_LUNAR_CFG: dict = {}
+# adjusted thresholds per (thresholds id, root, cfg stamp, phase bin, caps),
+# least recently used evicted first. The value holds the thresholds object
+# itself: id() is only unique while the object is alive, so the strong ref
+# keeps the id from being reused by another dict while the entry exists.
+_ADJUSTED: OrderedDict = OrderedDict()
+_ADJUSTED_MAX = 64
+# last phase bin logged per project root; telemetry fires on transitions only
+_LAST_BIN: dict = {}
+_lunar = None
+
+def _lunar_mod():
+    global _lunar
+    if _lunar is None:
+        try:
+            from . import lunar_nudge as _lunar
+        except Exception:
+            import lunar_nudge as _lunar
+    return _lunar
+
+def _lunar_config(project_root):
     cfg_path = Path(project_root)/"runtime"/"lunar_nudge.yaml"
-    if not cfg_path.exists():
-        return None
-    cfg = _load_yaml(cfg_path)
-    if not cfg or not cfg.get("enabled", False):
-        return None
     try:
-        from .lunar_nudge import phase_fraction, phase_name, compute_nudges
-    except Exception:
-        from lunar_nudge import phase_fraction, phase_name, compute_nudges
-    frac = phase_fraction()
-    n = compute_nudges(frac)
+        st = os.stat(cfg_path)
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+    except OSError:
+        stamp = None
+    key = str(cfg_path)
+    with _CACHE_LOCK:
+        hit = _LUNAR_CFG.get(key)
+    if hit is not None and hit[0] == stamp:
+        return hit[1], stamp
+    cfg = _load_yaml(cfg_path) if stamp is not None else None
+    with _CACHE_LOCK:
+        _LUNAR_CFG[key] = (stamp, cfg)
+    return cfg, stamp
+
+def _caps_of(cfg) -> tuple:
     caps = cfg.get("caps", {"min":0.85,"max":1.15})
-    mn, mx = float(caps.get("min",0.85)), float(caps.get("max",1.15))
-    n = {k: max(mn, min(mx, float(v))) for k,v in n.items()}
-    # Optional logging toggle
+    return float(caps.get("min",0.85)), float(caps.get("max",1.15))
+
+def compute_lunar_nudges(project_root):
+    cfg, stamp = _lunar_config(project_root)
+    if not cfg or not cfg.get("enabled", False):
+        return None
+    ln = _lunar_mod()
+    frac = ln.phase_fraction()
+    i = ln.phase_index(frac)
+    caps = _caps_of(cfg)
+    n = dict(ln.nudges_for_index(i, caps))   # clamped once per caps; copy is JSON-safe
     payload = {"enabled": True, "mode": cfg.get("mode","on_input"),
-               "phase_fraction": frac, "phase_name": phase_name(frac), "nudges": n}
+               "phase_fraction": frac, "phase_index": i, "phase_name": ln.PHASE_NAMES[i], "nudges": n,
+               "config_stamp": stamp, "caps": caps}
+    # Optional logging toggle; one line per phase-bin transition, not per input
+    root_key = str(project_root)
+    transition = False
     if cfg.get("log", True):
-        tp = Path(project_root)/"thread"/"telemetry.jsonl"
-        tp.parent.mkdir(parents=True, exist_ok=True)
-        with open(tp, "a", encoding="utf-8") as f:
-            f.write(json.dumps({"timestamp": dt.datetime.utcnow().isoformat()+"Z",
-                                "event": "lunar_nudge", **payload}) + "\n")
+        with _CACHE_LOCK:
+            if _LAST_BIN.get(root_key) != i:
+                _LAST_BIN[root_key] = i
+                transition = True
+    if transition:
+        rec = {k: v for k, v in payload.items() if k not in ("config_stamp", "caps")}
+        _append_jsonl(Path(project_root)/"thread"/"telemetry.jsonl",
+                      {"timestamp": dt.datetime.utcnow().isoformat()+"Z",
+                       "event": "lunar_nudge", **rec})
     return payload
 
 def apply_lunar_nudges(thresholds: dict, nudges: dict) -> dict:
-    import copy
-    t = copy.deepcopy(thresholds)
+    """
+    Return thresholds with the nudges applied. Copy-on-write: only the dicts
+    on the path to a changed value are copied; every other subtree is shared
+    with the input, so treat the result as read-only. Accepts the bare
+    layout (meta_gate/gates at the top) or thresholds_1.1.yaml's, nested
+    under "thresholds".
+    """
     n = nudges.get("nudges", {}) if nudges else {}
     def bump(val, key):
         try:
@@ -86,31 +165,58 @@ def apply_lunar_nudges(thresholds: dict, nudges: dict) -> dict:
         except Exception:
             pass
         return val
+    def harmonizers(val):
+        bias = n.get("call_harmonizers_bias",1.0)
+        try:
+            bias = float(bias)
+        except Exception:
+            bias = 1.0
+        return val / max(0.5, bias)
+
+    nested = isinstance(thresholds.get("thresholds"), dict)
+    src = thresholds["thresholds"] if nested else thresholds
+    t = dict(src)
     # Meta-gate coherence
-    if "meta_gate" in t and "coherence" in t["meta_gate"]:
-        c = t["meta_gate"]["coherence"]
+    if isinstance(t.get("meta_gate"), dict) and isinstance(t["meta_gate"].get("coherence"), dict):
+        mg = t["meta_gate"] = dict(t["meta_gate"])
+        c = mg["coherence"] = dict(mg["coherence"])
         for k in ["warn_below","sever_below","stabilize_above"]:
             if k in c: c[k] = bump(c[k], "coherence")
     # Gate triggers
-    if "gates" in t and "triggers" in t["gates"]:
-        g = t["gates"]["triggers"]
+    if isinstance(t.get("gates"), dict) and isinstance(t["gates"].get("triggers"), dict):
+        gs = t["gates"] = dict(t["gates"])
+        g = gs["triggers"] = dict(gs["triggers"])
         if "early_severance_below" in g:
             g["early_severance_below"] = bump(g["early_severance_below"], "severance")
         if "call_harmonizers_below" in g:
-            bias = n.get("call_harmonizers_bias",1.0)
-            try:
-                bias = float(bias)
-            except Exception:
-                bias = 1.0
-            g["call_harmonizers_below"] = g["call_harmonizers_below"] / max(0.5, bias)
+            g["call_harmonizers_below"] = harmonizers(g["call_harmonizers_below"])
+    if nested:
+        return {**thresholds, "thresholds": t}
     return t
 
 def adjust_thresholds_with_lunar(thresholds: dict, project_root: str | Path = ROOT) -> dict:
+    """
+    Memoised per (thresholds object, lunar config version, phase bin, caps):
+    the bin changes eight times a synodic month, so nearly every call is a
+    dict lookup. The result shares structure with thresholds (read-only).
+    """
     ln = compute_lunar_nudges(project_root)
     if not ln: return thresholds
-    mode = ln.get("mode","on_input")
     # Currently same behavior for on_input/per_gate; caller decides frequency
-    return apply_lunar_nudges(thresholds, ln)
+    key = (id(thresholds), str(project_root), ln["config_stamp"], ln["phase_index"], ln["caps"])
+    with _CACHE_LOCK:
+        hit = _ADJUSTED.get(key)
+        if hit is not None and hit[0] is thresholds:
+            _ADJUSTED.move_to_end(key)
+            return hit[1]
+    adj = apply_lunar_nudges(thresholds, ln)
+    with _CACHE_LOCK:
+        # (thresholds, adj): the strong ref keeps id(thresholds) from being reused
+        _ADJUSTED[key] = (thresholds, adj)
+        _ADJUSTED.move_to_end(key)
+        while len(_ADJUSTED) > _ADJUSTED_MAX:
+            _ADJUSTED.popitem(last=False)
+    return adj
 
 if __name__ == "__main__":
     import argparse, json, sys
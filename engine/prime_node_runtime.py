@@ -1,92 +1,338 @@
 from __future__ import annotations
 from pathlib import Path
-import yaml
-import json
+import os
+import time
 
 # --- Cold Mirror Core ---
-from cold_mirror.core.seed_loader import load_seeds
-from cold_mirror.core.trap_engine import parse_matches, build_hits
-from cold_mirror.core.report_engine import build_report
-from cold_mirror.core.adapters_engine import resolve_steps, load_adapters
-from cold_mirror.core.telemetry import log_run
+from prime_node_os.cold_mirror.core.artifact_cache import CACHE, cached_config, cached_seeds, cached_yaml
+from prime_node_os.cold_mirror.core.seed_index import select_seeds
+from prime_node_os.cold_mirror.core.trap_engine import parse_matches, build_hits, iter_hits, iter_stream_matches, matches_from_payload
+from prime_node_os.cold_mirror.core.report_engine import build_report
+from prime_node_os.cold_mirror.core.telemetry import log_run
+from prime_node_os.cold_mirror.core.timing import finish_timings, timer_for
+from prime_node_os.cold_mirror.engine.llm.cache import find_cache_stats, scoped_client
+
+# --- Gate routing ---
+from prime_node_os.engine.gate_table import GateTable, as_gate_table
+
+# --- Inference profile: SC@k + schema enforcement ---
+from prime_node_os.engine.sc_executor import run_sc_k, run_sc_k_async, sc_settings
+from prime_node_os.engine.schema_enforcer import enforce, enforce_async, enforcement_settings
+from prime_node_os.engine.crown_verify import add_sample, crown_settings, reflexion_prompt, sc_stop_when, verify as crown_verify
 
 # --- Thoth OM Runtime ---
-from engine.mask_runtime import adjust_thresholds_with_lunar
-from engine.mask_runtime import finish_turn   # telemetry
+from prime_node_os.engine.mask_runtime import adjust_thresholds_with_lunar
+from prime_node_os.engine.mask_runtime import finish_turn   # telemetry
 
-ROOT = Path("/mnt/data")
+# project root: $THOTH_PROJECT_ROOT, else the tree this module ships in
+# (a checkout, or site-packages/prime_node_os with its configs and data)
+ROOT = Path(os.environ.get("THOTH_PROJECT_ROOT") or Path(__file__).resolve().parents[1])
 CM_DIR = ROOT / "cold_mirror"
 DATA_DIR = CM_DIR / "data"
 
 # -----------------------
 # Load base configs
 # -----------------------
+# All loaders go through the shared artifact cache: each file is parsed once
+# per process and re-parsed only when its (mtime, size, inode) changes.
+# Returned objects are shared — treat them as read-only.
 def load_config():
-    return yaml.safe_load((DATA_DIR / "config.yaml").read_text(encoding="utf-8"))
+    return cached_config(DATA_DIR)
 
 def load_thresholds():
-    thr_path = ROOT / "engine" / "thresholds_1.1.yaml"
-    return yaml.safe_load(thr_path.read_text(encoding="utf-8"))
+    return cached_yaml(ROOT / "engine" / "thresholds_1.1.yaml")
+
+def load_inference_profile():
+    path = ROOT / "runtime" / "inference_profile.yaml"
+    return cached_yaml(path) if path.exists() else {}
 
 
 # -----------------------
 # Gate Routing Logic
 # -----------------------
 def load_segment_map():
-    p = ROOT / "engine" / "segment_to_gates.yaml"
-    return yaml.safe_load(p.read_text(encoding="utf-8"))
+    return cached_yaml(ROOT / "engine" / "segment_to_gates.yaml")
+
+
+def load_gate_table() -> GateTable:
+    path = ROOT / "engine" / "segment_to_gates.yaml"
+    return CACHE.get(f"gates:{path}", (path,), lambda: GateTable.from_yaml_data(load_segment_map()))
+
+
+def load_seeds():
+    return cached_seeds(DATA_DIR)
 
 
 def route_hits_to_gates(hits, segment_map):
     """
     hits: list of CM hits → each with (seed_id, title, family, confidence)
-    segment_map: mapping for Problem/Audience/... to GateName
+    segment_map: GateTable, or the segment_to_gates mapping for family → GateName
+
+    Returns new dicts with "gate" (plus "gates" on fan-out); the input
+    hits are left untouched, so report families keep their plain hits.
     """
-    routed = []
-    for h in hits:
-        fam = h.get("family")
-        gate = segment_map.get(fam) or segment_map.get(h.get("family"))
-        routed.append({**h, "gate": gate})
-    return routed
+    return as_gate_table(segment_map).route(hits)
 
 
 # -----------------------
 # Unified Audit Entry Point
 # -----------------------
-def run_prime_node_audit(text: str, llm_client):
+# The pipeline is split around the LLM call so the sync and async entry
+# points share every non-LLM stage.
+def _prepare_audit(text: str, timings=None):
+    t0 = time.perf_counter()
     config = load_config()
     thresholds = load_thresholds()
-    segment_map = load_segment_map()
+    segment_map = load_gate_table()
+    profile = load_inference_profile()
+    timer = timer_for(config, timings, start=t0)
+    if timer.enabled:
+        timer.add("config", (time.perf_counter() - t0) * 1000)
 
     # 1. Load seeds
-    seeds_by_id = load_seeds(DATA_DIR, config)
+    with timer.span("seeds"):
+        seeds_by_id = load_seeds()
+
+    # 2. Build CM prompt (model is asked by the caller)
+    with timer.span("prompt"):
+        from prime_node_os.cold_mirror.engine.llm.prompts import build_trap_analysis_prompt
+        prompt_seeds = select_seeds(text, seeds_by_id, config)   # optional prefilter
+        prompt = build_trap_analysis_prompt(text, prompt_seeds)
+
+    ctx = {
+        "config": config,
+        "thresholds": thresholds,
+        "segment_map": segment_map,
+        "seeds_by_id": seeds_by_id,
+        "sc": sc_settings(profile),
+        "schema": enforcement_settings(profile, ROOT),
+        "crown": crown_settings(profile),
+        "timer": timer,
+    }
+    return prompt, ctx
+
+
+def _schema_result(raw: str, enf):
+    matches = matches_from_payload(enf.payload) if enf.valid else parse_matches(raw)
+    return matches, {"schema": enf.summary()}
+
+
+def _parse_response(prompt: str, raw: str, ctx, ask=None):
+    """
+    3. Parse, through the schema stage when enabled (ask re-queries the
+    model if local repair can't fix the response).
+    Returns (matches, report extras).
+    """
+    if ctx["schema"] is None:
+        return parse_matches(raw), None
+    raw, enf = enforce(prompt, raw, ctx["schema"], ask)
+    return _schema_result(raw, enf)
+
+
+async def _parse_response_async(prompt: str, raw: str, ctx, ask):
+    if ctx["schema"] is None:
+        return parse_matches(raw), None
+    raw, enf = await enforce_async(prompt, raw, ctx["schema"], ask)
+    return _schema_result(raw, enf)
+
+
+# Reflexion: while crown verification fails on something a review pass
+# could fix (see crown_verify.verify), ask the model to re-check its answer,
+# at most reflexion.passes times. Checks reuse the memoised thresholds.
+def _reflexion_failure(matches, ctx, extras):
+    routed = route_hits_to_gates(build_hits(matches, ctx["seeds_by_id"]), ctx["segment_map"])
+    sc = (extras or {}).get("sc_k")
+    verdict = crown_verify(routed, ctx["crown"], adjust_thresholds_with_lunar(ctx["thresholds"]), sc)
+    return verdict["failed_on"] if verdict["reflexion_needed"] else None
+
+
+def _revote(extras, matches):
+    # the revised answer counts as one more SC@k sample, so the next check
+    # (and the final verdict) sees agreement recomputed with it
+    sc = (extras or {}).get("sc_k")
+    return {**extras, "sc_k": add_sample(sc, matches)} if sc else extras
+
+
+def _reflexion_extras(extras, passes, run):
+    return {**(extras or {}), "reflexion": {"passes": passes, "run": len(run), "failed_on": run}}
+
+
+def _reflexion(prompt: str, matches, ctx, ask, extras=None):
+    passes = ctx["crown"]["reflexion_passes"]
+    if passes <= 0:
+        return matches, extras
+    run = []
+    with ctx["timer"].span("reflexion"):
+        for _ in range(passes):
+            failed_on = _reflexion_failure(matches, ctx, extras)
+            if failed_on is None:
+                break
+            review = reflexion_prompt(prompt, matches, failed_on)
+            matches, _ = _parse_response(review, ask(review), ctx, ask)
+            extras = _revote(extras, matches)
+            run.append(failed_on)
+    return matches, _reflexion_extras(extras, passes, run)
 
-    # 2. Build CM prompt + ask model
-    from cold_mirror.llm.prompts import build_trap_analysis_prompt
-    prompt = build_trap_analysis_prompt(text, seeds_by_id)
-    raw = llm_client.ask(prompt)
 
-    # 3. Parse + build hits
-    matches = parse_matches(raw)
-    hits = build_hits(matches, seeds_by_id)
+async def _reflexion_async(prompt: str, matches, ctx, ask, extras=None):
+    passes = ctx["crown"]["reflexion_passes"]
+    if passes <= 0:
+        return matches, extras
+    run = []
+    with ctx["timer"].span("reflexion"):
+        for _ in range(passes):
+            failed_on = _reflexion_failure(matches, ctx, extras)
+            if failed_on is None:
+                break
+            review = reflexion_prompt(prompt, matches, failed_on)
+            matches, _ = await _parse_response_async(review, await ask(review), ctx, ask)
+            extras = _revote(extras, matches)
+            run.append(failed_on)
+    return matches, _reflexion_extras(extras, passes, run)
+
+
+def _complete_from_matches(text: str, matches, ctx, llm_client=None, extras=None):
+    timer = ctx["timer"]
+
+    # 3b. Build hits
+    with timer.span("hits"):
+        hits = build_hits(matches, ctx["seeds_by_id"])
 
     # 4. Gate routing
-    routed_hits = route_hits_to_gates(hits, segment_map)
+    with timer.span("routing"):
+        routed_hits = route_hits_to_gates(hits, ctx["segment_map"])
+
+    return _finish_audit(text, hits, routed_hits, ctx, llm_client, extras)
+
+
+def _finish_audit(text: str, hits, routed_hits, ctx, llm_client=None, extras=None):
+    config = ctx["config"]
+    timer = ctx["timer"]
 
     # 5. Thoth OM threshold modulation (includes lunar nudges)
-    adj_thresholds = adjust_thresholds_with_lunar(thresholds)
+    with timer.span("thresholds"):
+        adj_thresholds = adjust_thresholds_with_lunar(ctx["thresholds"])
 
     # 6. Build CM report
-    report = build_report(text, hits, config)
-    report["gated_hits"] = routed_hits
-    report["thresholds_used"] = adj_thresholds
-
-    # 7. Telemetry
-    log_run(report, config, DATA_DIR)
-    finish_turn(
-        coherence=1.0,               # placeholder until model scoring
-        mirror_residual=len(hits),   # crude metric, can refine later
-        samples=1
-    )
+    with timer.span("report"):
+        report = build_report(text, hits, config)
+        report["gated_hits"] = routed_hits
+        report["thresholds_used"] = adj_thresholds
+        llm_cache = find_cache_stats(llm_client)
+        if llm_cache is not None:
+            report["llm_cache"] = llm_cache
+        if extras:
+            report.update(extras)   # sc_k / schema sections
+    sc = report.get("sc_k")
+
+    # 7. Crown verification (mirror residual + coherence)
+    with timer.span("crown"):
+        crown = crown_verify(routed_hits, ctx["crown"], adj_thresholds, sc)
+        report["crown_verify"] = crown
 
+    # 8. Telemetry
+    with timer.span("telemetry"):
+        log_run(report, config, DATA_DIR)
+        finish_turn(
+            coherence=crown["coherence"],
+            mirror_residual=crown["mirror_residual"],
+            samples=sc["completed"] if sc is not None else 1
+        )
+
+    # report["timings"] when enabled (report.timings or timings=True)
+    finish_timings(report, timer, config, DATA_DIR)
     return report
+
+
+def run_prime_node_audit(text: str, llm_client, timings=None):
+    """
+    With sc_k.enabled and k > 1 in runtime/inference_profile.yaml the model
+    is sampled k times concurrently and the matches are merged by vote (see
+    engine.sc_executor); report["sc_k"] records votes and per-sample latency.
+    Sampling stops early once the crown verdict is settled (a residual
+    failure later samples can't undo). When the verdict fails on residual
+    or coherence, reflexion.passes review passes re-ask the model
+    (report["reflexion"]); each revised answer counts as one more SC@k vote.
+    With schema_enforcement enabled each response is validated (and repaired
+    or re-asked per on_invalid); report["schema"] records the outcome.
+    timings=True (or report.timings in config.yaml) adds per-stage
+    milliseconds as report["timings"].
+    """
+    llm_client = scoped_client(llm_client)   # report["llm_cache"] covers this audit
+    prompt, ctx = _prepare_audit(text, timings)
+    timer = ctx["timer"]
+    if ctx["sc"]["k"] > 1:
+        parse = lambda raw, ask: _parse_response(prompt, raw, ctx, ask)
+        stop_when = sc_stop_when(ctx["crown"], ctx["seeds_by_id"])
+        with timer.span("llm"):   # k concurrent samples, each parsed as it lands
+            result = run_sc_k(prompt, llm_client, ctx["sc"], stop_when=stop_when, parse=parse)
+        matches, extras = result["matches"], {"sc_k": result["sc"]}
+    else:
+        with timer.span("llm"):
+            raw = llm_client.ask(prompt)
+        with timer.span("parse"):
+            matches, extras = _parse_response(prompt, raw, ctx, llm_client.ask)
+    matches, extras = _reflexion(prompt, matches, ctx, llm_client.ask, extras)
+    return _complete_from_matches(text, matches, ctx, llm_client, extras)
+
+
+async def run_prime_node_audit_async(text: str, llm_client, timings=None):
+    """
+    Async variant of run_prime_node_audit. llm_client may be an
+    AsyncLLMClient or a blocking LLMClient (run in an executor).
+    Only the LLM round trip is awaited; the other stages are local and short.
+    """
+    from prime_node_os.cold_mirror.engine.llm.client import ensure_async_client
+
+    llm_client = scoped_client(llm_client)
+    prompt, ctx = _prepare_audit(text, timings)
+    timer = ctx["timer"]
+    client = ensure_async_client(llm_client)
+    if ctx["sc"]["k"] > 1:
+        # samples are parsed on the loop: local schema repair only, no re-query
+        parse = lambda raw, ask: _parse_response(prompt, raw, ctx)
+        stop_when = sc_stop_when(ctx["crown"], ctx["seeds_by_id"])
+        with timer.span("llm"):
+            result = await run_sc_k_async(prompt, llm_client, ctx["sc"], stop_when=stop_when, parse=parse)
+        matches, extras = result["matches"], {"sc_k": result["sc"]}
+    else:
+        with timer.span("llm"):
+            raw = await client.ask(prompt)
+        with timer.span("parse"):
+            matches, extras = await _parse_response_async(prompt, raw, ctx, client.ask)
+    matches, extras = await _reflexion_async(prompt, matches, ctx, client.ask, extras)
+    return _complete_from_matches(text, matches, ctx, llm_client, extras)
+
+
+def run_prime_node_audit_stream(text: str, llm_client, timings=None):
+    """
+    Streaming variant of run_prime_node_audit. Yields events:
+
+      {"type": "hit", "hit": routed_hit}   — as soon as each match closes
+      {"type": "report", "report": report} — once, after the stream ends
+
+    llm_client may implement StreamingLLMClient.stream(prompt); plain
+    LLMClients work too, but then every hit arrives with the full response.
+    The final report is identical to run_prime_node_audit's for the same
+    response text. Streaming always takes a single sample (no SC@k) and
+    skips schema enforcement and reflexion: hits are emitted before the
+    response is whole.
+    With timings, "llm_stream" covers the stream with its incremental
+    parse/routing (and the consumer's time between hits).
+    """
+    from prime_node_os.cold_mirror.engine.llm.client import iter_response_chunks
+
+    llm_client = scoped_client(llm_client)
+    prompt, ctx = _prepare_audit(text, timings)
+    segment_map = ctx["segment_map"]
+
+    hits, routed_hits = [], []
+    with ctx["timer"].span("llm_stream"):
+        matches = iter_stream_matches(iter_response_chunks(llm_client, prompt))
+        for hit in iter_hits(matches, ctx["seeds_by_id"]):
+            routed = route_hits_to_gates([hit], segment_map)[0]
+            hits.append(hit)
+            routed_hits.append(routed)
+            yield {"type": "hit", "hit": routed}
+
+    yield {"type": "report", "report": _finish_audit(text, hits, routed_hits, ctx, llm_client)}
@@ -0,0 +1,315 @@
+# engine/sc_executor.py — self-consistency (SC@k) sampling
+# - Opt-in (sc_k.enabled): every audit costs up to k LLM calls
+# - Fires k samples of the same prompt concurrently (one shared, bounded
+#   thread pool for all audits, or asyncio)
+# - Merges match sets by seed_id: vote counts + aggregated confidence
+# - Stops early once no outstanding sample can change the majority (or
+#   the caller's stop_when says its result is final)
+# - Records per-sample latency
+
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from prime_node_os.cold_mirror.core.trap_engine import parse_matches
+
+# prompt -> raw response, bound to one sample's temperature / cache namespace
+AskFn = Callable[[str], str]
+# (raw response, that sample's ask or None) -> (matches, per-sample annotations or None)
+ParseFn = Callable[[str, Optional[AskFn]], Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]]
+
+
+def _default_parse(raw: str, ask: Optional[AskFn] = None):
+    return parse_matches(raw), None
+
+
+def _median(xs: List[float]) -> float:
+    s = sorted(xs)
+    mid = len(s) // 2
+    return s[mid] if len(s) % 2 else (s[mid - 1] + s[mid]) / 2
+
+
+AGGREGATES: Dict[str, Callable[[List[float]], float]] = {
+    "mean": lambda xs: sum(xs) / len(xs),
+    "max": max,
+    "median": _median,
+}
+
+
+def sc_settings(profile: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Normalised sc_k block of inference_profile.yaml (k=1 means a single
+    call). Sampling is opt-in: without enabled: true, k is 1.
+    """
+    sc = dict((profile or {}).get("sc_k", {}) or {})
+    enabled = bool(sc.get("enabled", False))
+    k = max(1, int(sc.get("k", 1))) if enabled else 1
+    min_votes = sc.get("min_votes")
+    return {
+        "enabled": enabled,
+        "k": k,
+        "temperature": sc.get("temperature"),
+        "min_votes": max(1, int(min_votes)) if min_votes is not None else k // 2 + 1,
+        "aggregate": sc.get("aggregate", "mean"),
+        "early_stop": bool(sc.get("early_stop", True)),
+        "max_workers": max(1, int(sc.get("max_workers", max(k, 8)))),
+    }
+
+
+# -----------------------
+# Shared sample pool
+# -----------------------
+# One pool for every audit in the process: max_workers bounds the LLM calls
+# in flight across concurrent audits, and no audit pays for thread start-up.
+_POOL = None
+_POOL_SIZE = 0
+_POOL_LOCK = threading.Lock()
+
+
+def _shared_pool(max_workers: int):
+    """The process-wide SC pool, rebuilt only when max_workers changes."""
+    global _POOL, _POOL_SIZE
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_SIZE != max_workers:
+            from concurrent.futures import ThreadPoolExecutor
+            old = _POOL
+            _POOL = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sc-k")
+            _POOL_SIZE = max_workers
+            if old is not None:
+                old.shutdown(wait=False)   # in-flight samples still finish
+        return _POOL
+
+
+def _reset_after_fork() -> None:
+    # pool threads don't survive fork; children build their own
+    global _POOL, _POOL_SIZE
+    _POOL, _POOL_SIZE = None, 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _sample_kwargs(llm_client: Any, i: int, temperature: Optional[float]) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {}
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    # identical prompts would otherwise collapse onto one cached response
+    from prime_node_os.cold_mirror.engine.llm.cache import CachingLLMClient
+    if isinstance(llm_client, CachingLLMClient):
+        kwargs["cache_namespace"] = f"sc{i}"
+    return kwargs
+
+
+class VoteTally:
+    """
+    Running merge of SC@k samples. A seed is accepted with at least
+    `min_votes` votes; the outcome is settled when every seed seen so far
+    is already in or can no longer get there, and an unseen seed couldn't
+    reach min_votes from the samples still outstanding.
+    """
+
+    def __init__(self, k: int, min_votes: int, aggregate: str = "mean") -> None:
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"sc_k.aggregate must be one of {tuple(AGGREGATES)}, got {aggregate!r}")
+        self.k = k
+        self.min_votes = min(min_votes, k)
+        self.aggregate = aggregate
+        self.outstanding = k
+        self.ok = 0
+        self.votes: Dict[str, List[Dict[str, Any]]] = {}
+
+    def add(self, matches: Optional[List[Dict[str, Any]]]) -> None:
+        """Record one finished sample; None for a failed one (an abstention)."""
+        self.outstanding -= 1
+        if matches is None:
+            return
+        self.ok += 1
+        seen = set()
+        for m in matches:
+            sid = m["seed_id"]
+            if sid in seen:
+                continue
+            seen.add(sid)
+            self.votes.setdefault(sid, []).append(m)
+
+    def settled(self) -> bool:
+        left = self.outstanding
+        if left >= self.min_votes:
+            return False
+        for ms in self.votes.values():
+            n = len(ms)
+            if n < self.min_votes <= n + left:
+                return False
+        return True
+
+    def quorum(self) -> int:
+        # samples that failed can't vote; don't let them veto every seed
+        if self.outstanding == 0 and self.ok < self.k:
+            return max(1, min(self.min_votes, self.ok // 2 + 1))
+        return self.min_votes
+
+    def merged(self) -> List[Dict[str, Any]]:
+        agg = AGGREGATES[self.aggregate]
+        q = self.quorum()
+        out = []
+        for sid, ms in self.votes.items():
+            if len(ms) < q:
+                continue
+            best = max(ms, key=lambda m: m["confidence"])
+            out.append({
+                "seed_id": sid,
+                "confidence": round(agg([m["confidence"] for m in ms]), 6),
+                "evidence": best["evidence"],
+                "votes": len(ms),
+            })
+        out.sort(key=lambda m: (-m["votes"], -m["confidence"], m["seed_id"]))
+        return out
+
+
+def _sample_record(i: int, latency_ms: float, matches: List[Dict[str, Any]], notes: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    rec = {"sample": i, "latency_ms": round(latency_ms, 3), "matches": len(matches)}
+    if notes:
+        rec.update(notes)
+    return rec
+
+
+def _summary(tally: VoteTally, samples: List[Dict[str, Any]], early_stopped: bool, wall_ms: float) -> Dict[str, Any]:
+    samples.sort(key=lambda s: s["sample"])
+    return {
+        "k": tally.k,
+        "completed": tally.ok,
+        "failed": sum(1 for s in samples if "error" in s),
+        "early_stopped": early_stopped,
+        "min_votes": tally.quorum(),
+        "aggregate": tally.aggregate,
+        "votes": {sid: len(ms) for sid, ms in tally.votes.items()},
+        "samples": samples,
+        "wall_ms": round(wall_ms, 3),
+    }
+
+
+def _raise_if_all_failed(tally: VoteTally, errors: List[BaseException]) -> None:
+    if tally.ok == 0 and errors:
+        raise errors[0]
+
+
+def run_sc_k(
+    prompt: str,
+    llm_client: Any,
+    settings: Dict[str, Any],
+    stop_when: Optional[Callable[[VoteTally], bool]] = None,
+    parse: ParseFn = _default_parse,
+) -> Dict[str, Any]:
+    """
+    Ask llm_client k times concurrently and merge the answers.
+
+    Returns {"matches": merged matches (with "votes"), "sc": summary}.
+    With early_stop, pending samples are cancelled (or abandoned, if already
+    running) as soon as the tally is settled, or, when given, as soon as
+    stop_when(tally) is true (it replaces the settled check: a caller that
+    reads more than the merged matches knows when its result is final).
+    parse turns each raw response into (matches, annotations); annotations
+    are kept on the sample record. It also gets that sample's ask, so any
+    re-query keeps the sample's temperature and cache namespace. If every
+    sample fails the first error is raised.
+    """
+    from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+    k = settings["k"]
+    tally = VoteTally(k, settings["min_votes"], settings["aggregate"])
+    samples: List[Dict[str, Any]] = []
+    errors: List[BaseException] = []
+    t_start = time.perf_counter()
+
+    def one(i: int):
+        t0 = time.perf_counter()
+        kwargs = _sample_kwargs(llm_client, i, settings["temperature"])
+        ask = lambda p: llm_client.ask(p, **kwargs)
+        return parse(ask(prompt), ask), (time.perf_counter() - t0) * 1000
+
+    pool = _shared_pool(settings["max_workers"])
+    pending: Dict[Future, int] = {pool.submit(one, i): i for i in range(k)}
+    early_stopped = False
+    try:
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                i = pending.pop(fut)
+                try:
+                    (matches, notes), latency_ms = fut.result()
+                except Exception as e:
+                    errors.append(e)
+                    tally.add(None)
+                    samples.append({"sample": i, "error": f"{type(e).__name__}: {e}"})
+                    continue
+                tally.add(matches)
+                samples.append(_sample_record(i, latency_ms, matches, notes))
+            if pending and settings["early_stop"] and (stop_when(tally) if stop_when else tally.settled()):
+                early_stopped = True
+                break
+    finally:
+        # drop queued samples; ones already running finish in the background
+        for fut in pending:
+            fut.cancel()
+
+    _raise_if_all_failed(tally, errors)
+    wall_ms = (time.perf_counter() - t_start) * 1000
+    return {"matches": tally.merged(), "sc": _summary(tally, samples, early_stopped, wall_ms)}
+
+
+async def run_sc_k_async(
+    prompt: str,
+    llm_client: Any,
+    settings: Dict[str, Any],
+    stop_when: Optional[Callable[[VoteTally], bool]] = None,
+    parse: ParseFn = _default_parse,
+) -> Dict[str, Any]:
+    """
+    asyncio counterpart of run_sc_k; outstanding samples are cancelled on
+    early stop. parse runs on the event loop, so it must not block; it is
+    called with ask=None.
+    """
+    import asyncio
+    from prime_node_os.cold_mirror.engine.llm.client import ensure_async_client
+
+    client = ensure_async_client(llm_client)
+    k = settings["k"]
+    tally = VoteTally(k, settings["min_votes"], settings["aggregate"])
+    samples: List[Dict[str, Any]] = []
+    errors: List[BaseException] = []
+    t_start = time.perf_counter()
+
+    async def one(i: int):
+        t0 = time.perf_counter()
+        raw = await client.ask(prompt, **_sample_kwargs(llm_client, i, settings["temperature"]))
+        return parse(raw, None), (time.perf_counter() - t0) * 1000
+
+    pending = {asyncio.ensure_future(one(i)): i for i in range(k)}
+    early_stopped = False
+    try:
+        while pending:
+            finished, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                i = pending.pop(task)
+                try:
+                    (matches, notes), latency_ms = task.result()
+                except Exception as e:
+                    errors.append(e)
+                    tally.add(None)
+                    samples.append({"sample": i, "error": f"{type(e).__name__}: {e}"})
+                    continue
+                tally.add(matches)
+                samples.append(_sample_record(i, latency_ms, matches, notes))
+            if pending and settings["early_stop"] and (stop_when(tally) if stop_when else tally.settled()):
+                early_stopped = True
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+
+    _raise_if_all_failed(tally, errors)
+    wall_ms = (time.perf_counter() - t_start) * 1000
+    return {"matches": tally.merged(), "sc": _summary(tally, samples, early_stopped, wall_ms)}
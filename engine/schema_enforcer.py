@@ -0,0 +1,425 @@
+# engine/schema_enforcer.py — schema enforcement for LLM responses
+# - Validators compiled once per schema file (re-built only when it changes)
+# - Deterministic local repair of common breakages before any re-query
+# - Policies (inference_profile.yaml schema_enforcement.on_invalid):
+#     warn   — validate and report, then parse leniently as before
+#     repair — local repair, then re-ask the model (max_requeries) if still invalid
+#     block  — like repair, but raise SchemaViolation if nothing valid comes back
+
+from __future__ import annotations
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from prime_node_os.cold_mirror.core.artifact_cache import CACHE
+from prime_node_os.cold_mirror.core.trap_engine import StreamingMatchParser, parse_payload
+
+POLICIES = ("warn", "repair", "block")
+MAX_ERRORS = 20
+
+Check = Callable[[Any, str, List[str]], None]
+
+
+class SchemaViolation(ValueError):
+    """Raised under on_invalid: block when no schema-valid response could be obtained."""
+
+    def __init__(self, errors: List[str]) -> None:
+        super().__init__("LLM response failed schema validation: " + "; ".join(errors[:5]))
+        self.errors = errors
+
+
+# -----------------------
+# Validator compilation
+# -----------------------
+_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def compile_schema(schema: Dict[str, Any]) -> Check:
+    """
+    Compile a JSON Schema subset into a single check(value, path, errors)
+    closure: type, enum, required, properties, additionalProperties, items,
+    min/maxItems, min/maxLength, minimum, maximum. Other keywords are ignored.
+    """
+    checks: List[Check] = []
+
+    types = schema.get("type")
+    if types is not None:
+        names = [types] if isinstance(types, str) else list(types)
+        preds = [_TYPES[t] for t in names if t in _TYPES]
+        label = "|".join(names)
+
+        def check_type(v, path, errors, preds=preds, label=label):
+            if not any(p(v) for p in preds):
+                errors.append(f"{path}: expected {label}, got {type(v).__name__}")
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+
+        def check_enum(v, path, errors):
+            if v not in allowed:
+                errors.append(f"{path}: {v!r} not in enum")
+        checks.append(check_enum)
+
+    for key, op, word in (("minimum", lambda v, b: v < b, "<"), ("maximum", lambda v, b: v > b, ">")):
+        if key in schema:
+            bound = schema[key]
+
+            def check_bound(v, path, errors, bound=bound, op=op, word=word):
+                if _TYPES["number"](v) and op(v, bound):
+                    errors.append(f"{path}: {v} {word} {bound}")
+            checks.append(check_bound)
+
+    for key, cls, op in (("minLength", str, lambda n, b: n < b), ("maxLength", str, lambda n, b: n > b),
+                         ("minItems", list, lambda n, b: n < b), ("maxItems", list, lambda n, b: n > b)):
+        if key in schema:
+            bound = int(schema[key])
+
+            def check_len(v, path, errors, bound=bound, cls=cls, op=op, key=key):
+                if isinstance(v, cls) and op(len(v), bound):
+                    errors.append(f"{path}: violates {key}={bound}")
+            checks.append(check_len)
+
+    props = {k: compile_schema(s) for k, s in (schema.get("properties") or {}).items()}
+    required = list(schema.get("required") or ())
+    extra = schema.get("additionalProperties", True)
+    extra_check = compile_schema(extra) if isinstance(extra, dict) else None
+    if props or required or extra is not True:
+        def check_object(v, path, errors):
+            if not isinstance(v, dict):
+                return
+            for k in required:
+                if k not in v:
+                    errors.append(f"{path}: missing required {k!r}")
+            for k, item in v.items():
+                sub = props.get(k)
+                if sub is not None:
+                    sub(item, f"{path}.{k}", errors)
+                elif extra is False:
+                    errors.append(f"{path}: unexpected key {k!r}")
+                elif extra_check is not None:
+                    extra_check(item, f"{path}.{k}", errors)
+        checks.append(check_object)
+
+    if isinstance(schema.get("items"), dict):
+        item_check = compile_schema(schema["items"])
+
+        def check_items(v, path, errors):
+            if not isinstance(v, list):
+                return
+            for i, item in enumerate(v):
+                if len(errors) >= MAX_ERRORS:
+                    return
+                item_check(item, f"{path}[{i}]", errors)
+        checks.append(check_items)
+
+    def check(v, path, errors):
+        for c in checks:
+            c(v, path, errors)
+    return check
+
+
+class SchemaValidator:
+    """Compiled validator plus the bits of the schema local repair needs."""
+
+    def __init__(self, schema: Dict[str, Any]) -> None:
+        self.schema = schema
+        self._check = compile_schema(schema)
+        items = ((schema.get("properties") or {}).get("matches") or {}).get("items") or {}
+        self.match_keys = set((items.get("properties") or {}).keys())
+        self.match_closed = items.get("additionalProperties", True) is False
+        self.top_keys = set((schema.get("properties") or {}).keys())
+        self.top_closed = schema.get("additionalProperties", True) is False
+
+    def errors(self, value: Any) -> List[str]:
+        errors: List[str] = []
+        self._check(value, "$", errors)
+        return errors[:MAX_ERRORS]
+
+
+def load_validator(path: Path) -> SchemaValidator:
+    """Validator for a schema file; compiled once, re-compiled when the file changes."""
+    path = Path(path)
+    return CACHE.get(
+        f"schema:{path}",
+        (path,),
+        lambda: SchemaValidator(json.loads(path.read_text(encoding="utf-8"))),
+    )
+
+
+# -----------------------
+# Local repair
+# -----------------------
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_KEY_ALIASES = {
+    "id": "seed_id", "seed": "seed_id", "seedId": "seed_id", "trap_id": "seed_id",
+    "score": "confidence", "probability": "confidence", "conf": "confidence",
+    "quote": "evidence", "reason": "evidence", "explanation": "evidence", "rationale": "evidence",
+}
+
+
+def _decode(raw: str, repairs: List[str]) -> Any:
+    text = raw.strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    payload = parse_payload(text)
+    if isinstance(payload, list) or (isinstance(payload, dict) and "matches" in payload):
+        repairs.append("extract_json")
+        return payload
+    fixed = _TRAILING_COMMA.sub(r"\1", text)
+    if fixed != text:
+        payload = parse_payload(fixed)
+        if isinstance(payload, list) or (isinstance(payload, dict) and "matches" in payload):
+            repairs.append("trailing_commas")
+            return payload
+    parser = StreamingMatchParser()
+    salvaged = parser.feed(text)
+    if parser.found_array:
+        repairs.append("truncated")
+        return {"matches": salvaged}
+    return None
+
+
+def _coerce_confidence(value: Any) -> Optional[float]:
+    if isinstance(value, str):
+        value = value.strip()
+        pct = value.endswith("%")
+        try:
+            value = float(value.rstrip("%"))
+        except ValueError:
+            return None
+        if pct and value == value:
+            return min(1.0, max(0.0, value / 100.0))    # "83%" -> 0.83
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value != value:
+        return None
+    # a whole number 2..100 reads as a percent (83 -> 0.83); 1.5 just clamps
+    if 2 <= value <= 100 and float(value).is_integer():
+        value /= 100.0
+    return min(1.0, max(0.0, float(value)))
+
+
+def repair_payload(raw: str, validator: SchemaValidator) -> Tuple[Any, List[str]]:
+    """
+    Deterministically fix the usual ways a model breaks the {"matches": [...]}
+    contract: fences/prose, trailing commas, truncation, a bare list,
+    aliased keys, string/percentage confidences, stray keys, unusable items.
+    Returns (payload or None, names of the repairs applied).
+    """
+    repairs: List[str] = []
+    payload = _decode(raw, repairs)
+    if payload is None:
+        return None, repairs
+
+    if isinstance(payload, list):
+        payload = {"matches": payload}
+        repairs.append("wrap_list")
+    if not isinstance(payload, dict):
+        return None, repairs
+    if not isinstance(payload.get("matches"), list):
+        return payload, repairs
+
+    if validator.top_closed:
+        extra = [k for k in payload if k not in validator.top_keys]
+        if extra:
+            payload = {k: v for k, v in payload.items() if k in validator.top_keys}
+            repairs.append("drop_extra_keys")
+
+    fixed: List[Dict[str, Any]] = []
+    renamed = coerced = dropped = stripped = False
+    for m in payload["matches"]:
+        if not isinstance(m, dict):
+            dropped = True
+            continue
+        item = {}
+        for k, v in m.items():
+            if k not in validator.match_keys and k in _KEY_ALIASES and _KEY_ALIASES[k] not in m:
+                k = _KEY_ALIASES[k]
+                renamed = True
+            item[k] = v
+        if not isinstance(item.get("seed_id"), str) or not item["seed_id"].strip():
+            dropped = True
+            continue
+        conf = item.get("confidence")
+        if not (_TYPES["number"](conf) and 0.0 <= conf <= 1.0):
+            c = _coerce_confidence(conf) if conf is not None else 0.0
+            if c is None:
+                dropped = True
+                continue
+            item["confidence"] = c
+            coerced = True
+        ev = item.get("evidence")
+        if ev is not None and not isinstance(ev, str):
+            item["evidence"] = str(ev)
+            coerced = True
+        if validator.match_closed:
+            for k in [k for k in item if k not in validator.match_keys]:
+                del item[k]
+                stripped = True
+        fixed.append(item)
+
+    for flag, name in ((renamed, "rename_keys"), (coerced, "coerce_values"),
+                       (stripped, "drop_extra_keys"), (dropped, "drop_invalid_items")):
+        if flag and name not in repairs:
+            repairs.append(name)
+    return dict(payload, matches=fixed), repairs
+
+
+# -----------------------
+# Enforcement
+# -----------------------
+class SchemaStats:
+    """Process-wide counters (schema_stats())."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counts = {"checked": 0, "valid": 0, "repaired": 0, "requeries": 0,
+                       "requeries_avoided": 0, "invalid": 0, "blocked": 0}
+
+    def bump(self, **deltas: int) -> None:
+        with self._lock:
+            for k, n in deltas.items():
+                self.counts[k] += n
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+STATS = SchemaStats()
+
+
+def schema_stats() -> Dict[str, int]:
+    return STATS.snapshot()
+
+
+def enforcement_settings(profile: Optional[Dict[str, Any]], root: Path) -> Optional[Dict[str, Any]]:
+    """Normalised schema_enforcement block, or None when disabled."""
+    cfg = (profile or {}).get("schema_enforcement", {}) or {}
+    if not cfg.get("enabled", False):
+        return None
+    policy = cfg.get("on_invalid", "warn")
+    if policy not in POLICIES:
+        raise ValueError(f"schema_enforcement.on_invalid must be one of {POLICIES}, got {policy!r}")
+    schema_path = Path(cfg.get("schema_path", "schemas/matches.schema.json"))
+    if not schema_path.is_absolute():
+        schema_path = Path(root) / schema_path
+    return {
+        "policy": policy,
+        "schema_path": schema_path,
+        "max_requeries": int(cfg.get("max_requeries", 1)),
+    }
+
+
+def requery_prompt(prompt: str, errors: List[str]) -> str:
+    return (
+        f"{prompt}\n\nYour previous reply did not match the required JSON shape "
+        f"({'; '.join(errors[:3])}). Reply again with ONLY the JSON object."
+    )
+
+
+class Enforcement:
+    """
+    One response's trip through the schema stage. check() is pure and local;
+    callers drive re-queries (sync or async) while needs_requery is true.
+    """
+
+    def __init__(self, settings: Dict[str, Any]) -> None:
+        self.policy = settings["policy"]
+        self.max_requeries = settings["max_requeries"] if self.policy != "warn" else 0
+        self.validator = load_validator(settings["schema_path"])
+        self.requeries = 0
+        self.repairs: List[str] = []
+        self.errors: List[str] = []
+        self.payload: Any = None
+        self.valid = False
+
+    def check(self, raw: str) -> bool:
+        """Validate raw (repairing locally unless policy is warn). True once valid."""
+        STATS.bump(checked=1)
+        try:
+            payload = json.loads(raw)
+            errors = self.validator.errors(payload)
+        except ValueError as e:
+            payload, errors = None, [f"$: not JSON ({e.msg})"]
+        if not errors:
+            self.payload, self.errors, self.valid = payload, [], True
+            STATS.bump(valid=1)
+            return True
+
+        self.errors = errors
+        if self.policy == "warn":
+            return False
+        payload, repairs = repair_payload(raw, self.validator)
+        if payload is not None and not self.validator.errors(payload):
+            self.payload, self.repairs, self.valid = payload, repairs, True
+            STATS.bump(repaired=1, requeries_avoided=1 if self.max_requeries and not self.requeries else 0)
+            return True
+        return False
+
+    @property
+    def needs_requery(self) -> bool:
+        return not self.valid and self.requeries < self.max_requeries
+
+    def finish(self) -> None:
+        if self.valid:
+            return
+        STATS.bump(invalid=1)
+        if self.policy == "block":
+            STATS.bump(blocked=1)
+            raise SchemaViolation(self.errors)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "valid": self.valid,
+            "errors": self.errors if not self.valid else [],
+            "repairs": self.repairs,
+            "requeries": self.requeries,
+            "requery_avoided": (bool(self.repairs) and self.valid
+                                and self.max_requeries > 0 and self.requeries == 0),
+        }
+
+
+def enforce(
+    prompt: str,
+    raw: str,
+    settings: Dict[str, Any],
+    ask: Optional[Callable[[str], str]] = None,
+) -> Tuple[str, Enforcement]:
+    """
+    Run raw through the schema stage, re-asking via ask(prompt) when local
+    repair isn't enough (no re-queries when ask is None). Returns (the
+    response text used, enforcement).
+    """
+    enf = Enforcement(settings)
+    if ask is None:
+        enf.max_requeries = 0
+    while not enf.check(raw) and enf.needs_requery:
+        enf.requeries += 1
+        STATS.bump(requeries=1)
+        raw = ask(requery_prompt(prompt, enf.errors))
+    enf.finish()
+    return raw, enf
+
+
+async def enforce_async(prompt: str, raw: str, settings: Dict[str, Any], ask) -> Tuple[str, Enforcement]:
+    """enforce() with an awaitable ask."""
+    enf = Enforcement(settings)
+    while not enf.check(raw) and enf.needs_requery:
+        enf.requeries += 1
+        STATS.bump(requeries=1)
+        raw = await ask(requery_prompt(prompt, enf.errors))
+    enf.finish()
+    return raw, enf
@@ -0,0 +1,8 @@
+# prime_node_os — namespace for the runtime packages (cli, engine, runtime,
+# cold_mirror, ...). Installed, they sit in this directory; in a checkout
+# they sit one level up, next to this shim, so point the package there.
+from pathlib import Path
+
+_here = Path(__file__).resolve().parent
+if not (_here / "engine").is_dir():
+    __path__ = [str(_here.parent)]
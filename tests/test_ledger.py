@@ -0,0 +1,68 @@
+import gzip
+import json
+
+import pytest
+
+from prime_node_os.cold_mirror.core.ledger import LedgerSnapshot, LedgerStats, hit_bucket, iter_records, summarize
+
+
+def _rec(ts, n, families):
+    return {"timestamp": ts, "total_seed_hits": n, "families_hit": families,
+            "top_family": families[0] if families else None}
+
+
+OLD = [_rec("2026-01-01T09:15:00Z", 3, ["Mirror Trap", "Echo Trap"]),
+       _rec("2026-01-01T23:59:59Z", 0, [])]
+NEW = [_rec("2026-01-02T00:00:01Z", 1, ["Mirror Trap"]),
+       _rec("2026-01-03T12:00:00Z", 9, ["Echo Trap"])]
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    path = tmp_path / "ledger.jsonl"
+    with gzip.open(tmp_path / "ledger.1.jsonl.gz", "wt") as f:
+        f.writelines(json.dumps(r) + "\n" for r in OLD)
+    path.write_text("".join(json.dumps(r) + "\n" for r in NEW) + '{"timestamp": "2026-01-0', encoding="utf-8")
+    return path
+
+
+def test_hit_bucket():
+    assert [hit_bucket(n) for n in (0, 1, 2, 3, 4, 5, 8, 9, 16, 17)] == [
+        "0", "1", "2", "3-4", "3-4", "5-8", "5-8", "9-16", "9-16", "17-32"]
+
+
+def test_streams_rotated_segments_and_skips_torn_lines(ledger):
+    assert list(iter_records(ledger)) == OLD + NEW
+
+
+def test_summarize(ledger):
+    stats = summarize(ledger, bucket="day")
+    assert stats["runs"] == 4
+    assert (stats["first_ts"], stats["last_ts"]) == (OLD[0]["timestamp"], NEW[-1]["timestamp"])
+    assert stats["mean_seed_hits"] == 3.25
+    assert stats["family_hits"] == {"Mirror Trap": 2, "Echo Trap": 2}
+    assert stats["family_hit_frequency"] == {"Mirror Trap": 0.5, "Echo Trap": 0.5}
+    assert stats["top_family"] == {"Mirror Trap": 2, "None": 1, "Echo Trap": 1}
+    assert list(stats["hit_histogram"].items()) == [("0", 1), ("1", 1), ("3-4", 1), ("9-16", 1)]
+    assert stats["runs_per_bucket"] == {"2026-01-01": 2, "2026-01-02": 1, "2026-01-03": 1}
+
+
+def test_since_until_are_inclusive(ledger):
+    assert summarize(ledger, until="2026-01-01")["runs"] == 2
+    assert summarize(ledger, since="2026-01-02", until="2026-01-02")["runs"] == 1
+    assert summarize(ledger, since="2026-01-03")["runs"] == 1
+
+
+def test_bad_bucket():
+    with pytest.raises(ValueError):
+        LedgerStats("week")
+
+
+def test_snapshot_agrees_with_stats(ledger, tmp_path):
+    snap = LedgerSnapshot.build(iter_records(ledger))
+    snap.save(tmp_path / "ledger.snap")
+    snap = LedgerSnapshot.load(tmp_path / "ledger.snap")
+    stats = LedgerStats().consume(iter_records(ledger))
+    assert len(snap) == stats.runs
+    assert snap.family_hits() == dict(stats.family_hits)
+    assert snap.hit_histogram() == dict(stats.hit_histogram)
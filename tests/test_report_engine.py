@@ -0,0 +1,60 @@
+import hashlib
+import random
+from collections import defaultdict
+
+import pytest
+
+from prime_node_os.cold_mirror.core.report_engine import build_report
+
+
+def _sorted_report(hits, max_per_family):
+    """The sort-per-family build_report the heap version replaced."""
+    grouped = defaultdict(list)
+    for h in hits:
+        grouped[h["family"]].append(h)
+    families = [
+        {"family": fam, "hits": sorted(items, key=lambda x: x.get("confidence", 0.0), reverse=True)[:max_per_family]}
+        for fam, items in grouped.items()
+    ]
+    families.sort(key=lambda f: max((h["confidence"] for h in f["hits"]), default=0.0), reverse=True)
+    return families
+
+
+def _hits(n, seed):
+    rng = random.Random(seed)
+    # coarse confidences so ties are common
+    return [
+        {"seed_id": f"S{i}", "family": f"F{rng.randrange(6)}", "confidence": rng.randrange(5) / 4}
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("max_per_family", [0, 1, 3, 5, 50])
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_sorted_build(max_per_family, seed):
+    hits = _hits(200, seed)
+    report = build_report("text", hits, {"report": {"max_seeds_per_family": max_per_family}})
+    assert report["families"] == _sorted_report(hits, max_per_family)
+    assert report["summary"] == {
+        "total_seed_hits": 200,
+        "families_hit": [f["family"] for f in report["families"]],
+    }
+
+
+def test_raw_text_modes():
+    text = "check this system"
+    embed = build_report(text, [], {})
+    assert embed["raw_text"] == text and "raw_text_ref" not in embed
+
+    omit = build_report(text, [], {"report": {"raw_text": "omit"}})
+    assert "raw_text" not in omit and "raw_text_ref" not in omit
+
+    ref = build_report(text, [], {"report": {"raw_text": "ref"}})
+    assert "raw_text" not in ref
+    assert ref["raw_text_ref"] == {
+        "sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        "length": len(text),
+    }
+
+    with pytest.raises(ValueError):
+        build_report(text, [], {"report": {"raw_text": "inline"}})
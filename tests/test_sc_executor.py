@@ -0,0 +1,94 @@
+import asyncio
+import json
+import threading
+import time
+
+from prime_node_os.engine.sc_executor import VoteTally, run_sc_k, run_sc_k_async, sc_settings
+
+
+def _m(sid, conf=0.8):
+    return {"seed_id": sid, "confidence": conf, "evidence": sid}
+
+
+class _Client:
+    """
+    Answers from a fixed script, one entry per call, in call order. Call i
+    takes (i + 1) * delay seconds, so samples finish one by one even when
+    they run concurrently.
+    """
+
+    def __init__(self, answers, delay=0.01):
+        self.answers = list(answers)
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def ask(self, prompt, **kwargs):
+        with self._lock:
+            i = self.calls
+            self.calls += 1
+        time.sleep((i + 1) * self.delay)
+        ids = self.answers[min(i, len(self.answers) - 1)]
+        return json.dumps({"matches": [_m(sid) for sid in ids]})
+
+
+def _settings(k, **over):
+    s = sc_settings({"sc_k": {"enabled": True, "k": k, "max_workers": 1}})
+    s.update(over)
+    return s
+
+
+def test_tally_settles_once_majority_is_fixed():
+    t = VoteTally(k=5, min_votes=3)
+    t.add([_m("A")])
+    t.add([_m("A")])
+    assert not t.settled()          # 3 outstanding could still add an unseen seed
+    t.add([_m("A")])
+    assert t.settled()              # A is in; an unseen seed can't reach 3 from 2 left
+    t2 = VoteTally(k=5, min_votes=3)
+    for ms in ([_m("A"), _m("B")], [_m("A"), _m("B")], [_m("A")]):
+        t2.add(ms)
+    assert not t2.settled()         # B can still reach 3
+    assert [m["seed_id"] for m in t.merged()] == ["A"]
+
+
+def test_tally_dedupes_and_lowers_quorum_after_failures():
+    t = VoteTally(k=3, min_votes=2)
+    t.add([_m("A"), _m("A", 0.1)])
+    assert len(t.votes["A"]) == 1
+    t.add(None)
+    t.add(None)
+    assert t.quorum() == 1
+    assert [(m["seed_id"], m["votes"]) for m in t.merged()] == [("A", 1)]
+
+
+def test_run_sc_k_stops_early_on_agreement():
+    client = _Client([["A"]])
+    out = run_sc_k("p", client, _settings(5))
+    assert out["sc"]["early_stopped"]
+    assert client.calls < 5
+    assert [(m["seed_id"], m["votes"]) for m in out["matches"]] == [("A", out["sc"]["completed"])]
+
+
+def test_run_sc_k_runs_all_without_early_stop():
+    client = _Client([["A"]])
+    out = run_sc_k("p", client, _settings(5, early_stop=False))
+    assert not out["sc"]["early_stopped"]
+    assert client.calls == 5 and out["sc"]["completed"] == 5
+
+
+def test_stop_when_replaces_settled():
+    client = _Client([["A"]])
+    out = run_sc_k("p", client, _settings(5), stop_when=lambda tally: False)
+    assert not out["sc"]["early_stopped"] and client.calls == 5
+
+    client = _Client([["A"], ["B"], ["C"]])
+    out = run_sc_k("p", client, _settings(5), stop_when=lambda tally: tally.ok >= 1)
+    assert out["sc"]["early_stopped"] and out["sc"]["completed"] < 5
+
+
+def test_async_stops_early_on_agreement():
+    client = _Client([["A"]])
+    out = asyncio.run(run_sc_k_async("p", client, _settings(5)))
+    assert out["sc"]["early_stopped"]
+    assert 3 <= out["sc"]["completed"] < 5
@@ -0,0 +1,89 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from prime_node_os.engine.schema_enforcer import (
+    SchemaViolation,
+    enforce,
+    enforcement_settings,
+    load_validator,
+    repair_payload,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+VALID = json.dumps({"matches": [{"seed_id": "A", "confidence": 0.5, "evidence": "x"}]})
+
+
+def _settings(policy, max_requeries=1):
+    profile = {"schema_enforcement": {"enabled": True, "on_invalid": policy, "max_requeries": max_requeries}}
+    return enforcement_settings(profile, ROOT)
+
+
+@pytest.fixture
+def validator():
+    return load_validator(ROOT / "schemas" / "matches.schema.json")
+
+
+def test_repair_fenced_aliases_and_percent(validator):
+    raw = 'Here:\n```json\n{"matches": [{"id": "A", "score": "83%", "note": 1},]}\n```'
+    payload, repairs = repair_payload(raw, validator)
+    assert payload == {"matches": [{"seed_id": "A", "confidence": 0.83}]}
+    assert repairs == ["trailing_commas", "rename_keys", "coerce_values", "drop_extra_keys"]
+
+
+def test_repair_bare_list_drops_unusable_items(validator):
+    raw = '[{"seed_id": "A", "confidence": 83}, {"seed_id": ""}, 5, {"seed_id": "B", "confidence": true}]'
+    payload, repairs = repair_payload(raw, validator)
+    assert payload == {"matches": [{"seed_id": "A", "confidence": 0.83}]}
+    assert repairs == ["wrap_list", "coerce_values", "drop_invalid_items"]
+
+
+def test_repair_truncated_and_garbage(validator):
+    payload, repairs = repair_payload('{"matches": [{"seed_id": "A", "confidence": 0.5}, {"seed_id": "B", "conf', validator)
+    assert payload == {"matches": [{"seed_id": "A", "confidence": 0.5, "evidence": ""}]}
+    assert repairs == ["truncated"]
+    assert repair_payload("nothing", validator) == (None, [])
+
+
+def test_disabled_settings():
+    assert enforcement_settings({}, ROOT) is None
+    with pytest.raises(ValueError):
+        _settings("ignore")
+
+
+def test_valid_response_passes_untouched():
+    raw, enf = enforce("p", VALID, _settings("repair"), ask=lambda p: pytest.fail("re-queried"))
+    assert raw == VALID and enf.valid and enf.payload == json.loads(VALID)
+    assert enf.summary()["repairs"] == [] and enf.requeries == 0
+
+
+def test_warn_reports_without_repair():
+    raw, enf = enforce("p", "[]", _settings("warn"), ask=lambda p: pytest.fail("re-queried"))
+    assert raw == "[]" and not enf.valid and enf.errors
+    assert enf.requeries == 0
+
+
+def test_local_repair_avoids_requery():
+    _, enf = enforce("p", "```\n" + VALID + "\n```", _settings("repair"), ask=lambda p: pytest.fail("re-queried"))
+    summary = enf.summary()
+    assert enf.valid and summary["requery_avoided"] and summary["requeries"] == 0
+
+
+def test_requery_until_valid():
+    prompts = []
+
+    def ask(p):
+        prompts.append(p)
+        return VALID
+
+    raw, enf = enforce("p", "no json", _settings("repair", max_requeries=2), ask=ask)
+    assert raw == VALID and enf.valid and enf.requeries == 1
+    assert prompts[0].startswith("p\n\nYour previous reply did not match")
+
+
+def test_block_raises_when_nothing_valid():
+    with pytest.raises(SchemaViolation):
+        enforce("p", "no json", _settings("block", max_requeries=2), ask=lambda p: "still no json")
+    _, enf = enforce("p", "no json", _settings("repair"), ask=None)
+    assert not enf.valid and enf.requeries == 0
@@ -0,0 +1,60 @@
+import json
+import threading
+
+import pytest
+
+from prime_node_os.cold_mirror.core.telemetry_sink import TelemetrySink
+
+
+def _kill_writer(sink):
+    def die(pending):
+        raise SystemExit   # ends the thread the way an uncaught error would
+
+    sink._write_batch = die
+
+
+def test_bad_record_raises_in_caller(tmp_path):
+    sink = TelemetrySink(max_queue=4)
+    with pytest.raises(TypeError):
+        sink.write(tmp_path / "l.jsonl", {"bad": object()})
+    sink.write(tmp_path / "l.jsonl", {"ok": 1})
+    assert sink.flush(timeout=5)
+    sink.close()
+    assert [json.loads(x) for x in (tmp_path / "l.jsonl").read_text().splitlines()] == [{"ok": 1}]
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_dead_writer_does_not_block(tmp_path):
+    path = tmp_path / "l.jsonl"
+    sink = TelemetrySink(max_queue=4, flush_interval_s=0.01)
+    _kill_writer(sink)
+    sink.write(path, {"i": -1})
+    sink._thread.join(5)
+    assert not sink._thread.is_alive()
+
+    done = threading.Event()
+
+    def writes():
+        for i in range(10):
+            sink.write(path, {"i": i})
+        sink.flush()
+        done.set()
+
+    threading.Thread(target=writes, daemon=True).start()
+    assert done.wait(3), "write()/flush() blocked on a dead writer thread"
+    lines = [json.loads(x) for x in path.read_text().splitlines()]
+    assert {"i": 9} in lines
+    sink.close()
+
+
+def test_write_error_keeps_writer_alive(tmp_path):
+    sink = TelemetrySink(flush_interval_s=0.01)
+    blocker = tmp_path / "dir"
+    blocker.mkdir()
+    sink.write(blocker, {"x": 1})        # IsADirectoryError inside the writer
+    assert sink.flush(timeout=5)
+    sink.write(tmp_path / "l.jsonl", {"x": 2})
+    assert sink.flush(timeout=5)
+    assert sink._thread.is_alive()
+    sink.close()
+    assert (tmp_path / "l.jsonl").read_text().strip() == '{"x": 2}'
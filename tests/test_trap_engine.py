@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from prime_node_os.cold_mirror.core.trap_engine import (
+    StreamingMatchParser,
+    iter_stream_matches,
+    parse_matches,
+)
+
+EVIDENCE = 'he said "no" \\ {x} ]'
+BODY = json.dumps({
+    "matches": [
+        {"seed_id": "A1", "confidence": 0.9, "evidence": EVIDENCE},
+        {"seed_id": "B2", "confidence": 0.4},
+    ]
+})
+EXPECTED = [
+    {"seed_id": "A1", "confidence": 0.9, "evidence": EVIDENCE},
+    {"seed_id": "B2", "confidence": 0.4, "evidence": ""},
+]
+
+
+def _feed(chunks):
+    parser = StreamingMatchParser()
+    out = []
+    for chunk in chunks:
+        out.extend(parser.feed(chunk))
+    out.extend(parser.close())
+    return parser, out
+
+
+def test_plain_and_fenced():
+    assert parse_matches(BODY) == EXPECTED
+    assert parse_matches("Sure:\n```json\n" + BODY + "\n```\nDone.") == EXPECTED
+
+
+def test_bare_list_and_garbage():
+    assert parse_matches('[{"seed_id": "A", "confidence": 0.5}]') == [
+        {"seed_id": "A", "confidence": 0.5, "evidence": ""}
+    ]
+    assert parse_matches("no json here") == []
+    assert parse_matches("") == []
+
+
+def test_truncated_keeps_closed_objects():
+    cut = BODY.index('{"seed_id": "B2"') + 10
+    assert parse_matches(BODY[:cut]) == EXPECTED[:1]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, len(BODY)])
+def test_chunked_matches_whole(size):
+    parser, out = _feed(BODY[i:i + size] for i in range(0, len(BODY), size))
+    assert out == EXPECTED
+    assert (parser.seen, parser.dropped) == (2, 0)
+
+
+def test_invalid_objects_are_counted():
+    raw = ('{"matches": [{"seed_id": "", "confidence": 1}, '
+           '{"seed_id": "C", "confidence": true}, {"seed_id": "D", "confidence": 2}]}')
+    parser, out = _feed(raw)
+    assert out == [{"seed_id": "D", "confidence": 1.0, "evidence": ""}]
+    assert (parser.seen, parser.dropped) == (3, 2)
+
+
+def test_stream_without_matches_key_falls_back():
+    chunks = ['[{"seed_id": "A",', ' "confidence": 0.5}]']
+    assert list(iter_stream_matches(chunks)) == [{"seed_id": "A", "confidence": 0.5, "evidence": ""}]